@@ -8,6 +8,8 @@ from alembic import context
 from app.modules.models.UserModel import User
 from app.modules.models.PostModel import Post
 from app.modules.models.CategoryModel import Category
+from app.modules.models.PostImportModel import PostImport
+from app.modules.models.EmailOutboxModel import EmailOutbox
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -28,6 +30,14 @@ from app.core.config import settings
 
 target_metadata = SQLModel.metadata
 
+# Database objects that exist only through migrations and are not mapped on the
+# models (e.g. generated columns); autogenerate must not try to drop them.
+UNMAPPED_OBJECTS = {"search_vector", "ix_posts_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name in UNMAPPED_OBJECTS)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -52,7 +62,8 @@ def run_migrations_offline() -> None:
     """
     url = get_url()
     context.configure(
-        url=url, target_metadata=target_metadata, literal_binds=True, compare_type=True
+        url=url, target_metadata=target_metadata, literal_binds=True, compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -78,7 +89,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata, compare_type=True
+            connection=connection, target_metadata=target_metadata, compare_type=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
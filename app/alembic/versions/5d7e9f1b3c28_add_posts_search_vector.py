@@ -0,0 +1,43 @@
+"""add posts search vector
+
+Revision ID: 5d7e9f1b3c28
+Revises: 8e2b4c6d1a37
+Create Date: 2026-10-18 11:21:40.118937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7e9f1b3c28'
+down_revision: Union[str, Sequence[str], None] = '8e2b4c6d1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Generated column maintained by Postgres itself; it is not mapped on Post
+# (see UNMAPPED_OBJECTS in env.py) and is only read by PostService search.
+SEARCH_VECTOR = """
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(tags, '[]'::json)), 'B') ||
+    setweight(to_tsvector('english', coalesce(content, '')), 'C')
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        f"ALTER TABLE posts ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED")
+    op.create_index('ix_posts_search_vector', 'posts', ['search_vector'],
+                    unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_search_vector', table_name='posts',
+                  postgresql_using='gin')
+    op.drop_column('posts', 'search_vector')
@@ -0,0 +1,58 @@
+"""convert post tags to jsonb
+
+Revision ID: a4c8e2f0b915
+Revises: 5d7e9f1b3c28
+Create Date: 2026-10-18 11:58:03.472611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c8e2f0b915'
+down_revision: Union[str, Sequence[str], None] = '5d7e9f1b3c28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _search_vector(tags_type: str) -> str:
+    return f"""
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(tags, '[]'::{tags_type})), 'B') ||
+    setweight(to_tsvector('english', coalesce(content, '')), 'C')
+"""
+
+
+def _convert_tags(tags_type: str, sa_type: sa.types.TypeEngine, using: str) -> None:
+    # the generated search_vector reads tags, so it has to be rebuilt around
+    # the type change (the table is rewritten either way)
+    op.drop_index('ix_posts_search_vector', table_name='posts',
+                  postgresql_using='gin')
+    op.drop_column('posts', 'search_vector')
+    op.alter_column('posts', 'tags', type_=sa_type,
+                    postgresql_using=using)
+    op.execute(
+        f"ALTER TABLE posts ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({_search_vector(tags_type)}) STORED")
+    op.create_index('ix_posts_search_vector', 'posts', ['search_vector'],
+                    unique=False, postgresql_using='gin')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # posts without tags were stored as a JSON 'null'; make them SQL NULL so
+    # jsonb_array_elements_text() and the ?| / ?& filters skip them
+    _convert_tags('jsonb', postgresql.JSONB(astext_type=sa.Text()),
+                  "nullif(tags::jsonb, 'null'::jsonb)")
+    op.create_index('ix_posts_tags', 'posts', ['tags'], unique=False,
+                    postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_tags', table_name='posts', postgresql_using='gin')
+    _convert_tags('json', sa.JSON(), 'tags::json')
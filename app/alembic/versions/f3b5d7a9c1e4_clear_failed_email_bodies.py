@@ -0,0 +1,29 @@
+"""clear failed email bodies
+
+Revision ID: f3b5d7a9c1e4
+Revises: e7a9c1b3d5f2
+Create Date: 2026-10-18 21:12:40.517283
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b5d7a9c1e4'
+down_revision: Union[str, Sequence[str], None] = 'e7a9c1b3d5f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # failed mail used to keep its body, new account mail with the password
+    op.execute("UPDATE email_outbox SET html_content = '' WHERE status = 'failed'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # the bodies are gone
+    pass
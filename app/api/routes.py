@@ -1,13 +1,25 @@
+import importlib
+
 from fastapi import APIRouter
 
-from app.modules.routes.AuthRoutes import router as auth_router
-from app.modules.routes.UserRoutes import router as user_router
-from app.modules.routes.PostRoutes import router as post_router
-from app.modules.routes.CategoryRoutes import router as category_router
+from app.core.config import settings
+from app.modules.routes.MetricsRoutes import router as metrics_router
+
+
+def _pick(name: str, module: str) -> APIRouter:
+    # Routers are moved to the async path one at a time via ASYNC_ROUTERS.
+    # Only the implementation in use is imported: building a router's routes
+    # is a good part of the app's import time.
+    prefix = "Async" if name in settings.ASYNC_ROUTERS else ""
+    router: APIRouter = importlib.import_module(f"app.modules.routes.{prefix}{module}Routes").router
+    return router
+
 
 api_router = APIRouter()
 
-api_router.include_router(auth_router, prefix="/auth", tags=["Auth"])
-api_router.include_router(user_router, prefix="/users", tags=["Users"])
-api_router.include_router(post_router, prefix="/posts", tags=["Posts"])
-api_router.include_router(category_router, prefix="/categories", tags=["Categories"])
+api_router.include_router(_pick("auth", "Auth"), prefix="/auth", tags=["Auth"])
+api_router.include_router(_pick("users", "User"), prefix="/users", tags=["Users"])
+api_router.include_router(_pick("posts", "Post"), prefix="/posts", tags=["Posts"])
+api_router.include_router(_pick("categories", "Category"), prefix="/categories", tags=["Categories"])
+api_router.include_router(_pick("tags", "Tag"), prefix="/tags", tags=["Tags"])
+api_router.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
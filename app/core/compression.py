@@ -0,0 +1,204 @@
+"""
+Response compression negotiated with Accept-Encoding: zstd, br and gzip.
+
+gzip is zlib from the standard library; br and zstd come from the optional
+`compression` extra (brotli, zstandard) and are simply not offered when it
+is missing. Responses that already have a Content-Encoding, are not a
+compressible media type, or are complete and smaller than `minimum_size`
+go out untouched. Streamed bodies (StreamingResponse) are compressed chunk
+by chunk, each flushed so the client receives it as soon as it is sent.
+Large chunks are compressed on a worker thread, off the event loop.
+"""
+import importlib.util
+import logging
+import zlib
+from collections.abc import Callable, Mapping, Sequence
+from typing import Protocol
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript",
+                      "application/xml", "image/svg+xml")
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Compress and flush: everything passed so far is decodable."""
+        ...
+
+    def finish(self, data: bytes) -> bytes:
+        ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        import brotli
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        chunk: bytes = self._compressor.process(data) + self._compressor.flush()
+        return chunk
+
+    def finish(self, data: bytes) -> bytes:
+        chunk: bytes = self._compressor.process(data) + self._compressor.finish()
+        return chunk
+
+
+class ZstdCompressor:
+    def __init__(self, level: int) -> None:
+        import zstandard
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(self._flush_block)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+# encoding -> (module it needs, compressor for a level)
+CODECS: dict[str, tuple[str | None, Callable[[int], Compressor]]] = {
+    "zstd": ("zstandard", ZstdCompressor),
+    "br": ("brotli", BrotliCompressor),
+    "gzip": (None, GzipCompressor),
+}
+
+
+def available_encodings(encodings: Sequence[str]) -> list[str]:
+    available = []
+    for encoding in encodings:
+        module = CODECS[encoding][0]
+        if module is None or importlib.util.find_spec(module) is not None:
+            available.append(encoding)
+        else:
+            logger.info("%s compression needs the `%s` package; not offered", encoding, module)
+    return available
+
+
+def negotiate(accept_encoding: str, encodings: Sequence[str]) -> str | None:
+    """
+    The encoding with the highest q-value in Accept-Encoding; ties go to the
+    earliest in `encodings` (our preference). None for identity.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def _compressible(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return (media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+            or media_type.endswith(("+json", "+xml")))
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, encodings: Sequence[str], levels: Mapping[str, int], minimum_size: int = 1024, thread_minimum_size: int = 128 * 1024) -> None:
+        self.app = app
+        self.encodings = available_encodings(encodings)
+        self.levels = levels
+        self.minimum_size = minimum_size
+        self.thread_minimum_size = thread_minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        await _Responder(self, encoding, send).run(scope, receive)
+
+
+class _Responder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str | None, send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        # held back until the first body chunk decides the headers
+        self.start: Message | None = None
+        self.compressor: Compressor | None = None
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if ("content-encoding" in headers or message["status"] in (204, 206, 304)
+                    or not _compressible(headers.get("content-type", ""))):
+                await self.send(message)
+            else:
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body" or (self.start is None and self.compressor is None):
+            # passed through, or not body data (trailers, pathsend)
+            if self.start is not None:
+                await self.send(self.start)
+                self.start = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoding is None or (not more_body and len(body) < self.middleware.minimum_size):
+                await self.send(start)
+                await self.send(message)
+                return
+            codec = CODECS[self.encoding][1]
+            self.compressor = codec(self.middleware.levels[self.encoding])
+            headers["Content-Encoding"] = self.encoding
+            body = await self._compress(body, more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self.send(start)
+        else:
+            body = await self._compress(body, more_body)
+        await self.send({**message, "body": body})
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        assert self.compressor is not None
+        step = self.compressor.compress if more_body else self.compressor.finish
+        if len(body) >= self.middleware.thread_minimum_size:
+            return await anyio.to_thread.run_sync(step, body)
+        return step(body)
@@ -1,5 +1,8 @@
+import os
 import secrets
+import tempfile
 import warnings
+from ipaddress import IPv4Network, IPv6Network, ip_network
 from typing import Annotated, Any, Literal
 
 from pydantic import (
@@ -7,6 +10,7 @@ from pydantic import (
     BeforeValidator,
     EmailStr,
     HttpUrl,
+    IPvAnyNetwork,
     PostgresDsn,
     computed_field,
     model_validator,
@@ -64,6 +68,129 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Connection pool of each engine (the sync one, and the async one when
+    # ASYNC_ROUTERS is set), per worker process: POSTGRES_POOL_SIZE kept open
+    # plus up to POSTGRES_MAX_OVERFLOW more under load, so Postgres may see
+    # workers x engines x (size + overflow) connections. A checkout waits at
+    # most POSTGRES_POOL_TIMEOUT_SECONDS for a free one. Connections older
+    # than POSTGRES_POOL_RECYCLE_SECONDS are replaced (-1: never); with
+    # POSTGRES_POOL_PRE_PING each is tested before use. psycopg prepares a
+    # statement server-side once it ran POSTGRES_PREPARE_THRESHOLD times on a
+    # connection; a negative value never prepares (e.g. behind PgBouncer in
+    # transaction mode).
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT_SECONDS: float = 30.0
+    POSTGRES_POOL_RECYCLE_SECONDS: int = -1
+    POSTGRES_POOL_PRE_PING: bool = False
+    POSTGRES_PREPARE_THRESHOLD: int = 5
+
+    # How long count_mode=cached list totals live before being recomputed;
+    # any write to the table drops them earlier.
+    COUNT_CACHE_TTL_SECONDS: int = 30
+
+    # How long the id/is_active/is_superuser snapshot behind get_current_user
+    # is trusted. The cache is per process: updates and deletes through this
+    # worker drop the entry at once, other workers see them within the TTL.
+    # 0 turns the cache off.
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
+    AUTH_USER_CACHE_SIZE: int = 10000
+
+    # bcrypt cost for new hashes; stored hashes with another cost are
+    # re-hashed on the next successful login
+    BCRYPT_ROUNDS: int = 12
+    # Password hashing/verification runs on this many worker processes
+    # (0: inline in the calling thread). At most PASSWORD_HASH_MAX_PENDING
+    # jobs may be queued or running; a job that has not finished within
+    # PASSWORD_HASH_TIMEOUT_SECONDS is answered with 503. A positive
+    # PASSWORD_HASH_NICENESS runs the workers below the API's CPU priority;
+    # too high and a saturated host never gets to the logins.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 5.0
+    PASSWORD_HASH_NICENESS: int = 0
+
+    # Login attempts allowed per client IP and per username within a sliding
+    # window, checked before any password work; over the limit is a 429.
+    # A successful login clears the username's window.
+    LOGIN_RATE_WINDOW_SECONDS: int = 300
+    LOGIN_RATE_LIMIT_PER_IP: int = 30
+    LOGIN_RATE_LIMIT_PER_USERNAME: int = 10
+    # "memory" is per process; "redis" shares the windows across workers
+    # and needs REDIS_URL and the `redis` extra.
+    RATE_LIMIT_STORE: Literal["memory", "redis"] = "memory"
+    REDIS_URL: str | None = None
+    # Reverse proxies in front of the app, e.g. Traefik's Docker network (IPs
+    # or CIDR ranges, comma separated). A login from one of them is limited by
+    # the client address the proxies put in X-Forwarded-For rather than by the
+    # proxy's own, which would put every client in one window.
+    TRUSTED_PROXIES: Annotated[
+        list[IPvAnyNetwork] | str, BeforeValidator(parse_cors)
+    ] = []
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def trusted_proxy_networks(self) -> list[IPv4Network | IPv6Network]:
+        return [ip_network(str(proxy)) for proxy in self.TRUSTED_PROXIES]
+
+    # Read-through cache of posts and categories fetched by id (and posts by
+    # slug). Writes drop their entries after the commit: in every worker with
+    # "redis" (REDIS_URL and the `redis` extra), only in the writing one with
+    # "memory", where others see the change within the TTL. A dropped entry
+    # is not refilled for up to 10 s, so a read that raced the write cannot
+    # cache the old row; reads in that window go to the database. Concurrent
+    # misses for one entry share a single query. A TTL of 0 turns that cache
+    # (and the coalescing) off; ENTITY_CACHE_SIZE bounds each in-memory cache.
+    ENTITY_CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    ENTITY_CACHE_SIZE: int = 10000
+    POST_CACHE_TTL_SECONDS: int = 60
+    CATEGORY_CACHE_TTL_SECONDS: int = 300
+
+    # Right after start each worker opens WARMUP_CONNECTIONS pooled
+    # connections per engine in use, runs the common queries of every router
+    # once (compiling and caching their SQL), starts the password hashing
+    # workers and signs a token; /health/ready answers 503 until then.
+    # WARMUP_ENABLED=False reports ready at once.
+    WARMUP_ENABLED: bool = True
+    WARMUP_CONNECTIONS: int = 5
+
+    # Rows per statement/transaction for the /bulk endpoints; callers may ask
+    # for a different chunk_size up to BULK_MAX_CHUNK_SIZE.
+    BULK_CHUNK_SIZE: int = 500
+    BULK_MAX_CHUNK_SIZE: int = 5000
+
+    # Rows fetched per server-side cursor round trip by /posts/export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Rows per COPY + merge transaction for post imports; each committed chunk
+    # is a resume point. Uploaded files are kept in IMPORT_DIR until done.
+    # A running import is held for IMPORT_LEASE_SECONDS after its last chunk
+    # (longer than a chunk takes): only then may a resume take it over.
+    IMPORT_CHUNK_SIZE: int = 50000
+    IMPORT_LEASE_SECONDS: int = 600
+    IMPORT_DIR: str = os.path.join(tempfile.gettempdir(), "post-imports")
+
+    # Routers served by the async (AsyncSession) implementation, e.g.
+    # "posts,categories". Everything else stays on the sync Session path.
+    ASYNC_ROUTERS: Annotated[
+        list[Literal["auth", "users", "posts", "categories", "tags"]] | str,
+        BeforeValidator(parse_cors),
+    ] = []
+
+    # Response compression by Accept-Encoding, in our order of preference
+    # among what the client accepts; "zstd" and "br" need the `compression`
+    # extra and are left out without it. Complete bodies under
+    # COMPRESSION_MINIMUM_SIZE bytes go out as they are; streamed ones are
+    # compressed chunk by chunk. An empty list turns compression off.
+    COMPRESSION_ENCODINGS: Annotated[
+        list[Literal["zstd", "br", "gzip"]] | str,
+        BeforeValidator(parse_cors),
+    ] = ["zstd", "br", "gzip"]
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -72,6 +199,9 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str | None = None
     EMAILS_FROM_EMAIL: EmailStr | None = None
     EMAILS_FROM_NAME: EmailStr | None = None
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    # Links in emails point here
+    FRONTEND_HOST: str = "http://localhost:5173"
 
     @model_validator(mode="after")
     def _set_default_emails_from(self) -> Self:
@@ -80,6 +210,27 @@ class Settings(BaseSettings):
         return self
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
+    # Email templates are compiled once per process (at startup when emails
+    # are enabled); with a directory here the compiled code is also kept on
+    # disk, so restarts and other workers skip the compile.
+    EMAIL_TEMPLATES_BYTECODE_CACHE_DIR: str | None = None
+
+    # Mail is written to the email_outbox table and sent in the background
+    # by EMAIL_WORKERS threads per process, up to EMAIL_BATCH_SIZE messages
+    # per claim, over at most EMAIL_SMTP_POOL_SIZE kept-open connections.
+    # A failed message is retried after EMAIL_RETRY_BASE_SECONDS, doubling up
+    # to EMAIL_RETRY_MAX_SECONDS, and given up after EMAIL_MAX_ATTEMPTS. A
+    # claim not finished within EMAIL_LEASE_SECONDS (the process died) is
+    # taken over by another worker. Mail queued by other processes is picked
+    # up within EMAIL_POLL_SECONDS; EMAIL_WORKERS=0 leaves sending to them.
+    EMAIL_WORKERS: int = 1
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_SMTP_POOL_SIZE: int = 2
+    EMAIL_MAX_ATTEMPTS: int = 8
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    EMAIL_LEASE_SECONDS: int = 300
+    EMAIL_POLL_SECONDS: float = 5.0
 
     @computed_field  # type: ignore[prop-decorator]
     @property
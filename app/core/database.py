@@ -1,13 +1,83 @@
-from sqlmodel import Session, SQLModel, create_engine, select
+import threading
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlmodel import Session, SQLModel, create_engine
 
 from app.core.config import settings
+from app.core.pool import PoolMetrics, instrumented, register_pool, unregister_pool
 
 # If you need to create a default user, uncomment the following lines
 # from app.modules.schemas.UserSchemas import UserCreate
 # from app.modules.models.UserModel import User
 # from app.modules.services.UserService import create_user
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+# Engines are made on first use (the app's lifespan, for the API) rather than
+# at import: creating one loads the psycopg driver, which scripts and tools
+# that only import the app do not need.
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def _engine_options() -> dict[str, Any]:
+    threshold = settings.POSTGRES_PREPARE_THRESHOLD
+    return {
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+        "connect_args": {
+            "prepare_threshold": threshold if threshold >= 0 else None,
+            # the timestamp columns hold UTC without a zone; comparing them
+            # with aware values (If-Match versions, outbox due times) goes
+            # through the session time zone, which must therefore be UTC
+            "options": "-c timezone=UTC",
+        },
+    }
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                metrics = PoolMetrics()
+                _engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI),
+                                        poolclass=instrumented(QueuePool, metrics), **_engine_options())
+                register_pool("sync", _engine, metrics)
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    # The psycopg dialect picks its async variant under create_async_engine, so
+    # the same URI serves both. Routers listed in ASYNC_ROUTERS run on this one.
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                metrics = PoolMetrics()
+                _async_engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI),
+                                                    poolclass=instrumented(AsyncAdaptedQueuePool, metrics),
+                                                    **_engine_options())
+                register_pool("async", _async_engine.sync_engine, metrics)
+    return _async_engine
+
+
+async def dispose_engines() -> None:
+    global _engine, _async_engine
+    with _engine_lock:
+        engine, _engine = _engine, None
+        async_engine, _async_engine = _async_engine, None
+    unregister_pool("sync")
+    unregister_pool("async")
+    if engine is not None:
+        engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -23,7 +93,7 @@ def init_db(session: Session) -> None:
 
     # This works because the models are already imported and registered from app.models
     # SQLModel.metadata.create_all(engine)
-    SQLModel.metadata.create_all(engine)
+    SQLModel.metadata.create_all(get_engine())
 
 
     # If you need to create a default user, uncomment the following lines
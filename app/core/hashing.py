@@ -0,0 +1,40 @@
+"""
+bcrypt work as plain module-level functions, so they can be pickled to the
+password hashing process pool (see app.core.security). Kept free of app
+settings: spawned workers import only this module, passlib and bcrypt.
+"""
+import os
+from functools import cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+def init_worker(niceness: int) -> None:
+    # below the API processes, so request handling wins the CPU over hashing
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+
+@cache
+def crypt_context(rounds: int) -> "CryptContext":
+    # passlib (and bcrypt) load with the first hash, not with the app
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def load_backend(rounds: int) -> str:
+    """Import passlib and bcrypt and build the context; the backend's name."""
+    backend: str = crypt_context(rounds).handler().get_backend()
+    return backend
+
+
+def hash_password(password: str, rounds: int) -> str:
+    return crypt_context(rounds).hash(password)
+
+
+def verify_and_update(password: str, hashed_password: str, rounds: int) -> tuple[bool, str | None]:
+    # the new hash is set when the stored one uses other cost parameters
+    return crypt_context(rounds).verify_and_update(password, hashed_password)
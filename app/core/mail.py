@@ -0,0 +1,126 @@
+"""
+Outgoing SMTP: a small pool of kept-open connections and a retrying send.
+
+Opening an SMTP session (TCP, EHLO, STARTTLS, AUTH) costs several round
+trips, more than sending a message over it. Connections are therefore
+borrowed from `smtp_pool` and given back open; the emails backend reconnects
+by itself when the server has dropped an idle one. A send that fails to
+reach the server is retried a few times with backoff; SMTP error answers
+are raised at once, `is_transient` telling the 4xx from the permanent 5xx.
+"""
+import logging
+import smtplib
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from emails.backend.smtp.backend import SMTPBackend
+    from emails.message import Message
+
+# `emails` (and its MIME/DKIM dependencies) is imported on the first send,
+# not with the app: most processes never send mail.
+
+logger = logging.getLogger(__name__)
+
+
+def smtp_options() -> dict[str, Any]:
+    options: dict[str, Any] = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT,
+                               "timeout": settings.SMTP_TIMEOUT_SECONDS}
+    if settings.SMTP_TLS:
+        options["tls"] = True
+    elif settings.SMTP_SSL:
+        options["ssl"] = True
+    if settings.SMTP_USER:
+        options["user"] = settings.SMTP_USER
+    if settings.SMTP_PASSWORD:
+        options["password"] = settings.SMTP_PASSWORD
+    return options
+
+
+def is_connection_error(exc: BaseException) -> bool:
+    return isinstance(exc, (smtplib.SMTPServerDisconnected, OSError))
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Worth trying again later: network trouble or a 4xx answer."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    return is_connection_error(exc)
+
+
+def discard(smtp: "SMTPBackend") -> None:
+    """Close `smtp`; the next send on it opens a new session."""
+    try:
+        smtp.close()
+    except Exception:
+        # QUIT on a connection that is already broken
+        logger.debug("closing SMTP connection failed", exc_info=True)
+
+
+class SMTPPool:
+    """
+    At most `size` connections, idle ones reused most-recent first. A
+    connection whose send raised is closed rather than returned.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._idle: list[SMTPBackend] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator["SMTPBackend"]:
+        from emails.backend.smtp.backend import SMTPBackend
+
+        with self._slots:
+            with self._lock:
+                smtp = self._idle.pop() if self._idle else None
+            if smtp is None:
+                # connects lazily, on the first send
+                smtp = SMTPBackend(fail_silently=False, **smtp_options())
+            try:
+                yield smtp
+            except BaseException:
+                discard(smtp)
+                raise
+            with self._lock:
+                self._idle.append(smtp)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for smtp in idle:
+            discard(smtp)
+
+
+smtp_pool = SMTPPool(settings.EMAIL_SMTP_POOL_SIZE)
+
+
+def build_message(*, subject: str, html_content: str) -> "Message":
+    from emails.message import Message
+
+    # only called when settings.emails_enabled, which requires a sender
+    assert settings.EMAILS_FROM_EMAIL
+    return Message(
+        subject=subject,
+        html=html_content,
+        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
+    )
+
+
+# Only a lost or refused connection is retried here, on a fresh one; a 4xx
+# answer (greylisting, mailbox busy) needs minutes, not seconds.
+@retry(retry=retry_if_exception(is_connection_error), stop=stop_after_attempt(3),
+       wait=wait_exponential(multiplier=0.5, max=4), reraise=True,
+       before_sleep=lambda state: discard(state.args[0]))
+def send_message(smtp: "SMTPBackend", *, email_to: str, subject: str, html_content: str) -> None:
+    """Send over `smtp`, raising the SMTP or network error if it failed."""
+    build_message(subject=subject, html_content=html_content).send(to=email_to, smtp=smtp)
@@ -0,0 +1,119 @@
+"""
+Connection pool instrumentation, published at /metrics/db-pools.
+
+Pool events count new connections, checkouts, checkins and invalidations
+and track the peak number of connections in use. How long a checkout waited
+for a free connection, and how many gave up after POSTGRES_POOL_TIMEOUT_SECONDS,
+is not covered by any event, so the pool class itself times its checkout.
+Counters are per worker process and per engine.
+"""
+import time
+from typing import Any, TypeVar
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+
+P = TypeVar("P", bound=QueuePool)
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.in_use_max = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.wait_max_seconds = 0.0
+
+    def listen(self, engine: Engine) -> None:
+        # on the engine rather than its pool: they carry over to the pool
+        # that replaces it after engine.dispose()
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        self.checkouts += 1
+        self.in_use += 1
+        self.in_use_max = max(self.in_use_max, self.in_use)
+
+    def _on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.in_use = max(0, self.in_use - 1)
+
+    def _on_invalidate(self, dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+        self.invalidations += 1
+
+    def record_wait(self, seconds: float) -> None:
+        self.waits += 1
+        self.wait_seconds += seconds
+        self.wait_max_seconds = max(self.wait_max_seconds, seconds)
+
+
+class _TimedCheckout:
+    metrics: PoolMetrics
+
+    def _do_get(self) -> Any:
+        # includes opening a new connection when the pool has to
+        started = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - started)
+
+
+def instrumented(pool_class: type[P], metrics: PoolMetrics) -> type[P]:
+    """
+    `pool_class` timing its checkouts into `metrics`. A class of its own per
+    engine: a disposed engine's replacement pool is built from the class.
+    """
+    # same module and name: SQLAlchemy's pool logging keeps its logger names
+    namespace = {"metrics": metrics, "__module__": pool_class.__module__}
+    return type(pool_class.__name__, (_TimedCheckout, pool_class), namespace)
+
+
+_pools: dict[str, tuple[Engine, PoolMetrics]] = {}
+
+
+def register_pool(name: str, engine: Engine, metrics: PoolMetrics) -> None:
+    metrics.listen(engine)
+    _pools[name] = (engine, metrics)
+
+
+def unregister_pool(name: str) -> None:
+    _pools.pop(name, None)
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    stats = {}
+    for name, (engine, metrics) in _pools.items():
+        pool = engine.pool
+        assert isinstance(pool, QueuePool)
+        waits = metrics.waits
+        stats[name] = {
+            "size": pool.size(),
+            "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+            "in_use": pool.checkedout(),
+            "in_use_max": metrics.in_use_max,
+            "idle": pool.checkedin(),
+            # goes from -size up: negative while the pool is not yet full
+            "overflow": max(0, pool.overflow()),
+            "connects": metrics.connects,
+            "checkouts": metrics.checkouts,
+            "invalidations": metrics.invalidations,
+            "timeouts": metrics.timeouts,
+            "checkout_wait_ms_avg": metrics.wait_seconds / waits * 1000 if waits else 0.0,
+            "checkout_wait_ms_max": metrics.wait_max_seconds * 1000,
+        }
+    return stats
@@ -1,16 +1,20 @@
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, TypeVar
 
 import jwt
-from passlib.context import CryptContext
 
 from app.core.config import settings
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
+from app.core.hashing import hash_password, init_worker, load_backend, verify_and_update
 
 ALGORITHM = "HS256"
 
+T = TypeVar("T")
+
 
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
@@ -20,9 +24,109 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     return encoded_jwt
 
 
+class PasswordHasherBusy(Exception):
+    """No hashing worker freed up within PASSWORD_HASH_TIMEOUT_SECONDS."""
+
+
+# bcrypt runs in its own processes so a burst of logins cannot take every
+# request thread (or the event loop) with it. spawn rather than fork: the
+# parent holds threads and pooled database connections.
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(max(1, settings.PASSWORD_HASH_MAX_PENDING))
+
+
+def _hash_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(settings.PASSWORD_HASH_NICENESS,),
+            )
+        return _pool
+
+
+def start_hash_workers() -> None:
+    """
+    Start every hashing worker and load bcrypt in it (or in this process when
+    hashing runs inline) now, rather than during the first logins.
+    """
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        load_backend(settings.BCRYPT_ROUNDS)
+        return
+    # submitted together, so each job needs a worker of its own
+    pool = _hash_pool()
+    jobs = [pool.submit(load_backend, settings.BCRYPT_ROUNDS)
+            for _ in range(settings.PASSWORD_HASH_WORKERS)]
+    for job in jobs:
+        job.result()
+
+
+def stop_hash_workers() -> None:
+    """Shut the hashing workers down; a later hash starts new ones."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _submit(fn: Callable[..., T], *args: Any) -> Future[T]:
+    # bounded queue: past PASSWORD_HASH_MAX_PENDING jobs, fail fast
+    if not _pending.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        future = _hash_pool().submit(fn, *args)
+    except BaseException:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _: _pending.release())
+    return future
+
+
+def _run(fn: Callable[..., T], *args: Any) -> T:
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+    future = _submit(fn, *args)
+    try:
+        return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    except TimeoutError:
+        future.cancel()
+        raise PasswordHasherBusy()
+
+
+async def _run_async(fn: Callable[..., T], *args: Any) -> T:
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return await asyncio.to_thread(fn, *args)
+    future = asyncio.wrap_future(_submit(fn, *args))
+    try:
+        return await asyncio.wait_for(future, settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise PasswordHasherBusy()
+
+
+def verify_password_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Check a password; the second value is a fresh hash to store when the
+    stored one was made with outdated cost parameters (BCRYPT_ROUNDS).
+    """
+    return _run(verify_and_update, plain_password, hashed_password, settings.BCRYPT_ROUNDS)
+
+
+async def verify_password_and_update_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await _run_async(verify_and_update, plain_password, hashed_password, settings.BCRYPT_ROUNDS)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return verify_password_and_update(plain_password, hashed_password)[0]
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _run(hash_password, password, settings.BCRYPT_ROUNDS)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_async(hash_password, password, settings.BCRYPT_ROUNDS)
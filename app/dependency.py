@@ -1,19 +1,24 @@
-from collections.abc import Generator
+import math
+import uuid
+from collections.abc import AsyncGenerator, Generator
+from datetime import datetime
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, HTTPException, Query, Request, status
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core import security
 from app.core.config import settings
-from app.core.database import engine
-
-from app.modules.models.UserModel import User
-from app.modules.schemas.AuthSchemas import TokenPayload
+from app.core.database import get_async_engine, get_engine
+from app.modules.schemas.AuthSchemas import AuthUser, TokenPayload
+from app.modules.schemas.PostSchemas import PostFilters, TagMatch
+from app.modules.services import AsyncAuthService, AuthService
+from app.modules.shared.ratelimit import client_ip
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/access-token"
@@ -21,26 +26,40 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 
 def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
+        yield session
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # expire_on_commit=False: expired attributes would need an implicit
+    # (and in async, illegal) lazy load when the response is serialized.
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
         yield session
 
 
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def _token_user_id(token: str) -> str:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
-        token_data = TokenPayload(**payload)
+        user_id = TokenPayload(**payload).sub
     except (InvalidTokenError, ValidationError):
+        user_id = None
+    # a token without a subject names no user: not one of ours
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+    return user_id
+
+
+def _check_user(user: AuthUser | None) -> AuthUser:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
@@ -48,12 +67,62 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
     return user
 
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+def get_current_user(session: SessionDep, token: TokenDep) -> AuthUser:
+    return _check_user(AuthService.get_auth_user(session, _token_user_id(token)))
 
 
-def get_current_active_superuser(current_user: CurrentUser) -> User:
+async def get_current_user_async(session: AsyncSessionDep, token: TokenDep) -> AuthUser:
+    return _check_user(await AsyncAuthService.get_auth_user(session, _token_user_id(token)))
+
+
+CurrentUser = Annotated[AuthUser, Depends(get_current_user)]
+AsyncCurrentUser = Annotated[AuthUser, Depends(get_current_user_async)]
+
+
+def _check_superuser(current_user: AuthUser) -> AuthUser:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+def get_current_active_superuser(current_user: CurrentUser) -> AuthUser:
+    return _check_superuser(current_user)
+
+
+async def get_current_active_superuser_async(current_user: AsyncCurrentUser) -> AuthUser:
+    return _check_superuser(current_user)
+
+
+def throttle_login(request: Request, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]) -> None:
+    # a plain def: FastAPI runs it in the threadpool, so a Redis store does
+    # not block the event loop on the async auth router either
+    client = client_ip(request.client.host if request.client else None,
+                       request.headers.getlist("x-forwarded-for"), settings.trusted_proxy_networks)
+    retry_after = AuthService.count_login_attempt(client, form_data.username)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def get_post_filters(
+    category_id: uuid.UUID | None = None,
+    is_published: bool | None = None,
+    is_featured: bool | None = None,
+    published_from: datetime | None = None,
+    published_to: datetime | None = None,
+    tag: Annotated[list[str] | None, Query()] = None,
+    tag_match: TagMatch = "any",
+) -> PostFilters:
+    # a function rather than Depends(PostFilters): list fields in a model
+    # dependency would be read from the body, not as repeated ?tag= params
+    return PostFilters(category_id=category_id, is_published=is_published,
+                       is_featured=is_featured, published_from=published_from,
+                       published_to=published_to, tag=tag, tag_match=tag_match)
+
+
+PostFiltersDep = Annotated[PostFilters, Depends(get_post_filters)]
@@ -0,0 +1,64 @@
+# Import posts from an NDJSON or CSV file (same layout as /posts/export)
+# python -m app.import_posts posts.ndjson
+# python -m app.import_posts posts.csv --chunk-size 100000
+# python -m app.import_posts --resume <import id>
+
+import argparse
+import logging
+import os
+import sys
+import uuid
+
+from sqlmodel import Session
+
+from app.core.database import get_engine
+from app.modules.models.CategoryModel import Category  # noqa: F401
+
+# registers the tables the import models reference by foreign key
+from app.modules.models.UserModel import User  # noqa: F401
+from app.modules.services import PostImportService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import posts with COPY")
+    parser.add_argument("path", nargs="?", help="NDJSON or CSV file to import")
+    parser.add_argument("--format", choices=["ndjson", "csv"],
+                        help="file format, guessed from the extension by default")
+    parser.add_argument("--chunk-size", type=int,
+                        help="rows per transaction (default IMPORT_CHUNK_SIZE)")
+    parser.add_argument("--resume", metavar="IMPORT_ID", type=uuid.UUID,
+                        help="continue a failed or interrupted import")
+    args = parser.parse_args()
+
+    if args.resume:
+        import_id = args.resume
+    elif args.path:
+        file_format = args.format or PostImportService.guess_format(args.path)
+        with Session(get_engine()) as session:
+            created = PostImportService.create_import(
+                session, os.path.abspath(args.path), file_format, args.chunk_size)
+            import_id = created.id
+        logger.info("Created import %s", import_id)
+    else:
+        parser.error("either a path or --resume is required")
+
+    try:
+        post_import = PostImportService.run_import(import_id)
+    except PostImportService.ImportRunningError as exc:
+        logger.error("%s; resume it once that run has stopped", exc)
+        sys.exit(1)
+    except Exception:
+        logger.error("Resume with: python -m app.import_posts --resume %s", import_id)
+        sys.exit(1)
+    if post_import is None:
+        parser.error(f"import {import_id} not found")
+    logger.info("Import %s %s: %d rows read, %d inserted, %d skipped", import_id,
+                post_import.status, post_import.rows_read,
+                post_import.rows_inserted, post_import.rows_skipped)
+
+
+if __name__ == "__main__":
+    main()
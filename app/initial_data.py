@@ -6,14 +6,14 @@ import logging
 
 from sqlmodel import Session
 
-from app.core.database import engine, init_db
+from app.core.database import get_engine, init_db
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 def init() -> None:
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         init_db(session)
 
 
@@ -1,10 +1,24 @@
-import sentry_sdk
-from fastapi import FastAPI
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
+from app import warmup
 from app.api.routes import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.database import dispose_engines, get_async_engine, get_engine
+from app.core.security import PasswordHasherBusy, stop_hash_workers
+from app.modules.routes.HealthRoutes import router as health_router
+from app.modules.services.EmailService import dispatcher as email_dispatcher
+from app.modules.shared.encoding import ORJSONResponse
+from app.modules.shared.pagination import InvalidCursor
+from app.modules.shared.utils import precompile_email_templates
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -12,12 +26,42 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 
 
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
+    # imported only when reporting is on; it is among the heaviest imports
+    import sentry_sdk
+
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    get_engine()
+    if settings.ASYNC_ROUTERS:
+        get_async_engine()
+    if settings.emails_enabled:
+        precompile_email_templates()
+        if settings.EMAIL_WORKERS > 0:
+            email_dispatcher.start(settings.EMAIL_WORKERS)
+    # in the background: the server is already serving /health/live meanwhile
+    warming = asyncio.create_task(warmup.warm_up())
+    yield
+    warmup.state.ready = False
+    warming.cancel()
+    with suppress(asyncio.CancelledError):
+        await warming
+    # joins the workers: off the event loop
+    await run_in_threadpool(email_dispatcher.stop)
+    # the spawned workers would outlive the process otherwise
+    await run_in_threadpool(stop_hash_workers)
+    await dispose_engines()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
+    # validated responses are encoded by orjson instead of json.dumps
+    default_response_class=ORJSONResponse,
 )
 
 # Set all CORS enabled origins
@@ -30,4 +74,26 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+app.add_middleware(
+    CompressionMiddleware,
+    encodings=settings.COMPRESSION_ENCODINGS,
+    levels={"gzip": settings.COMPRESSION_GZIP_LEVEL,
+            "br": settings.COMPRESSION_BROTLI_QUALITY,
+            "zstd": settings.COMPRESSION_ZSTD_LEVEL},
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+)
+
+
+@app.exception_handler(InvalidCursor)
+def invalid_cursor_handler(_request: Request, exc: InvalidCursor) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy_handler(_request: Request, _exc: PasswordHasherBusy) -> JSONResponse:
+    return JSONResponse(status_code=503, headers={"Retry-After": "1"},
+                        content={"detail": "Too many concurrent sign-ins, try again shortly"})
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(health_router, prefix="/health", tags=["Health"])
@@ -1,4 +1,5 @@
-from typing import Optional
+
+from sqlalchemy import Index
 from sqlmodel import Field
 
 from app.modules.shared.base_model import BaseModel
@@ -6,8 +7,11 @@ from app.modules.shared.base_model import BaseModel
 
 class Category(BaseModel, table=True):
     __tablename__ = "categories"
+    __table_args__ = (
+        Index("ix_categories_created_at_id", "created_at", "id"),
+    )
 
     name: str = Field(index=True, max_length=255)
     slug: str = Field(index=True, unique=True, max_length=255)
-    description: Optional[str] = Field(default=None, max_length=1000)
-    image: Optional[str] = Field(default=None, max_length=1024)
+    description: str | None = Field(default=None, max_length=1000)
+    image: str | None = Field(default=None, max_length=1024)
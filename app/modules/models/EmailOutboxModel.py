@@ -0,0 +1,29 @@
+import datetime
+
+from sqlalchemy import Column, Index, Text, text
+from sqlmodel import Field
+
+from app.modules.shared.base_model import BaseModel
+
+
+class EmailOutbox(BaseModel, table=True):
+    """
+    One queued email. `next_attempt_at` is when a worker may (next) claim it;
+    a claim pushes it out by the lease so a crashed worker's mail comes back.
+    The body is cleared once the message is sent or has failed for good.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # the dispatcher's claim query; sent and failed mail is not scanned
+        Index("ix_email_outbox_pending_next_attempt_at", "next_attempt_at",
+              postgresql_where=text("status = 'pending'")),
+    )
+
+    email_to: str = Field(max_length=255)
+    subject: str = Field(max_length=998)
+    html_content: str = Field(sa_column=Column(Text, nullable=False))
+    status: str = Field(default="pending", max_length=16)
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime.datetime
+    last_error: str | None = Field(default=None, max_length=2000)
+    sent_at: datetime.datetime | None = None
@@ -0,0 +1,32 @@
+import datetime
+import uuid
+
+from sqlmodel import Field
+
+from app.modules.shared.base_model import BaseModel
+
+
+class PostImport(BaseModel, table=True):
+    """
+    One COPY import of a posts file. Chunks commit together with the counters
+    below, so `chunks_done` is always the point a resumed run restarts from.
+    A run holds the import by its `run_id` until `lease_until`, renewed with
+    every chunk: a second run is refused meanwhile, one that crashed can be
+    resumed once its lease has run out. `owns_source`: the file is an upload
+    of ours, removed once the import completes.
+    """
+    __tablename__ = "post_imports"
+
+    source: str = Field(max_length=1024)
+    owns_source: bool = Field(default=False)
+    file_format: str = Field(max_length=16)
+    status: str = Field(default="pending", max_length=16)
+    chunk_size: int
+    chunks_done: int = Field(default=0)
+    rows_read: int = Field(default=0)
+    rows_inserted: int = Field(default=0)
+    rows_skipped: int = Field(default=0)
+    error: str | None = Field(default=None, max_length=2000)
+    finished_at: datetime.datetime | None = None
+    run_id: uuid.UUID | None = None
+    lease_until: datetime.datetime | None = None
@@ -1,8 +1,8 @@
-import uuid
 import datetime
+import uuid
 
-from typing import Optional, List
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field
 
 from app.modules.shared.base_model import BaseModel
@@ -10,17 +10,37 @@ from app.modules.shared.base_model import BaseModel
 
 class Post(BaseModel, table=True):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        # listing filters/sorts (see PostService.SORT_KEYS / filter_posts);
+        # the partial ones only match bare `is_published` / `is_featured`
+        Index("ix_posts_category_id_created_at_id",
+              "category_id", "created_at", "id"),
+        Index("ix_posts_published_created_at_id", "created_at", "id",
+              postgresql_where=text("is_published")),
+        Index("ix_posts_featured_created_at_id", "created_at", "id",
+              postgresql_where=text("is_featured")),
+        Index("ix_posts_published_at_id", "published_at", "id",
+              postgresql_where=text("published_at IS NOT NULL")),
+        Index("ix_posts_published_published_at_id", "published_at", "id",
+              postgresql_where=text("is_published AND published_at IS NOT NULL")),
+        # also serves lookups by title (the plain title index it replaced
+        # drew the planner into an incremental sort for ?sort=title)
+        Index("ix_posts_title_id", "title", "id"),
+        # jsonb_ops (not jsonb_path_ops): serves the ?| / ?& tag filters
+        Index("ix_posts_tags", "tags", postgresql_using="gin"),
+    )
 
-    title: str = Field(index=True, max_length=255)
+    title: str = Field(max_length=255)
     slug: str = Field(index=True, unique=True, max_length=255)
     content: str = Field(default="", max_length=10000)
-    image: Optional[str] = Field(default=None, max_length=1024)
-    thumbnail_url: Optional[str] = Field(default=None, max_length=1024)
+    image: str | None = Field(default=None, max_length=1024)
+    thumbnail_url: str | None = Field(default=None, max_length=1024)
     is_published: bool = Field(default=False)
     is_featured: bool = Field(default=False)
-    category_id: Optional[uuid.UUID] = Field(
+    category_id: uuid.UUID | None = Field(
         default=None, foreign_key="categories.id")
-    published_at: Optional[datetime.datetime] = None
-    tags: Optional[List[str]] = Field(
-        default=None, sa_column=Column(JSON, nullable=True)
+    published_at: datetime.datetime | None = None
+    tags: list[str] | None = Field(
+        default=None, sa_column=Column(JSONB(none_as_null=True), nullable=True)
     )
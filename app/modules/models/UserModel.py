@@ -1,5 +1,7 @@
-from typing import Optional
-from sqlmodel import SQLModel, Field
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
 from app.modules.shared.base_model import BaseModel
 
 
@@ -7,14 +9,17 @@ class UserBase(SQLModel):
     email: str = Field(index=True, unique=True, max_length=255)
     is_active: bool = True
     is_superuser: bool = False
-    full_name: Optional[str] = Field(default=None, max_length=255)
+    full_name: str | None = Field(default=None, max_length=255)
 
 
 class User(BaseModel, table=True):
     __tablename__ = "users"
-     
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
     email: str = Field(index=True, unique=True, max_length=255)
     hashed_password: str
     is_active: bool = True
     is_superuser: bool = False
-    full_name: Optional[str] = Field(default=None, max_length=255)
+    full_name: str | None = Field(default=None, max_length=255)
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.core import security
+from app.core.config import settings
+from app.dependency import AsyncCurrentUser, AsyncSessionDep, throttle_login
+from app.modules.schemas.AuthSchemas import Token
+from app.modules.schemas.UserSchemas import NewPassword, UserPublic, UserUpdate
+from app.modules.services import AsyncEmailService, AsyncUserService, AuthService
+from app.modules.services.AsyncAuthService import authenticate
+from app.modules.shared.schemas import Message
+from app.modules.shared.utils import (
+    generate_reset_password_email,
+    verify_password_reset_token,
+)
+
+router = APIRouter()
+
+
+@router.post("/access-token", dependencies=[Depends(throttle_login)])
+async def login_access_token(
+    session: AsyncSessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
+) -> Token:
+    """
+    OAuth2 compatible token login, get an access token for future requests
+    """
+    user = await authenticate(
+        session=session, email=form_data.username, password=form_data.password
+    )
+    if not user:
+        raise HTTPException(
+            status_code=400, detail="Incorrect email or password")
+    elif not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    await run_in_threadpool(AuthService.clear_login_attempts, form_data.username)
+    access_token_expires = timedelta(
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return Token(
+        access_token=security.create_access_token(
+            user.id, expires_delta=access_token_expires
+        )
+    )
+
+
+@router.post("/test-token", response_model=UserPublic)
+async def test_token(session: AsyncSessionDep, current_user: AsyncCurrentUser) -> Any:
+    """
+    Test access token
+    """
+    # current_user is the cached auth snapshot; the profile comes from the row,
+    # which another worker may have deleted within the cache's TTL
+    user = await AsyncUserService.get_user_by_id(session, current_user.id)
+    if not user:
+        AuthService.invalidate_auth_user(current_user.id)
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+@router.post("/password-recovery/{email}")
+async def recover_password(email: str, session: AsyncSessionDep) -> Message:
+    """
+    Password Recovery
+    """
+    if not settings.emails_enabled:
+        raise HTTPException(status_code=503, detail="Email is not configured")
+    user = await AsyncUserService.get_user_by_email(session=session, email=email)
+
+    if not user:
+        raise HTTPException(
+            status_code=404,
+            detail="The user with this email does not exist in the system.",
+        )
+    # the token is put in when the mail is sent, not kept in the outbox
+    email_data = generate_reset_password_email(email_to=user.email, email=email)
+    await AsyncEmailService.enqueue_email(
+        session,
+        email_to=user.email,
+        subject=email_data.subject,
+        html_content=email_data.html_content,
+    )
+    return Message(message="Password recovery email sent")
+
+
+@router.post("/reset-password/")
+async def reset_password(session: AsyncSessionDep, body: NewPassword) -> Message:
+    """
+    Reset password
+    """
+    email = verify_password_reset_token(token=body.token)
+    if not email:
+        raise HTTPException(status_code=400, detail="Invalid token")
+    user = await AsyncUserService.get_user_by_email(session=session, email=email)
+    if not user:
+        raise HTTPException(
+            status_code=404,
+            detail="The user with this email does not exist in the system.",
+        )
+    elif not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    await AsyncUserService.update_user(session, user.id, UserUpdate(password=body.new_password))
+    return Message(message="Password updated successfully")
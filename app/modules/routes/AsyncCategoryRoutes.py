@@ -0,0 +1,104 @@
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from app.dependency import AsyncSessionDep, get_current_active_superuser_async
+from app.modules.schemas import CategorySchemas
+from app.modules.services import AsyncCategoryService
+from app.modules.shared.counting import CountMode
+from app.modules.shared.encoding import item_response, page_response
+from app.modules.shared.etag import (
+    entity_etag,
+    etag_matches,
+    if_match_versions,
+    not_modified,
+    page_etag,
+)
+from app.modules.shared.fields import sparse_fields
+from app.modules.shared.schemas import BulkDelete, BulkDeleteResult, Message
+from app.modules.shared.writes import DuplicateError
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser_async)])
+
+
+@router.get("/", response_model=CategorySchemas.CategoriesPublic)
+async def read_categories(session: AsyncSessionDep, skip: int = 0, limit: int = 100, cursor: str | None = None, count_mode: CountMode = "exact", fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    selected = sparse_fields(fields, CategorySchemas.CategoryRead)
+    page = await AsyncCategoryService.get_all_categories(
+        session, skip, limit, cursor, count_mode, fields=selected)
+    etag = page_etag(page, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return page_response(CategorySchemas.CategoryRead, page, selected, {"ETag": etag})
+
+
+@router.post("/", response_model=CategorySchemas.CategoryRead)
+async def create_category(session: AsyncSessionDep, response: Response, category_in: CategorySchemas.CategoryCreate) -> Any:
+    try:
+        category = await AsyncCategoryService.create_category(session, category_in)
+    except DuplicateError:
+        raise HTTPException(
+            status_code=400, detail="Category slug already exists")
+    response.headers["ETag"] = entity_etag(category)
+    return category
+
+
+@router.post("/bulk", response_model=CategorySchemas.CategoriesBulkResult)
+async def create_categories_bulk(session: AsyncSessionDep, categories_in: list[CategorySchemas.CategoryCreate], chunk_size: int | None = None) -> Any:
+    created, errors = await AsyncCategoryService.bulk_create_categories(
+        session, categories_in, chunk_size)
+    return {"data": created, "errors": errors}
+
+
+@router.patch("/bulk", response_model=CategorySchemas.CategoriesBulkResult)
+async def update_categories_bulk(session: AsyncSessionDep, categories_in: list[CategorySchemas.CategoryBulkUpdate], chunk_size: int | None = None) -> Any:
+    updated, errors = await AsyncCategoryService.bulk_update_categories(
+        session, categories_in, chunk_size)
+    return {"data": updated, "errors": errors}
+
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+async def delete_categories_bulk(session: AsyncSessionDep, body: BulkDelete, chunk_size: int | None = None) -> Any:
+    deleted, errors = await AsyncCategoryService.bulk_delete_categories(
+        session, body.ids, chunk_size)
+    return BulkDeleteResult(deleted=deleted, errors=errors)
+
+
+@router.get("/{category_id}", response_model=CategorySchemas.CategoryRead)
+async def get_category(category_id: uuid.UUID, session: AsyncSessionDep, fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    selected = sparse_fields(fields, CategorySchemas.CategoryRead)
+    category = await AsyncCategoryService.get_category_by_id(session, category_id, fields=selected)
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+    etag = entity_etag(category, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return item_response(CategorySchemas.CategoryRead, category, selected, {"ETag": etag})
+
+
+@router.patch("/{category_id}", response_model=CategorySchemas.CategoryRead)
+async def update_category(category_id: uuid.UUID, category_in: CategorySchemas.CategoryUpdate, session: AsyncSessionDep, response: Response, if_match: str | None = Header(None)) -> Any:
+    versions = if_match_versions(if_match, category_id)
+    try:
+        category = await AsyncCategoryService.update_category(session, category_id, category_in, versions)
+    except DuplicateError:
+        raise HTTPException(
+            status_code=409, detail="Category slug already exists")
+    if not category:
+        if versions is not None and await AsyncCategoryService.get_category_by_id(session, category_id):
+            raise HTTPException(status_code=412, detail="Category has been modified")
+        raise HTTPException(status_code=404, detail="Category not found")
+    response.headers["ETag"] = entity_etag(category)
+    return category
+
+
+@router.delete("/{category_id}", response_model=Message)
+async def delete_category(category_id: uuid.UUID, session: AsyncSessionDep, if_match: str | None = Header(None)) -> Any:
+    versions = if_match_versions(if_match, category_id)
+    deleted = await AsyncCategoryService.delete_category(session, category_id, versions)
+    if not deleted:
+        if versions is not None and await AsyncCategoryService.get_category_by_id(session, category_id):
+            raise HTTPException(status_code=412, detail="Category has been modified")
+        raise HTTPException(status_code=404, detail="Category not found")
+    return Message(message="Category deleted successfully")
@@ -0,0 +1,188 @@
+import uuid
+from typing import Any
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.dependency import (
+    AsyncCurrentUser,
+    AsyncSessionDep,
+    PostFiltersDep,
+    get_current_active_superuser_async,
+)
+from app.modules.schemas import PostSchemas
+from app.modules.services import (
+    AsyncPostImportService,
+    AsyncPostService,
+    PostImportService,
+)
+from app.modules.shared.counting import CountMode
+from app.modules.shared.encoding import item_response, page_response
+from app.modules.shared.etag import (
+    entity_etag,
+    etag_matches,
+    if_match_versions,
+    not_modified,
+    page_etag,
+)
+from app.modules.shared.export import CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE
+from app.modules.shared.fields import parse_fields, sparse_fields
+from app.modules.shared.schemas import BulkDelete, BulkDeleteResult, Message
+from app.modules.shared.writes import DuplicateError
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser_async)])
+
+
+@router.get("/", response_model=PostSchemas.PostsPublic)
+async def read_posts(session: AsyncSessionDep, filters: PostFiltersDep, skip: int = 0, limit: int = 100, cursor: str | None = None, count_mode: CountMode = "exact", sort: PostSchemas.PostSort = "created_at", order: PostSchemas.SortOrder = "desc", fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    """
+    Newest first by default. sort=published_at only lists posts that have a
+    published_at. A cursor is only valid for the sort/order it came from.
+    """
+    selected = sparse_fields(fields, PostSchemas.PostRead)
+    page = await AsyncPostService.get_all_posts(
+        session, skip, limit, cursor, count_mode, filters, sort, order, fields=selected)
+    etag = page_etag(page, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return page_response(PostSchemas.PostRead, page, selected, {"ETag": etag})
+
+
+@router.post("/", response_model=PostSchemas.PostRead)
+async def create_post(session: AsyncSessionDep, response: Response, post_in: PostSchemas.PostCreate) -> Any:
+    try:
+        post = await AsyncPostService.create_post(session, post_in)
+    except DuplicateError:
+        raise HTTPException(
+            status_code=400, detail="Post slug already exists")
+    response.headers["ETag"] = entity_etag(post)
+    return post
+
+
+@router.post("/bulk", response_model=PostSchemas.PostsBulkResult)
+async def create_posts_bulk(session: AsyncSessionDep, posts_in: list[PostSchemas.PostCreate], chunk_size: int | None = None) -> Any:
+    created, errors = await AsyncPostService.bulk_create_posts(session, posts_in, chunk_size)
+    return {"data": created, "errors": errors}
+
+
+@router.patch("/bulk", response_model=PostSchemas.PostsBulkResult)
+async def update_posts_bulk(session: AsyncSessionDep, posts_in: list[PostSchemas.PostBulkUpdate], chunk_size: int | None = None) -> Any:
+    updated, errors = await AsyncPostService.bulk_update_posts(session, posts_in, chunk_size)
+    return {"data": updated, "errors": errors}
+
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+async def delete_posts_bulk(session: AsyncSessionDep, body: BulkDelete, chunk_size: int | None = None) -> Any:
+    deleted, errors = await AsyncPostService.bulk_delete_posts(session, body.ids, chunk_size)
+    return BulkDeleteResult(deleted=deleted, errors=errors)
+
+
+@router.get("/search", response_model=PostSchemas.PostSearchResults)
+async def search_posts(session: AsyncSessionDep, filters: PostFiltersDep, q: str = Query(min_length=1, max_length=256), highlight: bool = False, limit: int = 10, cursor: str | None = None) -> Any:
+    page = await AsyncPostService.search_posts(
+        session, q, highlight, limit, cursor, filters)
+    return PostSchemas.PostSearchResults(data=page.items, next_cursor=page.next_cursor)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_posts(filters: PostFiltersDep, export_format: PostSchemas.ExportFormat = Query("ndjson", alias="format"), fields: str | None = None) -> Any:
+    """
+    Stream every post matching the filters as NDJSON or CSV; `fields` limits
+    the exported columns (e.g. leave out `content`).
+    """
+    columns = parse_fields(fields, PostSchemas.PostRead)
+    media_type = CSV_MEDIA_TYPE if export_format == "csv" else NDJSON_MEDIA_TYPE
+    return StreamingResponse(
+        AsyncPostService.export_posts(filters, columns, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="posts.{export_format}"'},
+    )
+
+
+@router.post("/import", response_model=PostSchemas.PostImportRead, status_code=202)
+async def import_posts(session: AsyncSessionDep, current_user: AsyncCurrentUser, background_tasks: BackgroundTasks, file: UploadFile, import_format: PostSchemas.ExportFormat | None = Query(None, alias="format"), chunk_size: int | None = Query(None, gt=0)) -> Any:
+    """
+    Load an NDJSON or CSV file of posts (the /export layout) with COPY. The
+    import runs in the background; poll /imports/{import_id} for progress.
+    """
+    file_format = import_format or PostImportService.guess_format(file.filename)
+    source = await run_in_threadpool(PostImportService.save_upload, file.file, file_format)
+    post_import = await AsyncPostImportService.create_import(
+        session, source, file_format, chunk_size, current_user.id, owns_source=True)
+    background_tasks.add_task(PostImportService.run_import, post_import.id)
+    return post_import
+
+
+@router.get("/imports/{import_id}", response_model=PostSchemas.PostImportRead)
+async def get_post_import(import_id: uuid.UUID, session: AsyncSessionDep) -> Any:
+    post_import = await AsyncPostImportService.get_import(session, import_id)
+    if not post_import:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return post_import
+
+
+@router.post("/imports/{import_id}/resume", response_model=PostSchemas.PostImportRead, status_code=202)
+async def resume_post_import(import_id: uuid.UUID, session: AsyncSessionDep, background_tasks: BackgroundTasks) -> Any:
+    """
+    Continue a failed or interrupted import. 409 while a run still holds it;
+    a run that died gives it up IMPORT_LEASE_SECONDS after its last chunk.
+    """
+    post_import = await AsyncPostImportService.get_import(session, import_id)
+    if not post_import:
+        raise HTTPException(status_code=404, detail="Import not found")
+    if post_import.status == "completed":
+        raise HTTPException(status_code=400, detail="Import already completed")
+    claimed = await AsyncPostImportService.claim_import(session, import_id)
+    if not claimed:
+        raise HTTPException(status_code=409, detail="Import is already running")
+    background_tasks.add_task(PostImportService.run_import, claimed.id, claimed.run_id)
+    return claimed
+
+
+@router.get("/{post_id}", response_model=PostSchemas.PostRead)
+async def get_post(post_id: uuid.UUID, session: AsyncSessionDep, fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    selected = sparse_fields(fields, PostSchemas.PostRead)
+    post = await AsyncPostService.get_post_by_id(session, post_id, fields=selected)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    etag = entity_etag(post, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return item_response(PostSchemas.PostRead, post, selected, {"ETag": etag})
+
+
+@router.patch("/{post_id}", response_model=PostSchemas.PostRead)
+async def update_post(post_id: uuid.UUID, post_in: PostSchemas.PostUpdate, session: AsyncSessionDep, response: Response, if_match: str | None = Header(None)) -> Any:
+    versions = if_match_versions(if_match, post_id)
+    try:
+        post = await AsyncPostService.update_post(session, post_id, post_in, versions)
+    except DuplicateError:
+        raise HTTPException(
+            status_code=409, detail="Post slug already exists")
+    if not post:
+        if versions is not None and await AsyncPostService.get_post_by_id(session, post_id):
+            raise HTTPException(status_code=412, detail="Post has been modified")
+        raise HTTPException(status_code=404, detail="Post not found")
+    response.headers["ETag"] = entity_etag(post)
+    return post
+
+
+@router.delete("/{post_id}", response_model=Message)
+async def delete_post(post_id: uuid.UUID, session: AsyncSessionDep, if_match: str | None = Header(None)) -> Any:
+    versions = if_match_versions(if_match, post_id)
+    deleted = await AsyncPostService.delete_post(session, post_id, versions)
+    if not deleted:
+        if versions is not None and await AsyncPostService.get_post_by_id(session, post_id):
+            raise HTTPException(status_code=412, detail="Post has been modified")
+        raise HTTPException(status_code=404, detail="Post not found")
+    return Message(message="Post deleted successfully")
@@ -0,0 +1,14 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+
+from app.dependency import AsyncSessionDep, get_current_active_superuser_async
+from app.modules.schemas import TagSchemas
+from app.modules.services import AsyncTagService
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser_async)])
+
+
+@router.get("/", response_model=TagSchemas.TagsPublic)
+async def read_tags(session: AsyncSessionDep, limit: int = Query(100, ge=1, le=1000)) -> Any:
+    return TagSchemas.TagsPublic(data=await AsyncTagService.get_tag_counts(session, limit))
@@ -0,0 +1,97 @@
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from app.core.config import settings
+from app.dependency import (
+    AsyncCurrentUser,
+    AsyncSessionDep,
+    get_current_active_superuser_async,
+)
+from app.modules.schemas import UserSchemas
+from app.modules.services import AsyncUserService
+from app.modules.shared.counting import CountMode
+from app.modules.shared.encoding import item_response, page_response
+from app.modules.shared.etag import (
+    entity_etag,
+    etag_matches,
+    if_match_versions,
+    not_modified,
+    page_etag,
+)
+from app.modules.shared.fields import sparse_fields
+from app.modules.shared.schemas import Message
+from app.modules.shared.utils import generate_new_account_email
+from app.modules.shared.writes import DuplicateError
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser_async)])
+
+
+@router.get("/", response_model=UserSchemas.UsersPublic)
+async def read_users(session: AsyncSessionDep, skip: int = 0, limit: int = 100, cursor: str | None = None, count_mode: CountMode = "exact", fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    selected = sparse_fields(fields, UserSchemas.UserPublic)
+    page = await AsyncUserService.get_all_users(session, skip, limit, cursor, count_mode, fields=selected)
+    etag = page_etag(page, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return page_response(UserSchemas.UserPublic, page, selected, {"ETag": etag})
+
+
+@router.post("/", response_model=UserSchemas.UserPublic)
+async def create_user(*, session: AsyncSessionDep, response: Response, user_in: UserSchemas.UserCreate) -> Any:
+    welcome = None
+    if settings.emails_enabled:
+        welcome = generate_new_account_email(
+            email_to=user_in.email, username=user_in.email)
+    try:
+        user = await AsyncUserService.create_user(session=session, user_create=user_in, welcome=welcome)
+    except DuplicateError:
+        raise HTTPException(
+            status_code=400, detail="User with this email already exists")
+    response.headers["ETag"] = entity_etag(user)
+    return user
+
+
+@router.get("/{user_id}", response_model=UserSchemas.UserPublic)
+async def read_user_by_id(user_id: uuid.UUID, session: AsyncSessionDep, current_user: AsyncCurrentUser, fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    selected = sparse_fields(fields, UserSchemas.UserPublic)
+    user = await AsyncUserService.get_user_by_id(session, user_id, fields=selected)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if user.id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough privileges")
+    etag = entity_etag(user, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return item_response(UserSchemas.UserPublic, user, selected, {"ETag": etag})
+
+
+@router.patch("/{user_id}", response_model=UserSchemas.UserPublic)
+async def update_user(*, session: AsyncSessionDep, response: Response, user_id: uuid.UUID, user_in: UserSchemas.UserUpdate, if_match: str | None = Header(None)) -> Any:
+    versions = if_match_versions(if_match, user_id)
+    try:
+        user = await AsyncUserService.update_user(
+            session=session, user_id=user_id, user_in=user_in, versions=versions)
+    except DuplicateError:
+        raise HTTPException(
+            status_code=409, detail="User with this email already exists")
+    if not user:
+        if versions is not None and await AsyncUserService.get_user_by_id(session, user_id):
+            raise HTTPException(status_code=412, detail="User has been modified")
+        raise HTTPException(status_code=404, detail="User not found")
+    response.headers["ETag"] = entity_etag(user)
+    return user
+
+
+@router.delete("/{user_id}", response_model=Message)
+async def delete_user(session: AsyncSessionDep, current_user: AsyncCurrentUser, user_id: uuid.UUID, if_match: str | None = Header(None)) -> Any:
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=403, detail="Super users are not allowed to delete themselves")
+    versions = if_match_versions(if_match, user_id)
+    if not await AsyncUserService.delete_user(session=session, user_id=user_id, versions=versions):
+        if versions is not None and await AsyncUserService.get_user_by_id(session, user_id):
+            raise HTTPException(status_code=412, detail="User has been modified")
+        raise HTTPException(status_code=404, detail="User not found")
+    return Message(message="User deleted successfully")
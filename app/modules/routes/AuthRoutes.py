@@ -2,39 +2,45 @@ from datetime import timedelta
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
 # from fastapi.responses import HTMLResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.dependency import CurrentUser, SessionDep, get_current_active_superuser
 from app.core import security
 from app.core.config import settings
-from app.core.security import get_password_hash
-from app.modules.schemas.UserSchemas import NewPassword, UserPublic
-# from app.modules.shared.schemas import Message
+from app.dependency import (
+    CurrentUser,
+    SessionDep,
+    throttle_login,
+)
 from app.modules.schemas.AuthSchemas import Token
-# from app.modules.shared.utils import (
-#     generate_password_reset_token,
-#     generate_reset_password_email,
-#     send_email,
-#     verify_password_reset_token,
-# )
-
+from app.modules.schemas.UserSchemas import NewPassword, UserPublic, UserUpdate
+from app.modules.services import EmailService, UserService
 from app.modules.services.AuthService import (
-    authenticate,
-    get_user_by_email
+    authenticate_offloaded,
+    clear_login_attempts,
+    invalidate_auth_user,
+)
+from app.modules.shared.schemas import Message
+from app.modules.shared.utils import (
+    generate_reset_password_email,
+    verify_password_reset_token,
 )
 
 router = APIRouter()
 
 
-@router.post("/access-token")
-def login_access_token(
+# async on this router too: a threadpool thread waiting out bcrypt for each
+# login would let a burst of them starve every other sync route
+@router.post("/access-token", dependencies=[Depends(throttle_login)])
+async def login_access_token(
     session: SessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ) -> Token:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = authenticate(
+    user = await authenticate_offloaded(
         session=session, email=form_data.username, password=form_data.password
     )
     if not user:
@@ -42,6 +48,7 @@ def login_access_token(
             status_code=400, detail="Incorrect email or password")
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    await run_in_threadpool(clear_login_attempts, form_data.username)
     access_token_expires = timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return Token(
@@ -52,55 +59,59 @@ def login_access_token(
 
 
 @router.post("/test-token", response_model=UserPublic)
-def test_token(current_user: CurrentUser) -> Any:
+def test_token(session: SessionDep, current_user: CurrentUser) -> Any:
     """
     Test access token
     """
-    return current_user
+    # current_user is the cached auth snapshot; the profile comes from the row,
+    # which another worker may have deleted within the cache's TTL
+    user = UserService.get_user_by_id(session, current_user.id)
+    if not user:
+        invalidate_auth_user(current_user.id)
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 
-# @router.post("/password-recovery/{email}")
-# def recover_password(email: str, session: SessionDep) -> Message:
-#     """
-#     Password Recovery
-#     """
-#     user = get_user_by_email(session=session, email=email)
+@router.post("/password-recovery/{email}")
+def recover_password(email: str, session: SessionDep) -> Message:
+    """
+    Password Recovery
+    """
+    if not settings.emails_enabled:
+        raise HTTPException(status_code=503, detail="Email is not configured")
+    user = UserService.get_user_by_email(session=session, email=email)
 
-#     if not user:
-#         raise HTTPException(
-#             status_code=404,
-#             detail="The user with this email does not exist in the system.",
-#         )
-#     password_reset_token = generate_password_reset_token(email=email)
-#     email_data = generate_reset_password_email(
-#         email_to=user.email, email=email, token=password_reset_token
-#     )
-#     send_email(
-#         email_to=user.email,
-#         subject=email_data.subject,
-#         html_content=email_data.html_content,
-#     )
-#     return Message(message="Password recovery email sent")
+    if not user:
+        raise HTTPException(
+            status_code=404,
+            detail="The user with this email does not exist in the system.",
+        )
+    # the token is put in when the mail is sent, not kept in the outbox
+    email_data = generate_reset_password_email(email_to=user.email, email=email)
+    EmailService.enqueue_email(
+        session,
+        email_to=user.email,
+        subject=email_data.subject,
+        html_content=email_data.html_content,
+    )
+    return Message(message="Password recovery email sent")
 
 
-# @router.post("/reset-password/")
-# def reset_password(session: SessionDep, body: NewPassword) -> Message:
-#     """
-#     Reset password
-#     """
-#     email = verify_password_reset_token(token=body.token)
-#     if not email:
-#         raise HTTPException(status_code=400, detail="Invalid token")
-#     user = get_user_by_email(session=session, email=email)
-#     if not user:
-#         raise HTTPException(
-#             status_code=404,
-#             detail="The user with this email does not exist in the system.",
-#         )
-#     elif not user.is_active:
-#         raise HTTPException(status_code=400, detail="Inactive user")
-#     hashed_password = get_password_hash(password=body.new_password)
-#     user.hashed_password = hashed_password
-#     session.add(user)
-#     session.commit()
-#     return Message(message="Password updated successfully")
+@router.post("/reset-password/")
+def reset_password(session: SessionDep, body: NewPassword) -> Message:
+    """
+    Reset password
+    """
+    email = verify_password_reset_token(token=body.token)
+    if not email:
+        raise HTTPException(status_code=400, detail="Invalid token")
+    user = UserService.get_user_by_email(session=session, email=email)
+    if not user:
+        raise HTTPException(
+            status_code=404,
+            detail="The user with this email does not exist in the system.",
+        )
+    elif not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    UserService.update_user(session, user.id, UserUpdate(password=body.new_password))
+    return Message(message="Password updated successfully")
@@ -1,53 +1,104 @@
 import uuid
 from typing import Any
-from app.modules.models import CategoryModel
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from app.dependency import SessionDep, get_current_active_superuser
 from app.modules.schemas import CategorySchemas
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import select, func
 from app.modules.services import CategoryService
-from app.modules.shared.schemas import Message
-from app.dependency import SessionDep, get_current_active_superuser
+from app.modules.shared.counting import CountMode
+from app.modules.shared.encoding import item_response, page_response
+from app.modules.shared.etag import (
+    entity_etag,
+    etag_matches,
+    if_match_versions,
+    not_modified,
+    page_etag,
+)
+from app.modules.shared.fields import sparse_fields
+from app.modules.shared.schemas import BulkDelete, BulkDeleteResult, Message
+from app.modules.shared.writes import DuplicateError
 
 router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
 
 
 @router.get("/", response_model=CategorySchemas.CategoriesPublic)
-def read_categories(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
-    count = session.exec(
-        select(func.count()).select_from(CategoryModel.Category)).one()
-    categories = CategoryService.get_all_categories(session, skip, limit)
-    return CategorySchemas.CategoriesPublic(data=categories, count=count)
+def read_categories(session: SessionDep, skip: int = 0, limit: int = 100, cursor: str | None = None, count_mode: CountMode = "exact", fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    selected = sparse_fields(fields, CategorySchemas.CategoryRead)
+    page = CategoryService.get_all_categories(
+        session, skip, limit, cursor, count_mode, fields=selected)
+    etag = page_etag(page, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return page_response(CategorySchemas.CategoryRead, page, selected, {"ETag": etag})
 
 
 @router.post("/", response_model=CategorySchemas.CategoryRead)
-def create_category(session: SessionDep, category_in: CategorySchemas.CategoryCreate) -> Any:
-    existing = CategoryService.get_category_by_slug(
-        session=session, slug=category_in.slug)
-    if existing:
+def create_category(session: SessionDep, response: Response, category_in: CategorySchemas.CategoryCreate) -> Any:
+    try:
+        category = CategoryService.create_category(session, category_in)
+    except DuplicateError:
         raise HTTPException(
             status_code=400, detail="Category slug already exists")
-    return CategoryService.create_category(session, category_in)
+    response.headers["ETag"] = entity_etag(category)
+    return category
+
+
+@router.post("/bulk", response_model=CategorySchemas.CategoriesBulkResult)
+def create_categories_bulk(session: SessionDep, categories_in: list[CategorySchemas.CategoryCreate], chunk_size: int | None = None) -> Any:
+    created, errors = CategoryService.bulk_create_categories(
+        session, categories_in, chunk_size)
+    return {"data": created, "errors": errors}
+
+
+@router.patch("/bulk", response_model=CategorySchemas.CategoriesBulkResult)
+def update_categories_bulk(session: SessionDep, categories_in: list[CategorySchemas.CategoryBulkUpdate], chunk_size: int | None = None) -> Any:
+    updated, errors = CategoryService.bulk_update_categories(
+        session, categories_in, chunk_size)
+    return {"data": updated, "errors": errors}
+
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def delete_categories_bulk(session: SessionDep, body: BulkDelete, chunk_size: int | None = None) -> Any:
+    deleted, errors = CategoryService.bulk_delete_categories(
+        session, body.ids, chunk_size)
+    return BulkDeleteResult(deleted=deleted, errors=errors)
 
 
 @router.get("/{category_id}", response_model=CategorySchemas.CategoryRead)
-def get_category(category_id: uuid.UUID, session: SessionDep) -> Any:
-    category = CategoryService.get_category_by_id(session, category_id)
+def get_category(category_id: uuid.UUID, session: SessionDep, fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    selected = sparse_fields(fields, CategorySchemas.CategoryRead)
+    category = CategoryService.get_category_by_id(session, category_id, fields=selected)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
-    return category
+    etag = entity_etag(category, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return item_response(CategorySchemas.CategoryRead, category, selected, {"ETag": etag})
 
 
 @router.patch("/{category_id}", response_model=CategorySchemas.CategoryRead)
-def update_category(category_id: uuid.UUID, category_in: CategorySchemas.CategoryUpdate, session: SessionDep) -> Any:
-    db_category = CategoryService.get_category_by_id(session, category_id)
-    if not db_category:
+def update_category(category_id: uuid.UUID, category_in: CategorySchemas.CategoryUpdate, session: SessionDep, response: Response, if_match: str | None = Header(None)) -> Any:
+    versions = if_match_versions(if_match, category_id)
+    try:
+        category = CategoryService.update_category(session, category_id, category_in, versions)
+    except DuplicateError:
+        raise HTTPException(
+            status_code=409, detail="Category slug already exists")
+    if not category:
+        if versions is not None and CategoryService.get_category_by_id(session, category_id):
+            raise HTTPException(status_code=412, detail="Category has been modified")
         raise HTTPException(status_code=404, detail="Category not found")
-    return CategoryService.update_category(session, db_category, category_in)
+    response.headers["ETag"] = entity_etag(category)
+    return category
 
 
 @router.delete("/{category_id}", response_model=Message)
-def delete_category(category_id: uuid.UUID, session: SessionDep) -> Any:
-    deleted = CategoryService.delete_category(session, category_id)
+def delete_category(category_id: uuid.UUID, session: SessionDep, if_match: str | None = Header(None)) -> Any:
+    versions = if_match_versions(if_match, category_id)
+    deleted = CategoryService.delete_category(session, category_id, versions)
     if not deleted:
+        if versions is not None and CategoryService.get_category_by_id(session, category_id):
+            raise HTTPException(status_code=412, detail="Category has been modified")
         raise HTTPException(status_code=404, detail="Category not found")
     return Message(message="Category deleted successfully")
@@ -0,0 +1,29 @@
+from typing import Any
+
+from fastapi import APIRouter, Response
+
+from app import warmup
+from app.modules.shared.schemas import Message, Readiness
+
+router = APIRouter()
+
+# Both async: answered on the event loop even when every worker thread is
+# busy, so a loaded worker is not mistaken for a dead one.
+
+
+@router.get("/live", response_model=Message)
+async def live() -> Any:
+    """The process is up and serving requests."""
+    return Message(message="OK")
+
+
+@router.get("/ready", response_model=Readiness, responses={503: {"model": Readiness}})
+async def ready(response: Response) -> Any:
+    """
+    503 until this worker has finished its warm-up (see app.warmup), and
+    again once it is shutting down.
+    """
+    readiness = warmup.state.readiness()
+    if not readiness.ready:
+        response.status_code = 503
+    return readiness
@@ -0,0 +1,36 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.core.pool import pool_stats
+from app.dependency import get_current_active_superuser
+from app.modules.shared.cache import cache_stats
+from app.modules.shared.ratelimit import limiter_stats
+from app.modules.shared.schemas import CacheStats, PoolStats, RateLimitStats
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+
+@router.get("/caches", response_model=dict[str, CacheStats])
+def read_cache_stats() -> Any:
+    """
+    Size and hit/miss counters of the in-process caches of the worker that
+    served the request.
+    """
+    return cache_stats()
+
+
+@router.get("/rate-limits", response_model=dict[str, RateLimitStats])
+def read_rate_limit_stats() -> Any:
+    """Allowed/rejected counters of this worker's rate limiters."""
+    return limiter_stats()
+
+
+@router.get("/db-pools", response_model=dict[str, PoolStats])
+def read_pool_stats() -> Any:
+    """
+    Connection pool usage of this worker's engines ("sync", and "async" when
+    ASYNC_ROUTERS is set): connections in use, overflow, checkout waits and
+    timeouts.
+    """
+    return pool_stats()
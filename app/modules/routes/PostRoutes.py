@@ -1,54 +1,183 @@
 import uuid
 from typing import Any
-from app.modules.models import PostModel
-from app.modules.schemas import PostSchemas
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import select, func
 
-from app.modules.services import PostService
-from app.modules.shared.schemas import Message
-from app.dependency import SessionDep, get_current_active_superuser
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+
+from app.dependency import (
+    CurrentUser,
+    PostFiltersDep,
+    SessionDep,
+    get_current_active_superuser,
+)
+from app.modules.schemas import PostSchemas
+from app.modules.services import PostImportService, PostService
+from app.modules.shared.counting import CountMode
+from app.modules.shared.encoding import item_response, page_response
+from app.modules.shared.etag import (
+    entity_etag,
+    etag_matches,
+    if_match_versions,
+    not_modified,
+    page_etag,
+)
+from app.modules.shared.export import CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE
+from app.modules.shared.fields import parse_fields, sparse_fields
+from app.modules.shared.schemas import BulkDelete, BulkDeleteResult, Message
+from app.modules.shared.writes import DuplicateError
 
 router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
 
 
 @router.get("/", response_model=PostSchemas.PostsPublic)
-def read_posts(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
-    count = session.exec(
-        select(func.count()).select_from(PostModel.Post)).one()
-    posts = PostService.get_all_posts(session, skip, limit)
-    return PostSchemas.PostsPublic(data=posts, count=count)
+def read_posts(session: SessionDep, filters: PostFiltersDep, skip: int = 0, limit: int = 100, cursor: str | None = None, count_mode: CountMode = "exact", sort: PostSchemas.PostSort = "created_at", order: PostSchemas.SortOrder = "desc", fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    """
+    Newest first by default. sort=published_at only lists posts that have a
+    published_at. A cursor is only valid for the sort/order it came from.
+    """
+    selected = sparse_fields(fields, PostSchemas.PostRead)
+    page = PostService.get_all_posts(
+        session, skip, limit, cursor, count_mode, filters, sort, order, fields=selected)
+    etag = page_etag(page, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return page_response(PostSchemas.PostRead, page, selected, {"ETag": etag})
 
 
 @router.post("/", response_model=PostSchemas.PostRead)
-def create_post(session: SessionDep, post_in: PostSchemas.PostCreate) -> Any:
-    existing = PostService.get_post_by_slug(
-        session=session, slug=post_in.slug)
-    if existing:
+def create_post(session: SessionDep, response: Response, post_in: PostSchemas.PostCreate) -> Any:
+    try:
+        post = PostService.create_post(session, post_in)
+    except DuplicateError:
         raise HTTPException(
             status_code=400, detail="Post slug already exists")
-    return PostService.create_post(session, post_in)
+    response.headers["ETag"] = entity_etag(post)
+    return post
+
+
+@router.post("/bulk", response_model=PostSchemas.PostsBulkResult)
+def create_posts_bulk(session: SessionDep, posts_in: list[PostSchemas.PostCreate], chunk_size: int | None = None) -> Any:
+    created, errors = PostService.bulk_create_posts(session, posts_in, chunk_size)
+    return {"data": created, "errors": errors}
+
+
+@router.patch("/bulk", response_model=PostSchemas.PostsBulkResult)
+def update_posts_bulk(session: SessionDep, posts_in: list[PostSchemas.PostBulkUpdate], chunk_size: int | None = None) -> Any:
+    updated, errors = PostService.bulk_update_posts(session, posts_in, chunk_size)
+    return {"data": updated, "errors": errors}
+
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def delete_posts_bulk(session: SessionDep, body: BulkDelete, chunk_size: int | None = None) -> Any:
+    deleted, errors = PostService.bulk_delete_posts(session, body.ids, chunk_size)
+    return BulkDeleteResult(deleted=deleted, errors=errors)
+
+
+@router.get("/search", response_model=PostSchemas.PostSearchResults)
+def search_posts(session: SessionDep, filters: PostFiltersDep, q: str = Query(min_length=1, max_length=256), highlight: bool = False, limit: int = 10, cursor: str | None = None) -> Any:
+    page = PostService.search_posts(
+        session, q, highlight, limit, cursor, filters)
+    return PostSchemas.PostSearchResults(data=page.items, next_cursor=page.next_cursor)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_posts(filters: PostFiltersDep, export_format: PostSchemas.ExportFormat = Query("ndjson", alias="format"), fields: str | None = None) -> Any:
+    """
+    Stream every post matching the filters as NDJSON or CSV; `fields` limits
+    the exported columns (e.g. leave out `content`).
+    """
+    columns = parse_fields(fields, PostSchemas.PostRead)
+    media_type = CSV_MEDIA_TYPE if export_format == "csv" else NDJSON_MEDIA_TYPE
+    return StreamingResponse(
+        PostService.export_posts(filters, columns, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="posts.{export_format}"'},
+    )
+
+
+@router.post("/import", response_model=PostSchemas.PostImportRead, status_code=202)
+def import_posts(session: SessionDep, current_user: CurrentUser, background_tasks: BackgroundTasks, file: UploadFile, import_format: PostSchemas.ExportFormat | None = Query(None, alias="format"), chunk_size: int | None = Query(None, gt=0)) -> Any:
+    """
+    Load an NDJSON or CSV file of posts (the /export layout) with COPY. The
+    import runs in the background; poll /imports/{import_id} for progress.
+    """
+    file_format = import_format or PostImportService.guess_format(file.filename)
+    source = PostImportService.save_upload(file.file, file_format)
+    post_import = PostImportService.create_import(
+        session, source, file_format, chunk_size, current_user.id, owns_source=True)
+    background_tasks.add_task(PostImportService.run_import, post_import.id)
+    return post_import
+
+
+@router.get("/imports/{import_id}", response_model=PostSchemas.PostImportRead)
+def get_post_import(import_id: uuid.UUID, session: SessionDep) -> Any:
+    post_import = PostImportService.get_import(session, import_id)
+    if not post_import:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return post_import
+
+
+@router.post("/imports/{import_id}/resume", response_model=PostSchemas.PostImportRead, status_code=202)
+def resume_post_import(import_id: uuid.UUID, session: SessionDep, background_tasks: BackgroundTasks) -> Any:
+    """
+    Continue a failed or interrupted import. 409 while a run still holds it;
+    a run that died gives it up IMPORT_LEASE_SECONDS after its last chunk.
+    """
+    post_import = PostImportService.get_import(session, import_id)
+    if not post_import:
+        raise HTTPException(status_code=404, detail="Import not found")
+    if post_import.status == "completed":
+        raise HTTPException(status_code=400, detail="Import already completed")
+    claimed = PostImportService.claim_import(session, import_id)
+    if not claimed:
+        raise HTTPException(status_code=409, detail="Import is already running")
+    background_tasks.add_task(PostImportService.run_import, claimed.id, claimed.run_id)
+    return claimed
 
 
 @router.get("/{post_id}", response_model=PostSchemas.PostRead)
-def get_post(post_id: uuid.UUID, session: SessionDep) -> Any:
-    post = PostService.get_post_by_id(session, post_id)
+def get_post(post_id: uuid.UUID, session: SessionDep, fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    selected = sparse_fields(fields, PostSchemas.PostRead)
+    post = PostService.get_post_by_id(session, post_id, fields=selected)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return post
+    etag = entity_etag(post, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return item_response(PostSchemas.PostRead, post, selected, {"ETag": etag})
 
 
 @router.patch("/{post_id}", response_model=PostSchemas.PostRead)
-def update_post(post_id: uuid.UUID, post_in: PostSchemas.PostUpdate, session: SessionDep) -> Any:
-    db_post = PostService.get_post_by_id(session, post_id)
-    if not db_post:
+def update_post(post_id: uuid.UUID, post_in: PostSchemas.PostUpdate, session: SessionDep, response: Response, if_match: str | None = Header(None)) -> Any:
+    versions = if_match_versions(if_match, post_id)
+    try:
+        post = PostService.update_post(session, post_id, post_in, versions)
+    except DuplicateError:
+        raise HTTPException(
+            status_code=409, detail="Post slug already exists")
+    if not post:
+        if versions is not None and PostService.get_post_by_id(session, post_id):
+            raise HTTPException(status_code=412, detail="Post has been modified")
         raise HTTPException(status_code=404, detail="Post not found")
-    return PostService.update_post(session, db_post, post_in)
+    response.headers["ETag"] = entity_etag(post)
+    return post
 
 
 @router.delete("/{post_id}", response_model=Message)
-def delete_post(post_id: uuid.UUID, session: SessionDep) -> Any:
-    deleted = PostService.delete_post(session, post_id)
+def delete_post(post_id: uuid.UUID, session: SessionDep, if_match: str | None = Header(None)) -> Any:
+    versions = if_match_versions(if_match, post_id)
+    deleted = PostService.delete_post(session, post_id, versions)
     if not deleted:
+        if versions is not None and PostService.get_post_by_id(session, post_id):
+            raise HTTPException(status_code=412, detail="Post has been modified")
         raise HTTPException(status_code=404, detail="Post not found")
     return Message(message="Post deleted successfully")
@@ -0,0 +1,14 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+
+from app.dependency import SessionDep, get_current_active_superuser
+from app.modules.schemas import TagSchemas
+from app.modules.services import TagService
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+
+@router.get("/", response_model=TagSchemas.TagsPublic)
+def read_tags(session: SessionDep, limit: int = Query(100, ge=1, le=1000)) -> Any:
+    return TagSchemas.TagsPublic(data=TagService.get_tag_counts(session, limit))
@@ -1,82 +1,93 @@
 import uuid
 from typing import Any
-from app.modules.models import UserModel
-from app.modules.schemas import UserSchemas
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import select, func
 
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from app.core.config import settings
+from app.dependency import CurrentUser, SessionDep, get_current_active_superuser
+from app.modules.schemas import UserSchemas
 from app.modules.services import UserService
+from app.modules.shared.counting import CountMode
+from app.modules.shared.encoding import item_response, page_response
+from app.modules.shared.etag import (
+    entity_etag,
+    etag_matches,
+    if_match_versions,
+    not_modified,
+    page_etag,
+)
+from app.modules.shared.fields import sparse_fields
 from app.modules.shared.schemas import Message
-from app.dependency import SessionDep, CurrentUser, get_current_active_superuser
-from app.core.security import verify_password, get_password_hash
-from app.modules.shared.utils import generate_new_account_email, send_email
-from app.core.config import settings
+from app.modules.shared.utils import generate_new_account_email
+from app.modules.shared.writes import DuplicateError
 
 router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
 
 
 @router.get("/", response_model=UserSchemas.UsersPublic)
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
-    count = session.exec(
-        select(func.count()).select_from(UserModel.User)).one()
-    users = session.exec(
-        select(UserModel.User).offset(skip).limit(limit)).all()
-    return UserSchemas.UsersPublic(data=users, count=count)
+def read_users(session: SessionDep, skip: int = 0, limit: int = 100, cursor: str | None = None, count_mode: CountMode = "exact", fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    selected = sparse_fields(fields, UserSchemas.UserPublic)
+    page = UserService.get_all_users(session, skip, limit, cursor, count_mode, fields=selected)
+    etag = page_etag(page, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return page_response(UserSchemas.UserPublic, page, selected, {"ETag": etag})
 
 
 @router.post("/", response_model=UserSchemas.UserPublic)
-def create_user(*, session: SessionDep, user_in: UserSchemas.UserCreate) -> Any:
-    existing = UserService.get_user_by_email(
-        session=session, email=user_in.email)
-    if existing:
+def create_user(*, session: SessionDep, response: Response, user_in: UserSchemas.UserCreate) -> Any:
+    welcome = None
+    if settings.emails_enabled:
+        welcome = generate_new_account_email(
+            email_to=user_in.email, username=user_in.email)
+    try:
+        user = UserService.create_user(session=session, user_create=user_in, welcome=welcome)
+    except DuplicateError:
         raise HTTPException(
             status_code=400, detail="User with this email already exists")
-    user = UserService.create_user(session=session, user_create=user_in)
-    if settings.emails_enabled:
-        email_data = generate_new_account_email(
-            email_to=user.email, username=user.email, password=user_in.password)
-        send_email(
-            email_to=user.email,
-            subject=email_data.subject,
-            html_content=email_data.html_content,
-        )
+    response.headers["ETag"] = entity_etag(user)
     return user
 
 
 @router.get("/{user_id}", response_model=UserSchemas.UserPublic)
-def read_user_by_id(user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser) -> Any:
-    user = session.get(UserModel.User, user_id)
+def read_user_by_id(user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser, fields: str | None = None, if_none_match: str | None = Header(None)) -> Any:
+    selected = sparse_fields(fields, UserSchemas.UserPublic)
+    user = UserService.get_user_by_id(session, user_id, fields=selected)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    if user == current_user or current_user.is_superuser:
-        return user
-    raise HTTPException(status_code=403, detail="Not enough privileges")
+    if user.id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough privileges")
+    etag = entity_etag(user, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return item_response(UserSchemas.UserPublic, user, selected, {"ETag": etag})
 
 
 @router.patch("/{user_id}", response_model=UserSchemas.UserPublic)
-def update_user(*, session: SessionDep, user_id: uuid.UUID, user_in: UserSchemas.UserUpdate) -> Any:
-    db_user = session.get(UserModel.User, user_id)
-    if not db_user:
+def update_user(*, session: SessionDep, response: Response, user_id: uuid.UUID, user_in: UserSchemas.UserUpdate, if_match: str | None = Header(None)) -> Any:
+    versions = if_match_versions(if_match, user_id)
+    try:
+        user = UserService.update_user(
+            session=session, user_id=user_id, user_in=user_in, versions=versions)
+    except DuplicateError:
+        raise HTTPException(
+            status_code=409, detail="User with this email already exists")
+    if not user:
+        if versions is not None and UserService.get_user_by_id(session, user_id):
+            raise HTTPException(status_code=412, detail="User has been modified")
         raise HTTPException(status_code=404, detail="User not found")
-    if user_in.email:
-        existing_user = UserService.get_user_by_email(
-            session=session, email=user_in.email)
-        if existing_user and existing_user.id != user_id:
-            raise HTTPException(
-                status_code=409, detail="User with this email already exists")
-    user = UserService.update_user(
-        session=session, db_user=db_user, user_in=user_in)
+    response.headers["ETag"] = entity_etag(user)
     return user
 
 
 @router.delete("/{user_id}", response_model=Message)
-def delete_user(session: SessionDep, current_user: CurrentUser, user_id: uuid.UUID) -> Any:
-    user = session.get(UserModel.User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if user == current_user:
+def delete_user(session: SessionDep, current_user: CurrentUser, user_id: uuid.UUID, if_match: str | None = Header(None)) -> Any:
+    if user_id == current_user.id:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves")
-    session.delete(user)
-    session.commit()
+    versions = if_match_versions(if_match, user_id)
+    if not UserService.delete_user(session=session, user_id=user_id, versions=versions):
+        if versions is not None and UserService.get_user_by_id(session, user_id):
+            raise HTTPException(status_code=412, detail="User has been modified")
+        raise HTTPException(status_code=404, detail="User not found")
     return Message(message="User deleted successfully")
@@ -1,5 +1,6 @@
-from sqlmodel import SQLModel
+import uuid
 
+from sqlmodel import SQLModel
 
 # ------------------------
 # Auth Token Schemas
@@ -12,3 +13,10 @@ class Token(SQLModel):
 
 class TokenPayload(SQLModel):
     sub: str | None = None  # Typically holds the user ID or email
+
+
+class AuthUser(SQLModel):
+    # what authorization needs from the user row; cached per request token
+    id: uuid.UUID
+    is_active: bool
+    is_superuser: bool
@@ -1,14 +1,16 @@
-import uuid
 import datetime
-from typing import Optional, List
+import uuid
+
 from pydantic import BaseModel
 
+from app.modules.shared.schemas import BulkItemError
+
 
 class CategoryBase(BaseModel):
     name: str
     slug: str
-    description: Optional[str] = None
-    image: Optional[str] = None
+    description: str | None = None
+    image: str | None = None
 
 
 class CategoryCreate(CategoryBase):
@@ -16,23 +18,35 @@ class CategoryCreate(CategoryBase):
 
 
 class CategoryUpdate(BaseModel):
-    name: Optional[str] = None
-    slug: Optional[str] = None
-    description: Optional[str] = None
-    image: Optional[str] = None
+    name: str | None = None
+    slug: str | None = None
+    description: str | None = None
+    image: str | None = None
+
+
+class CategoryBulkUpdate(CategoryUpdate):
+    id: uuid.UUID
 
 
 class CategoryRead(CategoryBase):
     id: uuid.UUID
     created_at: datetime.datetime
     updated_at: datetime.datetime
-    created_by: Optional[uuid.UUID] = None
-    updated_by: Optional[uuid.UUID] = None
+    created_by: uuid.UUID | None = None
+    updated_by: uuid.UUID | None = None
 
     class Config:
         from_attributes = True
 
 
 class CategoriesPublic(BaseModel):
-    data: List[CategoryRead]
-    count: int
+    data: list[CategoryRead]
+    # None when the caller asked for count_mode=none
+    count: int | None = None
+    # Opaque keyset cursor for the next page, None on the last page
+    next_cursor: str | None = None
+
+
+class CategoriesBulkResult(BaseModel):
+    data: list[CategoryRead]
+    errors: list[BulkItemError]
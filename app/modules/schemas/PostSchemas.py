@@ -1,22 +1,25 @@
-import uuid
 import datetime
-from typing import Optional, List
+import uuid
+from typing import Literal
+
 from pydantic import BaseModel
 
+from app.modules.shared.schemas import BulkItemError
+
 
 class PostBase(BaseModel):
     title: str
     slug: str
     content: str
-    image: Optional[str] = None
-    thumbnail_url: Optional[str] = None
+    image: str | None = None
+    thumbnail_url: str | None = None
     is_published: bool = False
     is_featured: bool = False
-    category_id: Optional[uuid.UUID] = None
-    created_by: Optional[uuid.UUID] = None
-    updated_by: Optional[uuid.UUID] = None
-    published_at: Optional[datetime.datetime] = None
-    tags: Optional[List[str]] = None
+    category_id: uuid.UUID | None = None
+    created_by: uuid.UUID | None = None
+    updated_by: uuid.UUID | None = None
+    published_at: datetime.datetime | None = None
+    tags: list[str] | None = None
 
 
 class PostCreate(PostBase):
@@ -24,17 +27,21 @@ class PostCreate(PostBase):
 
 
 class PostUpdate(BaseModel):
-    title: Optional[str] = None
-    slug: Optional[str] = None
-    content: Optional[str] = None
-    image: Optional[str] = None
-    thumbnail_url: Optional[str] = None
-    is_published: Optional[bool] = None
-    is_featured: Optional[bool] = None
-    category_id: Optional[uuid.UUID] = None
-    updated_by: Optional[uuid.UUID] = None
-    published_at: Optional[datetime.datetime] = None
-    tags: Optional[List[str]] = None
+    title: str | None = None
+    slug: str | None = None
+    content: str | None = None
+    image: str | None = None
+    thumbnail_url: str | None = None
+    is_published: bool | None = None
+    is_featured: bool | None = None
+    category_id: uuid.UUID | None = None
+    updated_by: uuid.UUID | None = None
+    published_at: datetime.datetime | None = None
+    tags: list[str] | None = None
+
+
+class PostBulkUpdate(PostUpdate):
+    id: uuid.UUID
 
 
 class PostRead(PostBase):
@@ -46,6 +53,60 @@ class PostRead(PostBase):
         from_attributes = True
 
 
+TagMatch = Literal["any", "all"]
+PostSort = Literal["created_at", "published_at", "title"]
+SortOrder = Literal["asc", "desc"]
+
+
+class PostFilters(BaseModel):
+    category_id: uuid.UUID | None = None
+    is_published: bool | None = None
+    is_featured: bool | None = None
+    published_from: datetime.datetime | None = None
+    published_to: datetime.datetime | None = None
+    tag: list[str] | None = None
+    tag_match: TagMatch = "any"
+
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+class PostImportRead(BaseModel):
+    id: uuid.UUID
+    file_format: ExportFormat
+    status: str
+    chunk_size: int
+    chunks_done: int
+    rows_read: int
+    rows_inserted: int
+    rows_skipped: int
+    error: str | None = None
+    created_at: datetime.datetime
+    finished_at: datetime.datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
 class PostsPublic(BaseModel):
-    data: List[PostRead]
-    count: int
+    data: list[PostRead]
+    # None when the caller asked for count_mode=none
+    count: int | None = None
+    # Opaque keyset cursor for the next page, None on the last page
+    next_cursor: str | None = None
+
+
+class PostSearchHit(PostRead):
+    rank: float
+    # ts_headline fragment of the content, only when highlight=true
+    headline: str | None = None
+
+
+class PostSearchResults(BaseModel):
+    data: list[PostSearchHit]
+    next_cursor: str | None = None
+
+
+class PostsBulkResult(BaseModel):
+    data: list[PostRead]
+    errors: list[BulkItemError]
@@ -0,0 +1,11 @@
+
+from pydantic import BaseModel
+
+
+class TagCount(BaseModel):
+    name: str
+    count: int
+
+
+class TagsPublic(BaseModel):
+    data: list[TagCount]
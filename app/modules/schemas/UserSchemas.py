@@ -1,12 +1,12 @@
 import uuid
+
 from pydantic import EmailStr
-from typing import Optional, List
-from sqlmodel import SQLModel, Field
+from sqlmodel import Field, SQLModel
 
 
 class UserBase(SQLModel):
     email: EmailStr
-    full_name: Optional[str] = None
+    full_name: str | None = None
     is_superuser: bool = False
 
 
@@ -15,14 +15,14 @@ class UserCreate(UserBase):
 
 
 class UserUpdate(SQLModel):
-    email: Optional[EmailStr] = None
-    password: Optional[str] = Field(default=None, min_length=8, max_length=40)
-    full_name: Optional[str] = None
+    email: EmailStr | None = None
+    password: str | None = Field(default=None, min_length=8, max_length=40)
+    full_name: str | None = None
 
 
 class UserUpdateMe(SQLModel):
-    email: Optional[EmailStr] = None
-    full_name: Optional[str] = None
+    email: EmailStr | None = None
+    full_name: str | None = None
 
 
 class NewPassword(SQLModel):
@@ -45,5 +45,8 @@ class UserPublic(UserBase):
 
 
 class UsersPublic(SQLModel):
-    data: List[UserPublic]
-    count: int
+    data: list[UserPublic]
+    # None when the caller asked for count_mode=none
+    count: int | None = None
+    # Opaque keyset cursor for the next page, None on the last page
+    next_cursor: str | None = None
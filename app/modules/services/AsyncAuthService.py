@@ -0,0 +1,42 @@
+
+from sqlalchemy import update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.security import verify_password_and_update_async
+from app.modules.models.UserModel import User
+from app.modules.schemas.AuthSchemas import AuthUser
+from app.modules.services.AuthService import auth_user_statement, auth_users
+
+
+async def get_user_by_email(*, session: AsyncSession, email: str) -> User | None:
+    statement = select(User).where(User.email == email)
+    return (await session.exec(statement)).first()
+
+
+async def authenticate(*, session: AsyncSession, email: str, password: str) -> User | None:
+    db_user = await get_user_by_email(session=session, email=email)
+    if not db_user:
+        return None
+    # the connection goes back to the pool for the bcrypt wait
+    session.expunge(db_user)
+    await session.rollback()
+    verified, new_hash = await verify_password_and_update_async(password, db_user.hashed_password)
+    if not verified:
+        return None
+    if new_hash:
+        await session.execute(update(User).where(col(User.id) == db_user.id).values(
+            hashed_password=new_hash).execution_options(synchronize_session=False))
+        await session.commit()
+    return db_user
+
+
+async def get_auth_user(session: AsyncSession, user_id: str) -> AuthUser | None:
+    user = auth_users.get(user_id)
+    if user is None:
+        row = (await session.execute(auth_user_statement(user_id))).first()
+        if row is None:
+            return None
+        user = AuthUser.model_validate(row._mapping)
+        auth_users.set(user_id, user)
+    return user
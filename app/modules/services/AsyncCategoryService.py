@@ -0,0 +1,90 @@
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.modules.models.CategoryModel import Category
+from app.modules.schemas.CategorySchemas import (
+    CategoryBulkUpdate,
+    CategoryCreate,
+    CategoryUpdate,
+)
+from app.modules.services.CategoryService import PAGE_KEYS, category_cache
+from app.modules.shared.bulk import (
+    bulk_delete_async,
+    bulk_insert_async,
+    bulk_update_async,
+)
+from app.modules.shared.counting import CountMode, invalidate_counts
+from app.modules.shared.fields import load_columns
+from app.modules.shared.pagination import Page, fetch_page_async
+from app.modules.shared.schemas import BulkItemError
+from app.modules.shared.writes import (
+    delete_statement,
+    insert_statement,
+    update_statement,
+    write_one_async,
+)
+
+
+async def get_category_by_slug(session: AsyncSession, slug: str) -> Category | None:
+    statement = select(Category).where(Category.slug == slug)
+    return (await session.exec(statement)).first()
+
+
+async def create_category(session: AsyncSession, category_in: CategoryCreate) -> Category:
+    category: Category = await write_one_async(session, insert_statement(Category, category_in.model_dump()))
+    invalidate_counts(Category.__tablename__)
+    return category
+
+
+async def get_category_by_id(session: AsyncSession, category_id: uuid.UUID, fields: Sequence[str] | None = None) -> Category | None:
+    if not category_cache.enabled:
+        return await session.get(Category, category_id, options=load_columns(Category, fields))
+    return await category_cache.get_or_load_async(category_id, lambda: session.get(Category, category_id))
+
+
+async def get_all_categories(session: AsyncSession, skip: int = 0, limit: int = 10, cursor: str | None = None, count_mode: CountMode = "exact", fields: Sequence[str] | None = None) -> Page:
+    statement = select(Category).options(*load_columns(Category, fields, PAGE_KEYS))
+    return await fetch_page_async(session, statement, PAGE_KEYS, skip=skip,
+                                  limit=limit, cursor=cursor, count_mode=count_mode)
+
+
+async def update_category(session: AsyncSession, category_id: uuid.UUID, category_in: CategoryUpdate, versions: Sequence[datetime] | None = None) -> Category | None:
+    category: Category | None = await write_one_async(session, update_statement(
+        Category, category_id, category_in.model_dump(exclude_unset=True), versions))
+    await category_cache.invalidate_async(category_id)
+    invalidate_counts(Category.__tablename__)
+    return category
+
+
+async def delete_category(session: AsyncSession, category_id: uuid.UUID, versions: Sequence[datetime] | None = None) -> bool:
+    deleted = await write_one_async(session, delete_statement(Category, category_id, versions))
+    await category_cache.invalidate_async(category_id)
+    invalidate_counts(Category.__tablename__)
+    return deleted is not None
+
+
+async def bulk_create_categories(session: AsyncSession, categories_in: list[CategoryCreate], chunk_size: int | None = None) -> tuple[list[Category], list[BulkItemError]]:
+    created, errors = await bulk_insert_async(
+        session, Category, [category_in.model_dump() for category_in in categories_in], chunk_size)
+    invalidate_counts(Category.__tablename__)
+    return created, errors
+
+
+async def bulk_update_categories(session: AsyncSession, categories_in: list[CategoryBulkUpdate], chunk_size: int | None = None) -> tuple[list[Category], list[BulkItemError]]:
+    rows = [{**category_in.model_dump(exclude_unset=True), "id": category_in.id}
+            for category_in in categories_in]
+    updated, errors = await bulk_update_async(session, Category, rows, chunk_size)
+    await category_cache.invalidate_async(*[category.id for category in updated])
+    invalidate_counts(Category.__tablename__)
+    return updated, errors
+
+
+async def bulk_delete_categories(session: AsyncSession, category_ids: list[uuid.UUID], chunk_size: int | None = None) -> tuple[list[uuid.UUID], list[BulkItemError]]:
+    deleted, errors = await bulk_delete_async(session, Category, category_ids, chunk_size)
+    await category_cache.invalidate_async(*deleted)
+    invalidate_counts(Category.__tablename__)
+    return deleted, errors
@@ -0,0 +1,11 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.modules.models.EmailOutboxModel import EmailOutbox
+from app.modules.services.EmailService import dispatcher, outbox_statement
+from app.modules.shared.writes import write_one_async
+
+
+async def enqueue_email(session: AsyncSession, *, email_to: str, subject: str, html_content: str) -> EmailOutbox:
+    email: EmailOutbox = await write_one_async(session, outbox_statement(email_to, subject, html_content))
+    dispatcher.notify()
+    return email
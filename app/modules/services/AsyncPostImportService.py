@@ -0,0 +1,28 @@
+import uuid
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.modules.models.PostImportModel import PostImport
+from app.modules.schemas import PostSchemas
+from app.modules.services.PostImportService import claim_statement
+from app.modules.shared.writes import write_one_async
+
+
+async def create_import(session: AsyncSession, source: str, file_format: PostSchemas.ExportFormat, chunk_size: int | None = None, current_user: uuid.UUID | None = None, owns_source: bool = False) -> PostImport:
+    post_import = PostImport(source=source, owns_source=owns_source, file_format=file_format,
+                             chunk_size=chunk_size or settings.IMPORT_CHUNK_SIZE,
+                             created_by=current_user, updated_by=current_user)
+    session.add(post_import)
+    await session.commit()
+    await session.refresh(post_import)
+    return post_import
+
+
+async def get_import(session: AsyncSession, import_id: uuid.UUID) -> PostImport | None:
+    return await session.get(PostImport, import_id)
+
+
+async def claim_import(session: AsyncSession, import_id: uuid.UUID) -> PostImport | None:
+    claimed: PostImport | None = await write_one_async(session, claim_statement(import_id))
+    return claimed
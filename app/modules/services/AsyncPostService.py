@@ -0,0 +1,115 @@
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import get_async_engine
+from app.modules.models.PostModel import Post
+from app.modules.schemas import PostSchemas
+from app.modules.services.PostService import (
+    SORT_KEYS,
+    export_statement,
+    list_statement,
+    post_cache,
+    search_page,
+    search_statement,
+)
+from app.modules.shared.bulk import (
+    bulk_delete_async,
+    bulk_insert_async,
+    bulk_update_async,
+)
+from app.modules.shared.counting import CountMode, invalidate_counts
+from app.modules.shared.export import csv_batch, csv_header, ndjson_batch
+from app.modules.shared.fields import load_columns
+from app.modules.shared.pagination import Page, fetch_page_async
+from app.modules.shared.schemas import BulkItemError
+from app.modules.shared.writes import (
+    delete_statement,
+    insert_statement,
+    update_statement,
+    write_one_async,
+)
+
+
+async def get_post_by_slug(session: AsyncSession, slug: str) -> Post | None:
+    statement = select(Post).where(Post.slug == slug)
+
+    async def load() -> Post | None:
+        return (await session.exec(statement)).first()
+    return await post_cache.get_or_load_by_async("slug", slug, load)
+
+
+async def create_post(session: AsyncSession, post_in: PostSchemas.PostCreate) -> Post:
+    post: Post = await write_one_async(session, insert_statement(Post, post_in.model_dump()))
+    invalidate_counts(Post.__tablename__)
+    return post
+
+
+async def get_post_by_id(session: AsyncSession, post_id: uuid.UUID, fields: Sequence[str] | None = None) -> Post | None:
+    if not post_cache.enabled:
+        return await session.get(Post, post_id, options=load_columns(Post, fields))
+    return await post_cache.get_or_load_async(post_id, lambda: session.get(Post, post_id))
+
+
+async def get_all_posts(session: AsyncSession, skip: int = 0, limit: int = 10, cursor: str | None = None, count_mode: CountMode = "exact", filters: PostSchemas.PostFilters | None = None, sort: PostSchemas.PostSort = "created_at", order: PostSchemas.SortOrder = "desc", fields: Sequence[str] | None = None) -> Page:
+    return await fetch_page_async(session, list_statement(filters, sort, fields), SORT_KEYS[sort], skip=skip,
+                                  limit=limit, cursor=cursor, count_mode=count_mode,
+                                  descending=order == "desc")
+
+
+async def search_posts(session: AsyncSession, q: str, highlight: bool = False, limit: int = 10, cursor: str | None = None, filters: PostSchemas.PostFilters | None = None) -> Page:
+    statement = search_statement(q, highlight, limit, cursor, filters)
+    return search_page((await session.execute(statement)).all(), limit)
+
+
+async def export_posts(filters: PostSchemas.PostFilters | None, fields: list[str], export_format: PostSchemas.ExportFormat) -> AsyncIterator[str]:
+    if export_format == "csv":
+        yield csv_header(fields)
+    async with AsyncSession(get_async_engine()) as session:
+        result = await session.stream(export_statement(filters, fields))
+        async for partition in result.mappings().partitions():
+            if export_format == "csv":
+                yield csv_batch(partition, fields)
+            else:
+                yield ndjson_batch(partition)
+
+
+async def update_post(session: AsyncSession, post_id: uuid.UUID, post_in: PostSchemas.PostUpdate, versions: Sequence[datetime] | None = None) -> Post | None:
+    post: Post | None = await write_one_async(session, update_statement(
+        Post, post_id, post_in.model_dump(exclude_unset=True), versions))
+    await post_cache.invalidate_async(post_id)
+    invalidate_counts(Post.__tablename__)
+    return post
+
+
+async def delete_post(session: AsyncSession, post_id: uuid.UUID, versions: Sequence[datetime] | None = None) -> bool:
+    deleted = await write_one_async(session, delete_statement(Post, post_id, versions))
+    await post_cache.invalidate_async(post_id)
+    invalidate_counts(Post.__tablename__)
+    return deleted is not None
+
+
+async def bulk_create_posts(session: AsyncSession, posts_in: list[PostSchemas.PostCreate], chunk_size: int | None = None) -> tuple[list[Post], list[BulkItemError]]:
+    created, errors = await bulk_insert_async(
+        session, Post, [post_in.model_dump() for post_in in posts_in], chunk_size)
+    invalidate_counts(Post.__tablename__)
+    return created, errors
+
+
+async def bulk_update_posts(session: AsyncSession, posts_in: list[PostSchemas.PostBulkUpdate], chunk_size: int | None = None) -> tuple[list[Post], list[BulkItemError]]:
+    rows = [{**post_in.model_dump(exclude_unset=True), "id": post_in.id}
+            for post_in in posts_in]
+    updated, errors = await bulk_update_async(session, Post, rows, chunk_size)
+    await post_cache.invalidate_async(*[post.id for post in updated])
+    invalidate_counts(Post.__tablename__)
+    return updated, errors
+
+
+async def bulk_delete_posts(session: AsyncSession, post_ids: list[uuid.UUID], chunk_size: int | None = None) -> tuple[list[uuid.UUID], list[BulkItemError]]:
+    deleted, errors = await bulk_delete_async(session, Post, post_ids, chunk_size)
+    await post_cache.invalidate_async(*deleted)
+    invalidate_counts(Post.__tablename__)
+    return deleted, errors
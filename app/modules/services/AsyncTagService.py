@@ -0,0 +1,18 @@
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.modules.models.PostModel import Post
+from app.modules.schemas import TagSchemas
+from app.modules.services.TagService import tag_counts_statement
+from app.modules.shared.counting import count_cache
+
+
+async def get_tag_counts(session: AsyncSession, limit: int = 100) -> list[TagSchemas.TagCount]:
+    cache = count_cache(Post.__tablename__)
+    key = f"tags|{limit}"
+    tags = cache.get(key)
+    if tags is None:
+        rows = await session.execute(tag_counts_statement(limit))
+        tags = [TagSchemas.TagCount(**row._mapping) for row in rows]
+        cache.set(key, tags)
+    return tags
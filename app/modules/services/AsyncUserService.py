@@ -0,0 +1,72 @@
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.security import get_password_hash_async
+from app.modules.models.UserModel import User
+from app.modules.schemas import UserSchemas
+from app.modules.services.AuthService import invalidate_auth_user
+from app.modules.services.EmailService import dispatcher as email_dispatcher
+from app.modules.services.EmailService import outbox_statement
+from app.modules.services.UserService import PAGE_KEYS
+from app.modules.shared.counting import CountMode, invalidate_counts
+from app.modules.shared.fields import load_columns
+from app.modules.shared.pagination import Page, fetch_page_async
+from app.modules.shared.utils import EmailData
+from app.modules.shared.writes import (
+    delete_statement,
+    insert_statement,
+    update_statement,
+    write_one_async,
+)
+
+
+async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
+    statement = select(User).where(User.email == email)
+    return (await session.exec(statement)).first()
+
+
+async def get_user_by_id(session: AsyncSession, user_id: uuid.UUID, fields: Sequence[str] | None = None) -> User | None:
+    return await session.get(User, user_id, options=load_columns(User, fields))
+
+
+async def get_all_users(session: AsyncSession, skip: int = 0, limit: int = 10, cursor: str | None = None, count_mode: CountMode = "exact", fields: Sequence[str] | None = None) -> Page:
+    statement = select(User).options(*load_columns(User, fields, PAGE_KEYS))
+    return await fetch_page_async(session, statement, PAGE_KEYS, skip=skip,
+                                  limit=limit, cursor=cursor, count_mode=count_mode)
+
+
+async def create_user(session: AsyncSession, user_create: UserSchemas.UserCreate, welcome: EmailData | None = None) -> User:
+    hashed_password = await get_password_hash_async(user_create.password)
+    queued = [outbox_statement(user_create.email, welcome.subject, welcome.html_content)] if welcome else []
+    user: User = await write_one_async(session, insert_statement(User, {
+        "email": user_create.email,
+        "hashed_password": hashed_password,
+        "full_name": user_create.full_name,
+        "is_active": True,
+        "is_superuser": user_create.is_superuser or False,
+    }), *queued)
+    invalidate_counts(User.__tablename__)
+    if welcome:
+        email_dispatcher.notify()
+    return user
+
+
+async def update_user(session: AsyncSession, user_id: uuid.UUID, user_in: UserSchemas.UserUpdate, versions: Sequence[datetime] | None = None) -> User | None:
+    user_data = user_in.model_dump(exclude_unset=True)
+    if "password" in user_data:
+        user_data["hashed_password"] = await get_password_hash_async(
+            user_data.pop("password"))
+    user: User | None = await write_one_async(session, update_statement(User, user_id, user_data, versions))
+    invalidate_auth_user(user_id)
+    return user
+
+
+async def delete_user(session: AsyncSession, user_id: uuid.UUID, versions: Sequence[datetime] | None = None) -> bool:
+    deleted = await write_one_async(session, delete_statement(User, user_id, versions))
+    invalidate_counts(User.__tablename__)
+    invalidate_auth_user(user_id)
+    return deleted is not None
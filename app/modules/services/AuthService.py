@@ -1,7 +1,29 @@
-from sqlmodel import Session, select
+import uuid
 
-from app.core.security import verify_password
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
+from sqlalchemy.sql import Executable
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.core.security import (
+    verify_password_and_update,
+    verify_password_and_update_async,
+)
 from app.modules.models.UserModel import User
+from app.modules.schemas.AuthSchemas import AuthUser
+from app.modules.shared.cache import TTLCache, register_cache
+from app.modules.shared.ratelimit import RateLimiter, make_store, register_limiter
+
+# user id (token sub) -> AuthUser, so authenticated requests skip the users lookup
+auth_users: TTLCache[str, AuthUser] = register_cache("auth_users", TTLCache(
+    maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL_SECONDS))
+
+_login_attempts = make_store(settings.RATE_LIMIT_STORE, settings.REDIS_URL)
+login_ip_limiter = register_limiter("login.ip", RateLimiter(
+    _login_attempts, settings.LOGIN_RATE_LIMIT_PER_IP, settings.LOGIN_RATE_WINDOW_SECONDS))
+login_username_limiter = register_limiter("login.username", RateLimiter(
+    _login_attempts, settings.LOGIN_RATE_LIMIT_PER_USERNAME, settings.LOGIN_RATE_WINDOW_SECONDS))
 
 
 def get_user_by_email(*, session: Session, email: str) -> User | None:
@@ -9,10 +31,81 @@ def get_user_by_email(*, session: Session, email: str) -> User | None:
     return session.exec(statement).first()
 
 
-def authenticate(*, session: Session, email: str, password: str) -> User | None:
+def _login_user(session: Session, email: str) -> User | None:
+    # detached and with the transaction ended: the connection goes back to
+    # the pool instead of being held through the bcrypt wait
     db_user = get_user_by_email(session=session, email=email)
+    if db_user:
+        session.expunge(db_user)
+    session.rollback()
+    return db_user
+
+
+def _store_hash(session: Session, user_id: uuid.UUID, new_hash: str) -> None:
+    # stored with an outdated bcrypt cost: upgrade it while we have the password
+    session.execute(update(User).where(col(User.id) == user_id).values(
+        hashed_password=new_hash).execution_options(synchronize_session=False))
+    session.commit()
+
+
+def authenticate(*, session: Session, email: str, password: str) -> User | None:
+    db_user = _login_user(session, email)
+    if not db_user:
+        return None
+    verified, new_hash = verify_password_and_update(password, db_user.hashed_password)
+    if not verified:
+        return None
+    if new_hash:
+        _store_hash(session, db_user.id, new_hash)
+    return db_user
+
+
+async def authenticate_offloaded(*, session: Session, email: str, password: str) -> User | None:
+    """
+    authenticate for an async route on a sync Session: the queries run in the
+    threadpool, and the wait for bcrypt holds no thread of it.
+    """
+    db_user = await run_in_threadpool(_login_user, session, email)
     if not db_user:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    verified, new_hash = await verify_password_and_update_async(password, db_user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        await run_in_threadpool(_store_hash, session, db_user.id, new_hash)
     return db_user
+
+
+def auth_user_statement(user_id: str) -> Executable:
+    return select(User.id, User.is_active, User.is_superuser).where(User.id == user_id)
+
+
+def get_auth_user(session: Session, user_id: str) -> AuthUser | None:
+    user = auth_users.get(user_id)
+    if user is None:
+        row = session.execute(auth_user_statement(user_id)).first()
+        if row is None:
+            return None
+        user = AuthUser.model_validate(row._mapping)
+        auth_users.set(user_id, user)
+    return user
+
+
+def invalidate_auth_user(user_id: uuid.UUID) -> None:
+    """Called by the user services whenever a user row changes or goes away."""
+    auth_users.delete(str(user_id))
+
+
+def count_login_attempt(client_ip: str | None, username: str) -> float:
+    """
+    Record a login attempt against both windows; seconds the client has to
+    wait when either is full, else 0. A rejected IP uses up no username quota.
+    """
+    retry_after = login_ip_limiter.hit(f"login:ip:{client_ip}") if client_ip else 0.0
+    if not retry_after:
+        retry_after = login_username_limiter.hit(f"login:user:{username.lower()}")
+    return retry_after
+
+
+def clear_login_attempts(username: str) -> None:
+    login_username_limiter.reset(f"login:user:{username.lower()}")
@@ -1,45 +1,99 @@
 import uuid
-from typing import List, Optional
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import inspect
 from sqlmodel import Session, select
 
+from app.core.config import settings
 from app.modules.models.CategoryModel import Category
-from app.modules.schemas.CategorySchemas import CategoryCreate, CategoryUpdate
+from app.modules.schemas.CategorySchemas import (
+    CategoryBulkUpdate,
+    CategoryCreate,
+    CategoryRead,
+    CategoryUpdate,
+)
+from app.modules.shared.bulk import bulk_delete, bulk_insert, bulk_update
+from app.modules.shared.cache import register_cache
+from app.modules.shared.counting import CountMode, invalidate_counts
+from app.modules.shared.entity_cache import EntityCache, make_backend
+from app.modules.shared.fields import load_columns
+from app.modules.shared.pagination import Page, fetch_page
+from app.modules.shared.schemas import BulkItemError
+from app.modules.shared.writes import (
+    delete_statement,
+    insert_statement,
+    update_statement,
+    write_one,
+)
+
+# Keyset order for listings, backed by ix_categories_created_at_id
+PAGE_KEYS = (inspect(Category).c.created_at, inspect(Category).c.id)
+
+# categories by id; shared with AsyncCategoryService
+category_cache: EntityCache[Category] = register_cache("categories", EntityCache(
+    "categories", Category, CategoryRead,
+    make_backend(settings.ENTITY_CACHE_BACKEND, settings.REDIS_URL, settings.ENTITY_CACHE_SIZE),
+    settings.CATEGORY_CACHE_TTL_SECONDS))
 
 
-def get_category_by_slug(session: Session, slug: str) -> Optional[Category]:
+def get_category_by_slug(session: Session, slug: str) -> Category | None:
     statement = select(Category).where(Category.slug == slug)
     return session.exec(statement).first()
 
 
 def create_category(session: Session, category_in: CategoryCreate) -> Category:
-    category = Category(**category_in.model_dump())
-    session.add(category)
-    session.commit()
-    session.refresh(category)
+    category: Category = write_one(session, insert_statement(Category, category_in.model_dump()))
+    invalidate_counts(Category.__tablename__)
+    return category
+
+
+def get_category_by_id(session: Session, category_id: uuid.UUID, fields: Sequence[str] | None = None) -> Category | None:
+    if not category_cache.enabled:
+        return session.get(Category, category_id, options=load_columns(Category, fields))
+    # cached rows are whole; ?fields= is applied when the response is built
+    return category_cache.get_or_load(category_id, lambda: session.get(Category, category_id))
+
+
+def get_all_categories(session: Session, skip: int = 0, limit: int = 10, cursor: str | None = None, count_mode: CountMode = "exact", fields: Sequence[str] | None = None) -> Page:
+    statement = select(Category).options(*load_columns(Category, fields, PAGE_KEYS))
+    return fetch_page(session, statement, PAGE_KEYS, skip=skip,
+                      limit=limit, cursor=cursor, count_mode=count_mode)
+
+
+def update_category(session: Session, category_id: uuid.UUID, category_in: CategoryUpdate, versions: Sequence[datetime] | None = None) -> Category | None:
+    category: Category | None = write_one(session, update_statement(
+        Category, category_id, category_in.model_dump(exclude_unset=True), versions))
+    category_cache.invalidate(category_id)
+    invalidate_counts(Category.__tablename__)
     return category
 
 
-def get_category_by_id(session: Session, category_id: uuid.UUID) -> Optional[Category]:
-    return session.get(Category, category_id)
+def delete_category(session: Session, category_id: uuid.UUID, versions: Sequence[datetime] | None = None) -> bool:
+    deleted = write_one(session, delete_statement(Category, category_id, versions))
+    category_cache.invalidate(category_id)
+    invalidate_counts(Category.__tablename__)
+    return deleted is not None
 
 
-def get_all_categories(session: Session, skip: int = 0, limit: int = 10) -> List[Category]:
-    return session.exec(select(Category).offset(skip).limit(limit)).all()
+def bulk_create_categories(session: Session, categories_in: list[CategoryCreate], chunk_size: int | None = None) -> tuple[list[Category], list[BulkItemError]]:
+    created, errors = bulk_insert(
+        session, Category, [category_in.model_dump() for category_in in categories_in], chunk_size)
+    invalidate_counts(Category.__tablename__)
+    return created, errors
 
 
-def update_category(session: Session, db_category: Category, category_in: CategoryUpdate) -> Category:
-    category_data = category_in.model_dump(exclude_unset=True)
-    db_category.sqlmodel_update(category_data)
-    session.add(db_category)
-    session.commit()
-    session.refresh(db_category)
-    return db_category
+def bulk_update_categories(session: Session, categories_in: list[CategoryBulkUpdate], chunk_size: int | None = None) -> tuple[list[Category], list[BulkItemError]]:
+    rows = [{**category_in.model_dump(exclude_unset=True), "id": category_in.id}
+            for category_in in categories_in]
+    updated, errors = bulk_update(session, Category, rows, chunk_size)
+    category_cache.invalidate(*[category.id for category in updated])
+    invalidate_counts(Category.__tablename__)
+    return updated, errors
 
 
-def delete_category(session: Session, category_id: uuid.UUID) -> bool:
-    category = get_category_by_id(session, category_id)
-    if not category:
-        return False
-    session.delete(category)
-    session.commit()
-    return True
+def bulk_delete_categories(session: Session, category_ids: list[uuid.UUID], chunk_size: int | None = None) -> tuple[list[uuid.UUID], list[BulkItemError]]:
+    deleted, errors = bulk_delete(session, Category, category_ids, chunk_size)
+    category_cache.invalidate(*deleted)
+    invalidate_counts(Category.__tablename__)
+    return deleted, errors
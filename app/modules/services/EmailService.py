@@ -0,0 +1,184 @@
+"""
+Outgoing mail through a durable outbox.
+
+enqueue_email only inserts a row, so a request that sends mail waits for one
+INSERT instead of an SMTP conversation. Dispatcher threads claim due rows in
+batches (FOR UPDATE SKIP LOCKED: workers in any number of processes never
+claim the same row), send a batch over one pooled SMTP connection and record
+the outcome in one transaction. Failed messages are retried with exponential
+backoff until EMAIL_MAX_ATTEMPTS. A batch whose worker died comes back when
+its lease runs out, so a message may go out twice but is not lost.
+
+Rows hold no credentials: a reset link is queued with a placeholder and gets
+a fresh token when the message is sent (utils.fill_reset_token).
+"""
+import logging
+import threading
+import uuid
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.sql import Executable
+from sqlmodel import Session, col
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.core.mail import (
+    discard,
+    is_connection_error,
+    is_transient,
+    send_message,
+    smtp_pool,
+)
+from app.modules.models.EmailOutboxModel import EmailOutbox
+from app.modules.shared.base_model import update_defaults
+from app.modules.shared.utils import fill_reset_token
+from app.modules.shared.writes import insert_statement, write_one
+
+logger = logging.getLogger(__name__)
+
+
+def outbox_statement(email_to: str, subject: str, html_content: str) -> Executable:
+    """The outbox INSERT, for writes that queue mail in their own transaction."""
+    return insert_statement(EmailOutbox, {
+        "email_to": email_to, "subject": subject, "html_content": html_content,
+        "status": "pending", "attempts": 0, "next_attempt_at": datetime.now(timezone.utc)})
+
+
+def enqueue_email(session: Session, *, email_to: str, subject: str, html_content: str) -> EmailOutbox:
+    email: EmailOutbox = write_one(session, outbox_statement(email_to, subject, html_content))
+    dispatcher.notify()
+    return email
+
+
+def retry_delay(attempts: int) -> timedelta:
+    seconds = settings.EMAIL_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1)
+    return timedelta(seconds=min(seconds, settings.EMAIL_RETRY_MAX_SECONDS))
+
+
+def claim_batch(session: Session, limit: int) -> list[EmailOutbox]:
+    """Lease up to `limit` due messages to the caller, oldest due first."""
+    now = datetime.now(timezone.utc)
+    due = (select(col(EmailOutbox.id))
+           .where(col(EmailOutbox.status) == "pending", col(EmailOutbox.next_attempt_at) <= now)
+           .order_by(col(EmailOutbox.next_attempt_at))
+           .limit(limit)
+           .with_for_update(skip_locked=True))
+    statement = (update(EmailOutbox)
+                 .where(col(EmailOutbox.id).in_(due.scalar_subquery()))
+                 .values(next_attempt_at=now + timedelta(seconds=settings.EMAIL_LEASE_SECONDS))
+                 .returning(EmailOutbox)
+                 .execution_options(synchronize_session=False))
+    batch = list(session.scalars(statement))
+    for email in batch:
+        session.expunge(email)
+    session.commit()
+    return batch
+
+
+def _send_batch(batch: Sequence[EmailOutbox]) -> tuple[list[uuid.UUID], list[tuple[EmailOutbox, Exception]], list[uuid.UUID]]:
+    # -> (sent ids, failures, ids left untried)
+    sent: list[uuid.UUID] = []
+    failed: list[tuple[EmailOutbox, Exception]] = []
+    with smtp_pool.connection() as smtp:
+        for index, email in enumerate(batch):
+            try:
+                send_message(smtp, email_to=email.email_to, subject=email.subject,
+                             html_content=fill_reset_token(email.email_to, email.html_content))
+            except Exception as exc:
+                failed.append((email, exc))
+                if is_connection_error(exc):
+                    # the server is unreachable even after send_message's own
+                    # retries; the rest of the batch would only fail the same way
+                    discard(smtp)
+                    return sent, failed, [e.id for e in batch[index + 1:]]
+            else:
+                sent.append(email.id)
+    return sent, failed, []
+
+
+def _record(session: Session, sent: list[uuid.UUID], failed: list[tuple[EmailOutbox, Exception]], untried: list[uuid.UUID]) -> None:
+    now = datetime.now(timezone.utc)
+    if sent:
+        session.execute(update(EmailOutbox).where(col(EmailOutbox.id).in_(sent)).values(
+            status="sent", sent_at=now, html_content="", last_error=None,
+            attempts=EmailOutbox.attempts + 1, **update_defaults()))
+    for email, exc in failed:
+        attempts = email.attempts + 1
+        values = {"attempts": attempts, "last_error": f"{type(exc).__name__}: {exc}"[:2000]}
+        if not is_transient(exc) or attempts >= settings.EMAIL_MAX_ATTEMPTS:
+            # the body is not kept once the message will not be sent
+            values.update(status="failed", html_content="")
+            logger.error("Email %s to %s failed for good after %d attempts: %s",
+                         email.id, email.email_to, attempts, exc)
+        else:
+            values["next_attempt_at"] = now + retry_delay(attempts)
+            logger.warning("Email %s to %s failed (attempt %d), retrying: %s",
+                           email.id, email.email_to, attempts, exc)
+        session.execute(update(EmailOutbox).where(col(EmailOutbox.id) == email.id).values(
+            **values, **update_defaults()))
+    if untried:
+        session.execute(update(EmailOutbox).where(col(EmailOutbox.id).in_(untried)).values(
+            next_attempt_at=now + retry_delay(1), **update_defaults()))
+    session.commit()
+
+
+def dispatch_batch(limit: int | None = None) -> int:
+    """Claim, send and record one batch; the number of messages claimed."""
+    with Session(get_engine()) as session:
+        batch = claim_batch(session, limit or settings.EMAIL_BATCH_SIZE)
+        if not batch:
+            return 0
+        sent, failed, untried = _send_batch(batch)
+        _record(session, sent, failed, untried)
+    logger.info("Email batch: %d sent, %d failed, %d postponed", len(sent), len(failed), len(untried))
+    return len(batch)
+
+
+class EmailDispatcher:
+    """
+    Background threads draining the outbox. enqueue_email in this process
+    wakes them at once; mail queued elsewhere is found by polling.
+    """
+
+    def __init__(self) -> None:
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self, workers: int) -> None:
+        if self._threads:
+            return
+        self._stopping.clear()
+        self._threads = [threading.Thread(target=self._run, name=f"email-dispatcher-{n}", daemon=True)
+                         for n in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Let the running batches finish, then close the idle connections."""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        smtp_pool.close()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            # cleared before the claim: a notify during the batch is not lost
+            self._wake.clear()
+            try:
+                full = dispatch_batch() >= settings.EMAIL_BATCH_SIZE
+            except Exception:
+                logger.exception("Email dispatch failed")
+                full = False
+            if not full:
+                self._wake.wait(settings.EMAIL_POLL_SECONDS)
+
+
+dispatcher = EmailDispatcher()
@@ -0,0 +1,247 @@
+"""
+Bulk post import through Postgres COPY.
+
+The file is read in chunks of `chunk_size` rows. Each chunk is COPYed into a
+temporary staging table and merged into `posts` in one transaction, which
+also advances the import's counters, so a crashed or failed run can be
+resumed from the first chunk that did not commit. A run first claims the
+import (claim_import); while its lease lasts no second run can start, and a
+run whose claim was taken over stops before its next chunk commits.
+"""
+import csv
+import json
+import logging
+import os
+import shutil
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, BinaryIO, cast
+
+from sqlalchemy import CursorResult, or_, text, update
+from sqlalchemy.sql import Executable
+from sqlmodel import Session, col
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.modules.models.PostImportModel import PostImport
+from app.modules.models.PostModel import Post
+from app.modules.schemas import PostSchemas
+from app.modules.shared.base_model import insert_defaults, update_defaults
+from app.modules.shared.counting import invalidate_counts
+from app.modules.shared.writes import write_one
+
+logger = logging.getLogger(__name__)
+
+
+class ImportRunningError(Exception):
+    def __init__(self, import_id: uuid.UUID) -> None:
+        super().__init__(f"Import {import_id} is being run by another worker")
+        self.import_id = import_id
+
+IMPORT_COLUMNS = ("title", "slug", "content", "image", "thumbnail_url", "is_published",
+                  "is_featured", "category_id", "published_at", "tags")
+
+_COLUMN_LIST = ", ".join(IMPORT_COLUMNS)
+
+# CREATE TABLE AS keeps the column types of `posts` but none of its NOT NULL
+# constraints, so incomplete rows reach the merge, which skips them.
+_CREATE_STAGING = text(
+    f"CREATE TEMP TABLE post_import_staging ON COMMIT DROP AS "
+    f"SELECT {_COLUMN_LIST} FROM posts WITH NO DATA")
+_NUMBER_STAGING = text(
+    "ALTER TABLE post_import_staging ADD COLUMN line bigint GENERATED ALWAYS AS IDENTITY")
+
+_COPY_STAGING = f"COPY post_import_staging ({_COLUMN_LIST}) FROM STDIN"
+
+# UUIDv7 like base_model.uuid7(): the millisecond clock over the first 48 bits
+# of a random UUID, then the version nibble flipped from 4 to 7.
+_UUID7_SQL = (
+    "encode(set_bit(set_bit(overlay(uuid_send(gen_random_uuid()) placing "
+    "substring(int8send((extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3) "
+    "FROM 1 FOR 6), 52, 1), 53, 1), 'hex')::uuid")
+
+# First row of a slug in the file wins; slugs already in `posts` are skipped.
+_MERGE_STAGING = text(f"""
+    INSERT INTO posts (id, created_at, updated_at, created_by, updated_by, {_COLUMN_LIST})
+    SELECT DISTINCT ON (s.slug)
+        {_UUID7_SQL}, :created_at, :updated_at, :created_by, :updated_by,
+        s.title, s.slug, COALESCE(s.content, ''), s.image, s.thumbnail_url,
+        COALESCE(s.is_published, false), COALESCE(s.is_featured, false),
+        s.category_id, s.published_at, s.tags
+    FROM post_import_staging s
+    WHERE s.title IS NOT NULL AND s.slug IS NOT NULL
+      AND (s.category_id IS NULL
+           OR EXISTS (SELECT 1 FROM categories c WHERE c.id = s.category_id))
+    ORDER BY s.slug, s.line
+    ON CONFLICT (slug) DO NOTHING
+""")
+
+
+def guess_format(filename: str | None) -> PostSchemas.ExportFormat:
+    return "csv" if filename and filename.lower().endswith(".csv") else "ndjson"
+
+
+def _copy_value(column: str, value: Any) -> Any:
+    if value is None or value == "":
+        return None
+    if column == "tags" and not isinstance(value, str):
+        return json.dumps(value)
+    return value
+
+
+def _read_rows(path: str, file_format: str) -> Iterator[tuple[Any, ...]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            records: Iterator[dict[str, Any]] = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for record in records:
+            yield tuple(_copy_value(c, record.get(c)) for c in IMPORT_COLUMNS)
+
+
+def _chunks(rows: Iterator[tuple[Any, ...]], size: int) -> Iterator[list[tuple[Any, ...]]]:
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _load_chunk(session: Session, rows: list[tuple[Any, ...]], defaults: dict[str, Any]) -> int:
+    session.execute(_CREATE_STAGING)
+    session.execute(_NUMBER_STAGING)
+    # COPY needs the raw psycopg connection; it runs in the session's transaction
+    driver_connection = session.connection().connection.driver_connection
+    assert driver_connection is not None
+    with driver_connection.cursor() as cursor:
+        with cursor.copy(_COPY_STAGING) as copy:
+            for row in rows:
+                copy.write_row(row)
+    return cast(CursorResult[Any], session.execute(_MERGE_STAGING, defaults)).rowcount
+
+
+def create_import(session: Session, source: str, file_format: PostSchemas.ExportFormat, chunk_size: int | None = None, current_user: uuid.UUID | None = None, owns_source: bool = False) -> PostImport:
+    post_import = PostImport(source=source, owns_source=owns_source, file_format=file_format,
+                             chunk_size=chunk_size or settings.IMPORT_CHUNK_SIZE,
+                             created_by=current_user, updated_by=current_user)
+    session.add(post_import)
+    session.commit()
+    session.refresh(post_import)
+    return post_import
+
+
+def save_upload(file: BinaryIO, file_format: str) -> str:
+    os.makedirs(settings.IMPORT_DIR, exist_ok=True)
+    path = os.path.join(settings.IMPORT_DIR, f"{uuid.uuid4().hex}.{file_format}")
+    with open(path, "wb") as destination:
+        shutil.copyfileobj(file, destination)
+    return path
+
+
+def get_import(session: Session, import_id: uuid.UUID) -> PostImport | None:
+    return session.get(PostImport, import_id)
+
+
+def _lease_until() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.IMPORT_LEASE_SECONDS)
+
+
+def claim_statement(import_id: uuid.UUID) -> Executable:
+    # one statement: of two concurrent claims only one matches the row
+    return (update(PostImport)
+            .where(col(PostImport.id) == import_id,
+                   col(PostImport.status) != "completed",
+                   or_(col(PostImport.status) != "running",
+                       col(PostImport.lease_until) < datetime.now(timezone.utc)))
+            .values(status="running", error=None, run_id=uuid.uuid4(),
+                    lease_until=_lease_until(), **update_defaults())
+            .returning(PostImport)
+            .execution_options(populate_existing=True))
+
+
+def claim_import(session: Session, import_id: uuid.UUID) -> PostImport | None:
+    """
+    Take the import for a new run, its `run_id` set; None if it does not
+    exist, is completed or is held by a run whose lease has not run out.
+    """
+    claimed: PostImport | None = write_one(session, claim_statement(import_id))
+    return claimed
+
+
+def _update_run(session: Session, import_id: uuid.UUID, run_id: uuid.UUID, values: dict[str, Any]) -> bool:
+    # only while the run still holds the import; False once it was taken over
+    result = cast(CursorResult[Any], session.execute(
+        update(PostImport)
+        .where(col(PostImport.id) == import_id, col(PostImport.run_id) == run_id)
+        .values(**values, **update_defaults())
+        .execution_options(synchronize_session=False)))
+    return bool(result.rowcount)
+
+
+def run_import(import_id: uuid.UUID, run_id: uuid.UUID | None = None) -> PostImport | None:
+    """
+    Run (or resume) an import to completion, skipping the chunks already
+    committed. `run_id` is that of a claim_import the caller made; without
+    it the import is claimed here, ImportRunningError if another run holds it.
+    """
+    with Session(get_engine()) as session:
+        if run_id is None:
+            claimed = claim_import(session, import_id)
+            if claimed is None:
+                existing = session.get(PostImport, import_id)
+                if existing is None or existing.status == "completed":
+                    return existing
+                raise ImportRunningError(import_id)
+            run_id = claimed.run_id
+        post_import = session.get(PostImport, import_id)
+        if post_import is None or post_import.run_id != run_id:
+            logger.warning("Import %s: claim taken over before the run started", import_id)
+            return post_import
+        session.expunge(post_import)
+        assert run_id is not None
+
+        values = insert_defaults(post_import.created_by)
+        defaults = {"created_at": values["created_at"], "updated_at": values["updated_at"],
+                    "created_by": values.get("created_by"), "updated_by": values.get("updated_by")}
+        chunks_done = post_import.chunks_done
+        rows_read, rows_inserted = post_import.rows_read, post_import.rows_inserted
+        try:
+            rows = _read_rows(post_import.source, post_import.file_format)
+            for index, chunk in enumerate(_chunks(rows, post_import.chunk_size)):
+                if index < chunks_done:
+                    continue
+                inserted = _load_chunk(session, chunk, defaults)
+                # the counters commit with the chunk, or neither does
+                if not _update_run(session, import_id, run_id, {
+                        "chunks_done": index + 1,
+                        "rows_read": PostImport.rows_read + len(chunk),
+                        "rows_inserted": PostImport.rows_inserted + inserted,
+                        "rows_skipped": PostImport.rows_skipped + len(chunk) - inserted,
+                        "lease_until": _lease_until()}):
+                    session.rollback()
+                    raise ImportRunningError(import_id)
+                session.commit()
+                chunks_done = index + 1
+                rows_read += len(chunk)
+                rows_inserted += inserted
+                invalidate_counts(Post.__tablename__)
+                logger.info("Import %s: chunk %d done, %d rows read, %d inserted",
+                            import_id, chunks_done, rows_read, rows_inserted)
+        except ImportRunningError:
+            logger.error("Import %s: taken over by another run after chunk %d; stopping",
+                         import_id, chunks_done)
+            raise
+        except Exception as exc:
+            session.rollback()
+            _update_run(session, import_id, run_id, {
+                "status": "failed", "error": str(exc)[:2000], "run_id": None, "lease_until": None})
+            session.commit()
+            logger.error("Import %s failed at chunk %d: %s", import_id, chunks_done + 1, exc)
+            raise
+
+        completed = _update_run(session, import_id, run_id, {
+            "status": "completed", "finished_at": datetime.now(timezone.utc),
+            "run_id": None, "lease_until": None})
+        session.commit()
+        if completed and post_import.owns_source and os.path.exists(post_import.source):
+            os.remove(post_import.source)
+        return session.get(PostImport, import_id)
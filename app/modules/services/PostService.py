@@ -1,44 +1,205 @@
-from typing import List, Optional
+import uuid
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import cast, func, inspect, literal_column, not_
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, TSVECTOR, array
+from sqlalchemy.sql import Select
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.core.database import get_engine
 from app.modules.models.PostModel import Post
-from sqlmodel import Session, select
 from app.modules.schemas import PostSchemas
-import uuid
+from app.modules.shared.bulk import bulk_delete, bulk_insert, bulk_update
+from app.modules.shared.cache import register_cache
+from app.modules.shared.counting import CountMode, invalidate_counts
+from app.modules.shared.entity_cache import EntityCache, make_backend
+from app.modules.shared.export import csv_batch, csv_header, ndjson_batch
+from app.modules.shared.fields import load_columns
+from app.modules.shared.pagination import Page, encode_cursor, fetch_page, paginate
+from app.modules.shared.schemas import BulkItemError
+from app.modules.shared.writes import (
+    delete_statement,
+    insert_statement,
+    update_statement,
+    write_one,
+)
+
+# Keyset order for listings, backed by ix_posts_created_at_id
+PAGE_KEYS = (inspect(Post).c.created_at, inspect(Post).c.id)
+# Keyset per ?sort=; each has a matching (column, id) index, plus partial
+# ones for the is_published / is_featured filters (see PostModel)
+SORT_KEYS = {
+    "created_at": PAGE_KEYS,
+    "published_at": (inspect(Post).c.published_at, inspect(Post).c.id),
+    "title": (inspect(Post).c.title, inspect(Post).c.id),
+}
+
+SEARCH_CONFIG = "english"
+# Generated tsvector over title (A), tags (B) and content (C), GIN indexed;
+# created by migrations (5d7e9f1b3c28) and deliberately not mapped on Post.
+SEARCH_VECTOR = literal_column("posts.search_vector", TSVECTOR)
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=30, MinWords=10"
+
+# posts by id and slug; shared with AsyncPostService
+post_cache: EntityCache[Post] = register_cache("posts", EntityCache(
+    "posts", Post, PostSchemas.PostRead,
+    make_backend(settings.ENTITY_CACHE_BACKEND, settings.REDIS_URL, settings.ENTITY_CACHE_SIZE),
+    settings.POST_CACHE_TTL_SECONDS))
+
+
+def filter_posts(statement: Select[Any], filters: PostSchemas.PostFilters | None) -> Select[Any]:
+    if filters is None:
+        return statement
+    if filters.category_id is not None:
+        statement = statement.where(col(Post.category_id) == filters.category_id)
+    # booleans as bare predicates rather than bound `= $1`, so the planner can
+    # match the partial indexes even with a generic (prepared) plan
+    if filters.is_published is not None:
+        statement = statement.where(
+            col(Post.is_published) if filters.is_published else not_(col(Post.is_published)))
+    if filters.is_featured is not None:
+        statement = statement.where(
+            col(Post.is_featured) if filters.is_featured else not_(col(Post.is_featured)))
+    if filters.published_from is not None:
+        statement = statement.where(col(Post.published_at) >= filters.published_from)
+    if filters.published_to is not None:
+        statement = statement.where(col(Post.published_at) < filters.published_to)
+    if filters.tag:
+        # ?| / ?& on the GIN-indexed jsonb array
+        tags = array(filters.tag)
+        column = inspect(Post).c.tags
+        statement = statement.where(
+            column.has_all(tags) if filters.tag_match == "all" else column.has_any(tags))
+    return statement
+
+
+def export_statement(filters: PostSchemas.PostFilters | None, fields: list[str]) -> Select[Any]:
+    # plain columns rather than entities: no identity map, no content unless asked
+    statement = select(*[getattr(Post, f) for f in fields])
+    return filter_posts(statement, filters).order_by(*PAGE_KEYS).execution_options(
+        yield_per=settings.EXPORT_BATCH_SIZE)
+
+
+def search_statement(q: str, highlight: bool = False, limit: int = 10, cursor: str | None = None, filters: PostSchemas.PostFilters | None = None) -> Select[Any]:
+    """
+    Match `q` (websearch syntax: "quoted phrases", -exclusions, OR) against
+    the search vector, best rank first, paged by keyset on (rank, id).
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    # ts_rank_cd returns real, whose text form is rounded; widened to double
+    # precision the value survives the round trip through the cursor exactly.
+    rank = cast(func.ts_rank_cd(SEARCH_VECTOR, query), DOUBLE_PRECISION).label("rank")
+    columns: list[Any] = [Post, rank]
+    if highlight:
+        # ts_headline is costly; Postgres only evaluates it for the rows that
+        # survive the LIMIT, since it sits in the select list past the sort.
+        columns.append(func.ts_headline(
+            SEARCH_CONFIG, Post.content, query, HEADLINE_OPTIONS).label("headline"))
+    statement = select(*columns).where(SEARCH_VECTOR.op("@@")(query))
+    return paginate(filter_posts(statement, filters), (rank, inspect(Post).c.id), limit=limit, cursor=cursor)
+
 
+def search_page(rows: Sequence[Any], limit: int) -> Page:
+    hits = [PostSchemas.PostSearchHit.model_validate({
+        **row.Post.model_dump(), "rank": row.rank, "headline": getattr(row, "headline", None)})
+        for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit and hits:
+        next_cursor = encode_cursor([hits[-1].rank, hits[-1].id])
+    return Page(hits, None, next_cursor)
 
-def get_post_by_slug(session: Session, slug: str) -> Optional[Post]:
+
+def search_posts(session: Session, q: str, highlight: bool = False, limit: int = 10, cursor: str | None = None, filters: PostSchemas.PostFilters | None = None) -> Page:
+    statement = search_statement(q, highlight, limit, cursor, filters)
+    return search_page(session.execute(statement).all(), limit)
+
+
+def get_post_by_slug(session: Session, slug: str) -> Post | None:
     statement = select(Post).where(Post.slug == slug)
-    return session.exec(statement).first()
+    return post_cache.get_or_load_by("slug", slug, lambda: session.exec(statement).first())
 
 
 def create_post(session: Session, post_in: PostSchemas.PostCreate) -> Post:
-    post = Post(**post_in.model_dump())
-    session.add(post)
-    session.commit()
-    session.refresh(post)
+    post: Post = write_one(session, insert_statement(Post, post_in.model_dump()))
+    invalidate_counts(Post.__tablename__)
+    return post
+
+
+def get_post_by_id(session: Session, post_id: uuid.UUID, fields: Sequence[str] | None = None) -> Post | None:
+    if not post_cache.enabled:
+        return session.get(Post, post_id, options=load_columns(Post, fields))
+    # cached rows are whole; ?fields= is applied when the response is built
+    return post_cache.get_or_load(post_id, lambda: session.get(Post, post_id))
+
+
+def list_statement(filters: PostSchemas.PostFilters | None, sort: PostSchemas.PostSort = "created_at", fields: Sequence[str] | None = None) -> Select[Any]:
+    statement: Select[Any] = select(Post).options(*load_columns(Post, fields, SORT_KEYS[sort]))
+    statement = filter_posts(statement, filters)
+    if sort == "published_at":
+        # unpublished drafts have no published_at and no place in this order
+        statement = statement.where(col(Post.published_at).is_not(None))
+    return statement
+
+
+def get_all_posts(session: Session, skip: int = 0, limit: int = 10, cursor: str | None = None, count_mode: CountMode = "exact", filters: PostSchemas.PostFilters | None = None, sort: PostSchemas.PostSort = "created_at", order: PostSchemas.SortOrder = "desc", fields: Sequence[str] | None = None) -> Page:
+    return fetch_page(session, list_statement(filters, sort, fields), SORT_KEYS[sort], skip=skip,
+                      limit=limit, cursor=cursor, count_mode=count_mode,
+                      descending=order == "desc")
+
+
+def export_posts(filters: PostSchemas.PostFilters | None, fields: list[str], export_format: PostSchemas.ExportFormat) -> Iterator[str]:
+    """
+    Stream posts through a server-side cursor (yield_per), one encoded batch
+    at a time. The generator owns its session because the response body is
+    produced after the request-scoped session is gone.
+    """
+    if export_format == "csv":
+        yield csv_header(fields)
+    with Session(get_engine()) as session:
+        result = session.execute(export_statement(filters, fields))
+        for partition in result.mappings().partitions():
+            if export_format == "csv":
+                yield csv_batch(partition, fields)
+            else:
+                yield ndjson_batch(partition)
+
+
+def update_post(session: Session, post_id: uuid.UUID, post_in: PostSchemas.PostUpdate, versions: Sequence[datetime] | None = None) -> Post | None:
+    post: Post | None = write_one(session, update_statement(
+        Post, post_id, post_in.model_dump(exclude_unset=True), versions))
+    post_cache.invalidate(post_id)
+    invalidate_counts(Post.__tablename__)
     return post
 
 
-def get_post_by_id(session: Session, post_id: uuid.UUID) -> Optional[Post]:
-    return session.get(Post, post_id)
+def delete_post(session: Session, post_id: uuid.UUID, versions: Sequence[datetime] | None = None) -> bool:
+    deleted = write_one(session, delete_statement(Post, post_id, versions))
+    post_cache.invalidate(post_id)
+    invalidate_counts(Post.__tablename__)
+    return deleted is not None
 
 
-def get_all_posts(session: Session, skip: int = 0, limit: int = 10) -> List[Post]:
-    return session.exec(select(Post).offset(skip).limit(limit)).all()
+def bulk_create_posts(session: Session, posts_in: list[PostSchemas.PostCreate], chunk_size: int | None = None) -> tuple[list[Post], list[BulkItemError]]:
+    created, errors = bulk_insert(
+        session, Post, [post_in.model_dump() for post_in in posts_in], chunk_size)
+    invalidate_counts(Post.__tablename__)
+    return created, errors
 
 
-def update_post(session: Session, db_post: Post, post_in: PostSchemas.PostUpdate) -> Post:
-    post_data = post_in.model_dump(exclude_unset=True)
-    db_post.sqlmodel_update(post_data)
-    session.add(db_post)
-    session.commit()
-    session.refresh(db_post)
-    return db_post
+def bulk_update_posts(session: Session, posts_in: list[PostSchemas.PostBulkUpdate], chunk_size: int | None = None) -> tuple[list[Post], list[BulkItemError]]:
+    rows = [{**post_in.model_dump(exclude_unset=True), "id": post_in.id}
+            for post_in in posts_in]
+    updated, errors = bulk_update(session, Post, rows, chunk_size)
+    post_cache.invalidate(*[post.id for post in updated])
+    invalidate_counts(Post.__tablename__)
+    return updated, errors
 
 
-def delete_post(session: Session, post_id: uuid.UUID) -> bool:
-    post = get_post_by_id(session, post_id)
-    if not post:
-        return False
-    session.delete(post)
-    session.commit()
-    return True
+def bulk_delete_posts(session: Session, post_ids: list[uuid.UUID], chunk_size: int | None = None) -> tuple[list[uuid.UUID], list[BulkItemError]]:
+    deleted, errors = bulk_delete(session, Post, post_ids, chunk_size)
+    post_cache.invalidate(*deleted)
+    invalidate_counts(Post.__tablename__)
+    return deleted, errors
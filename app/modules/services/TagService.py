@@ -0,0 +1,34 @@
+from typing import Any
+
+from sqlalchemy import func, select, true
+from sqlalchemy.sql import Select
+from sqlmodel import Session
+
+from app.modules.models.PostModel import Post
+from app.modules.schemas import TagSchemas
+from app.modules.shared.counting import count_cache
+
+
+def tag_counts_statement(limit: int) -> Select[Any]:
+    # posts CROSS JOIN LATERAL jsonb_array_elements_text(posts.tags), spelled
+    # out as a join so SQLAlchemy does not see a cartesian product
+    elements = func.jsonb_array_elements_text(Post.tags).table_valued("tag").render_derived().lateral()
+    tag = elements.c.tag
+    return (select(tag.label("name"), func.count().label("count"))
+            .select_from(Post).join(elements, true())
+            .group_by(tag).order_by(func.count().desc(), tag).limit(limit))
+
+
+def get_tag_counts(session: Session, limit: int = 100) -> list[TagSchemas.TagCount]:
+    """
+    Most used tags first. Counting has to unnest every post's tags, so the
+    result is kept with the posts list totals and dropped on any post write.
+    """
+    cache = count_cache(Post.__tablename__)
+    key = f"tags|{limit}"
+    tags = cache.get(key)
+    if tags is None:
+        rows = session.execute(tag_counts_statement(limit))
+        tags = [TagSchemas.TagCount(**row._mapping) for row in rows]
+        cache.set(key, tags)
+    return tags
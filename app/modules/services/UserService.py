@@ -1,37 +1,74 @@
-from typing import Optional
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import inspect
+from sqlmodel import Session, select
+
+from app.core.security import get_password_hash
 from app.modules.models.UserModel import User
-from sqlmodel import select, Session
 from app.modules.schemas import UserSchemas
-from app.core.security import get_password_hash
+from app.modules.services.AuthService import invalidate_auth_user
+from app.modules.services.EmailService import dispatcher as email_dispatcher
+from app.modules.services.EmailService import outbox_statement
+from app.modules.shared.counting import CountMode, invalidate_counts
+from app.modules.shared.fields import load_columns
+from app.modules.shared.pagination import Page, fetch_page
+from app.modules.shared.utils import EmailData
+from app.modules.shared.writes import (
+    delete_statement,
+    insert_statement,
+    update_statement,
+    write_one,
+)
+
+# Keyset order for listings, backed by ix_users_created_at_id
+PAGE_KEYS = (inspect(User).c.created_at, inspect(User).c.id)
 
 
-def get_user_by_email(session: Session, email: str) -> Optional[User]:
+def get_user_by_email(session: Session, email: str) -> User | None:
     statement = select(User).where(User.email == email)
     return session.exec(statement).first()
 
 
-def create_user(session: Session, user_create: UserSchemas.UserCreate) -> User:
-    db_obj = User(
-        email=user_create.email,
-        hashed_password=get_password_hash(user_create.password),
-        full_name=user_create.full_name,
-        is_active=True,
-        is_superuser=user_create.is_superuser or False
-    )
-    session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
-    return db_obj
+def get_user_by_id(session: Session, user_id: uuid.UUID, fields: Sequence[str] | None = None) -> User | None:
+    return session.get(User, user_id, options=load_columns(User, fields))
+
 
+def get_all_users(session: Session, skip: int = 0, limit: int = 10, cursor: str | None = None, count_mode: CountMode = "exact", fields: Sequence[str] | None = None) -> Page:
+    statement = select(User).options(*load_columns(User, fields, PAGE_KEYS))
+    return fetch_page(session, statement, PAGE_KEYS, skip=skip,
+                      limit=limit, cursor=cursor, count_mode=count_mode)
 
-def update_user(session: Session, db_user: User, user_in: UserSchemas.UserUpdate) -> User:
-    user_data = user_in.dict(exclude_unset=True)
+
+def create_user(session: Session, user_create: UserSchemas.UserCreate, welcome: EmailData | None = None) -> User:
+    """`welcome` is queued for the new user in the same transaction."""
+    queued = [outbox_statement(user_create.email, welcome.subject, welcome.html_content)] if welcome else []
+    user: User = write_one(session, insert_statement(User, {
+        "email": user_create.email,
+        "hashed_password": get_password_hash(user_create.password),
+        "full_name": user_create.full_name,
+        "is_active": True,
+        "is_superuser": user_create.is_superuser or False,
+    }), *queued)
+    invalidate_counts(User.__tablename__)
+    if welcome:
+        email_dispatcher.notify()
+    return user
+
+
+def update_user(session: Session, user_id: uuid.UUID, user_in: UserSchemas.UserUpdate, versions: Sequence[datetime] | None = None) -> User | None:
+    user_data = user_in.model_dump(exclude_unset=True)
     if "password" in user_data:
         user_data["hashed_password"] = get_password_hash(
             user_data.pop("password"))
-    for key, value in user_data.items():
-        setattr(db_user, key, value)
-    session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
-    return db_user
+    user: User | None = write_one(session, update_statement(User, user_id, user_data, versions))
+    invalidate_auth_user(user_id)
+    return user
+
+
+def delete_user(session: Session, user_id: uuid.UUID, versions: Sequence[datetime] | None = None) -> bool:
+    deleted = write_one(session, delete_statement(User, user_id, versions))
+    invalidate_counts(User.__tablename__)
+    invalidate_auth_user(user_id)
+    return deleted is not None
@@ -1,20 +1,39 @@
+import os
+import time
 import uuid
-from typing import Optional
 from datetime import datetime, timezone
-from sqlmodel import SQLModel, Field
+from typing import Any
+
 from sqlalchemy import event
+from sqlmodel import Field, SQLModel
+
+
+def uuid7() -> uuid.UUID:
+    """
+    RFC 9562 version 7 UUID: 48-bit Unix millisecond timestamp, then the
+    sub-millisecond fraction in the 12 rand_a bits (method 3) so ids from one
+    process sort in creation order, then 62 random bits. New keys land at the
+    right edge of the primary key index instead of on a random leaf page.
+    """
+    unix_ms, sub_ms = divmod(time.time_ns(), 1_000_000)
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76                                          # version
+    value |= (sub_ms * 4096 // 1_000_000) << 64                 # rand_a
+    value |= 0b10 << 62                                         # variant
+    value |= int.from_bytes(os.urandom(8), "big") >> 2          # rand_b
+    return uuid.UUID(int=value)
 
 
 class BaseModel(SQLModel):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc))
 
-    created_by: Optional[uuid.UUID] = Field(
+    created_by: uuid.UUID | None = Field(
         default=None, foreign_key="users.id")
-    updated_by: Optional[uuid.UUID] = Field(
+    updated_by: uuid.UUID | None = Field(
         default=None, foreign_key="users.id")
 
     @classmethod
@@ -36,3 +55,21 @@ class BaseModel(SQLModel):
             if hasattr(target, "__current_user__"):
                 target.created_by = target.__current_user__
                 target.updated_by = target.__current_user__
+
+
+# Core/bulk statements bypass the mapper events above; these give them the
+# same audit columns in one go.
+def insert_defaults(current_user: uuid.UUID | None = None) -> dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    values: dict[str, Any] = {"created_at": now, "updated_at": now}
+    if current_user is not None:
+        values["created_by"] = current_user
+        values["updated_by"] = current_user
+    return values
+
+
+def update_defaults(current_user: uuid.UUID | None = None) -> dict[str, Any]:
+    values: dict[str, Any] = {"updated_at": datetime.now(timezone.utc)}
+    if current_user is not None:
+        values["updated_by"] = current_user
+    return values
@@ -0,0 +1,297 @@
+"""
+Chunked multi-row writes for models with a unique `slug` (posts, categories).
+
+Every chunk is one INSERT ... ON CONFLICT DO NOTHING RETURNING, one batched
+UPDATE, or one DELETE ... RETURNING, committed on its own, so a failing chunk
+never rolls back the ones before it. A chunk hitting a constraint error, or
+a value the column rejects (too long, out of range), is bisected until the
+offending rows are isolated. Items that could not be
+written are reported back by their position in the request.
+"""
+import uuid
+from collections.abc import Iterator, Sequence
+from operator import attrgetter
+from typing import Any, TypeVar
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+from sqlmodel import Session, col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.modules.shared.base_model import BaseModel, insert_defaults, update_defaults
+from app.modules.shared.schemas import BulkItemError
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+IndexedRow = tuple[int, dict[str, Any]]
+
+# errors that one row can cause; any other error fails the whole request
+ROW_ERRORS = (IntegrityError, DataError)
+
+# the slug column of a model, or the slug of a row: every model written here
+# has a unique slug, but BaseModel does not declare one
+_slug = attrgetter("slug")
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _chunk_size(chunk_size: int | None) -> int:
+    return max(1, min(chunk_size or settings.BULK_CHUNK_SIZE, settings.BULK_MAX_CHUNK_SIZE))
+
+
+def _row_error_detail(exc: DBAPIError) -> str:
+    diag = getattr(exc.orig, "diag", None)
+    fallback = "Integrity error" if isinstance(exc, IntegrityError) else "Invalid value"
+    return getattr(diag, "message_primary", None) or fallback
+
+
+def _chunk_failed(chunk: Sequence[IndexedRow], exc: DBAPIError) -> list[BulkItemError]:
+    detail = _row_error_detail(exc)
+    return [BulkItemError(index=i, id=row.get("id"), slug=row.get("slug"), detail=detail)
+            for i, row in chunk]
+
+
+def _dedupe(rows: Sequence[IndexedRow], field: str, errors: list[BulkItemError]) -> list[IndexedRow]:
+    # first occurrence wins, later ones are reported
+    seen: set[Any] = set()
+    unique: list[IndexedRow] = []
+    for index, row in rows:
+        value = row.get(field)
+        if value is not None and value in seen:
+            errors.append(BulkItemError(index=index, id=row.get("id"), slug=row.get("slug"),
+                                        detail=f"Duplicate {field} in request"))
+            continue
+        if value is not None:
+            seen.add(value)
+        unique.append((index, row))
+    return unique
+
+
+def _insert_statement(model: type[M]) -> Any:
+    return insert(model).on_conflict_do_nothing(index_elements=["slug"]).returning(model)
+
+
+def _insert_conflicts(model: type[M], chunk: Sequence[IndexedRow], created: Sequence[M]) -> list[BulkItemError]:
+    inserted = {_slug(obj) for obj in created}
+    return [BulkItemError(index=i, slug=row["slug"], detail=f"{model.__name__} slug already exists")
+            for i, row in chunk if row["slug"] not in inserted]
+
+
+def _plan_update(
+    model: type[M],
+    chunk: Sequence[IndexedRow],
+    existing: set[uuid.UUID],
+    taken: dict[str, uuid.UUID],
+) -> tuple[list[IndexedRow], list[BulkItemError]]:
+    ok: list[IndexedRow] = []
+    errors: list[BulkItemError] = []
+    for index, row in chunk:
+        slug = row.get("slug")
+        if row["id"] not in existing:
+            errors.append(BulkItemError(index=index, id=row["id"],
+                          slug=slug, detail=f"{model.__name__} not found"))
+        elif slug is not None and taken.get(slug, row["id"]) != row["id"]:
+            errors.append(BulkItemError(index=index, id=row["id"],
+                          slug=slug, detail=f"{model.__name__} slug already exists"))
+        else:
+            ok.append((index, row))
+    return ok, errors
+
+
+def _insert_chunk(session: Session, model: type[M], chunk: Sequence[IndexedRow], created: list[M], errors: list[BulkItemError]) -> None:
+    try:
+        objs = session.scalars(
+            _insert_statement(model),
+            [{**row, **insert_defaults()} for _, row in chunk],
+        ).all()
+        # detach first so the commit does not expire what we return
+        session.expunge_all()
+        session.commit()
+    except ROW_ERRORS as e:
+        session.rollback()
+        if len(chunk) == 1:
+            errors.extend(_chunk_failed(chunk, e))
+            return
+        # bisect to isolate the offending rows instead of failing the chunk
+        middle = len(chunk) // 2
+        _insert_chunk(session, model, chunk[:middle], created, errors)
+        _insert_chunk(session, model, chunk[middle:], created, errors)
+        return
+    errors.extend(_insert_conflicts(model, chunk, objs))
+    created.extend(objs)
+
+
+def _update_chunk(session: Session, model: type[M], chunk: Sequence[IndexedRow], updated: list[M], errors: list[BulkItemError]) -> None:
+    try:
+        # bulk UPDATE by primary key: one executemany per set of columns
+        session.execute(update(model), [{**row, **update_defaults()} for _, row in chunk])
+        objs = session.scalars(select(model).where(
+            col(model.id).in_([row["id"] for _, row in chunk]))).all()
+        session.expunge_all()
+        session.commit()
+    except ROW_ERRORS as e:
+        session.rollback()
+        if len(chunk) == 1:
+            errors.extend(_chunk_failed(chunk, e))
+            return
+        middle = len(chunk) // 2
+        _update_chunk(session, model, chunk[:middle], updated, errors)
+        _update_chunk(session, model, chunk[middle:], updated, errors)
+        return
+    updated.extend(objs)
+
+
+def _delete_chunk(session: Session, model: type[M], chunk: Sequence[IndexedRow], deleted: list[uuid.UUID], errors: list[BulkItemError]) -> None:
+    statement = delete(model).where(col(model.id).in_([row["id"] for _, row in chunk])).returning(
+        col(model.id)).execution_options(synchronize_session=False)
+    try:
+        gone = set(session.scalars(statement).all())
+        session.commit()
+    except ROW_ERRORS as e:
+        session.rollback()
+        if len(chunk) == 1:
+            errors.extend(_chunk_failed(chunk, e))
+            return
+        middle = len(chunk) // 2
+        _delete_chunk(session, model, chunk[:middle], deleted, errors)
+        _delete_chunk(session, model, chunk[middle:], deleted, errors)
+        return
+    deleted.extend(row["id"] for _, row in chunk if row["id"] in gone)
+    errors.extend(BulkItemError(index=i, id=row["id"], detail=f"{model.__name__} not found")
+                  for i, row in chunk if row["id"] not in gone)
+
+
+def bulk_insert(session: Session, model: type[M], rows: Sequence[dict[str, Any]], chunk_size: int | None = None) -> tuple[list[M], list[BulkItemError]]:
+    created: list[M] = []
+    errors: list[BulkItemError] = []
+    for chunk in chunked(_dedupe(list(enumerate(rows)), "slug", errors), _chunk_size(chunk_size)):
+        _insert_chunk(session, model, chunk, created, errors)
+    return created, sorted(errors, key=lambda e: e.index)
+
+
+def bulk_update(session: Session, model: type[M], rows: Sequence[dict[str, Any]], chunk_size: int | None = None) -> tuple[list[M], list[BulkItemError]]:
+    updated: list[M] = []
+    errors: list[BulkItemError] = []
+    indexed = _dedupe(_dedupe(list(enumerate(rows)), "id", errors), "slug", errors)
+    for chunk in chunked(indexed, _chunk_size(chunk_size)):
+        ids = [row["id"] for _, row in chunk]
+        slugs = [row["slug"] for _, row in chunk if row.get("slug") is not None]
+        existing = set(session.scalars(
+            select(col(model.id)).where(col(model.id).in_(ids))).all())
+        taken: dict[str, uuid.UUID] = dict(session.execute(
+            select(_slug(model), col(model.id)).where(_slug(model).in_(slugs))).tuples().all()) if slugs else {}
+        ok, chunk_errors = _plan_update(model, chunk, existing, taken)
+        errors.extend(chunk_errors)
+        if ok:
+            _update_chunk(session, model, ok, updated, errors)
+    return updated, sorted(errors, key=lambda e: e.index)
+
+
+def bulk_delete(session: Session, model: type[M], ids: Sequence[uuid.UUID], chunk_size: int | None = None) -> tuple[list[uuid.UUID], list[BulkItemError]]:
+    deleted: list[uuid.UUID] = []
+    errors: list[BulkItemError] = []
+    indexed = _dedupe([(i, {"id": id_}) for i, id_ in enumerate(ids)], "id", errors)
+    for chunk in chunked(indexed, _chunk_size(chunk_size)):
+        _delete_chunk(session, model, chunk, deleted, errors)
+    return deleted, sorted(errors, key=lambda e: e.index)
+
+
+async def _insert_chunk_async(session: AsyncSession, model: type[M], chunk: Sequence[IndexedRow], created: list[M], errors: list[BulkItemError]) -> None:
+    try:
+        objs = (await session.scalars(
+            _insert_statement(model),
+            [{**row, **insert_defaults()} for _, row in chunk],
+        )).all()
+        session.expunge_all()
+        await session.commit()
+    except ROW_ERRORS as e:
+        await session.rollback()
+        if len(chunk) == 1:
+            errors.extend(_chunk_failed(chunk, e))
+            return
+        middle = len(chunk) // 2
+        await _insert_chunk_async(session, model, chunk[:middle], created, errors)
+        await _insert_chunk_async(session, model, chunk[middle:], created, errors)
+        return
+    errors.extend(_insert_conflicts(model, chunk, objs))
+    created.extend(objs)
+
+
+async def _update_chunk_async(session: AsyncSession, model: type[M], chunk: Sequence[IndexedRow], updated: list[M], errors: list[BulkItemError]) -> None:
+    try:
+        await session.execute(update(model), [{**row, **update_defaults()} for _, row in chunk])
+        objs = (await session.scalars(select(model).where(
+            col(model.id).in_([row["id"] for _, row in chunk])))).all()
+        session.expunge_all()
+        await session.commit()
+    except ROW_ERRORS as e:
+        await session.rollback()
+        if len(chunk) == 1:
+            errors.extend(_chunk_failed(chunk, e))
+            return
+        middle = len(chunk) // 2
+        await _update_chunk_async(session, model, chunk[:middle], updated, errors)
+        await _update_chunk_async(session, model, chunk[middle:], updated, errors)
+        return
+    updated.extend(objs)
+
+
+async def _delete_chunk_async(session: AsyncSession, model: type[M], chunk: Sequence[IndexedRow], deleted: list[uuid.UUID], errors: list[BulkItemError]) -> None:
+    statement = delete(model).where(col(model.id).in_([row["id"] for _, row in chunk])).returning(
+        col(model.id)).execution_options(synchronize_session=False)
+    try:
+        gone = set((await session.scalars(statement)).all())
+        await session.commit()
+    except ROW_ERRORS as e:
+        await session.rollback()
+        if len(chunk) == 1:
+            errors.extend(_chunk_failed(chunk, e))
+            return
+        middle = len(chunk) // 2
+        await _delete_chunk_async(session, model, chunk[:middle], deleted, errors)
+        await _delete_chunk_async(session, model, chunk[middle:], deleted, errors)
+        return
+    deleted.extend(row["id"] for _, row in chunk if row["id"] in gone)
+    errors.extend(BulkItemError(index=i, id=row["id"], detail=f"{model.__name__} not found")
+                  for i, row in chunk if row["id"] not in gone)
+
+
+async def bulk_insert_async(session: AsyncSession, model: type[M], rows: Sequence[dict[str, Any]], chunk_size: int | None = None) -> tuple[list[M], list[BulkItemError]]:
+    created: list[M] = []
+    errors: list[BulkItemError] = []
+    for chunk in chunked(_dedupe(list(enumerate(rows)), "slug", errors), _chunk_size(chunk_size)):
+        await _insert_chunk_async(session, model, chunk, created, errors)
+    return created, sorted(errors, key=lambda e: e.index)
+
+
+async def bulk_update_async(session: AsyncSession, model: type[M], rows: Sequence[dict[str, Any]], chunk_size: int | None = None) -> tuple[list[M], list[BulkItemError]]:
+    updated: list[M] = []
+    errors: list[BulkItemError] = []
+    indexed = _dedupe(_dedupe(list(enumerate(rows)), "id", errors), "slug", errors)
+    for chunk in chunked(indexed, _chunk_size(chunk_size)):
+        ids = [row["id"] for _, row in chunk]
+        slugs = [row["slug"] for _, row in chunk if row.get("slug") is not None]
+        existing = set((await session.scalars(
+            select(col(model.id)).where(col(model.id).in_(ids)))).all())
+        taken: dict[str, uuid.UUID] = dict((await session.execute(
+            select(_slug(model), col(model.id)).where(_slug(model).in_(slugs)))).tuples().all()) if slugs else {}
+        ok, chunk_errors = _plan_update(model, chunk, existing, taken)
+        errors.extend(chunk_errors)
+        if ok:
+            await _update_chunk_async(session, model, ok, updated, errors)
+    return updated, sorted(errors, key=lambda e: e.index)
+
+
+async def bulk_delete_async(session: AsyncSession, model: type[M], ids: Sequence[uuid.UUID], chunk_size: int | None = None) -> tuple[list[uuid.UUID], list[BulkItemError]]:
+    deleted: list[uuid.UUID] = []
+    errors: list[BulkItemError] = []
+    indexed = _dedupe([(i, {"id": id_}) for i, id_ in enumerate(ids)], "id", errors)
+    for chunk in chunked(indexed, _chunk_size(chunk_size)):
+        await _delete_chunk_async(session, model, chunk, deleted, errors)
+    return deleted, sorted(errors, key=lambda e: e.index)
@@ -0,0 +1,115 @@
+from typing import Any, Literal, cast
+
+from sqlalchemy import TableClause, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import ColumnElement, Select, func
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.modules.shared.cache import TTLCache, register_cache
+
+# exact:     COUNT(*) of the filtered rows, sent in the same query as the page
+# estimated: planner estimate (pg_class.reltuples, or EXPLAIN when filtered)
+# cached:    exact count memoized per filter set until TTL or the next write
+# none:      no count at all
+CountMode = Literal["exact", "estimated", "cached", "none"]
+
+# per table; besides list totals it holds other derived counts (e.g. tag counts)
+_count_caches: dict[str, TTLCache[str, Any]] = {}
+
+_RELTUPLES = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)")
+
+
+def _table_name(base: Select[Any]) -> str:
+    return cast(TableClause, base.get_final_froms()[0]).name
+
+
+def count_cache(table: str) -> TTLCache[str, Any]:
+    cache = _count_caches.get(table)
+    if cache is None:
+        cache = _count_caches.setdefault(
+            table, TTLCache(maxsize=256, ttl=settings.COUNT_CACHE_TTL_SECONDS))
+        register_cache(f"counts.{table}", cache)
+    return cache
+
+
+def invalidate_counts(table: str) -> None:
+    """Drop every cached count of `table`; called by the services on writes."""
+    cache = _count_caches.get(table)
+    if cache is not None:
+        cache.clear()
+
+
+def count_statement(base: Select[Any]) -> Select[Any]:
+    return base.with_only_columns(
+        func.count(), maintain_column_froms=True).order_by(None)
+
+
+def count_column(base: Select[Any]) -> ColumnElement[int]:
+    # An uncorrelated scalar subquery runs once (as an InitPlan), so the total
+    # rides along with the page rows without a second round trip.
+    return count_statement(base).scalar_subquery().label("total_count")
+
+
+def _compiled(conn: Connection, base: Select[Any]) -> tuple[str, dict[str, Any]]:
+    compiled = base.order_by(None).compile(
+        dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    return str(compiled), compiled.params
+
+
+def _cache_key(conn: Connection, base: Select[Any]) -> str:
+    sql, params = _compiled(conn, base)
+    return f"{sql}|{sorted(params.items())!r}"
+
+
+def _estimate(conn: Connection, base: Select[Any]) -> int | None:
+    if base.whereclause is None:
+        estimate = conn.execute(
+            _RELTUPLES, {"table": _table_name(base)}).scalar()
+        # -1 means the table has never been vacuumed/analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+    sql, params = _compiled(conn, base)
+    plan: Any = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", params).scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(session: Session, base: Select[Any], count_mode: CountMode) -> int | None:
+    if count_mode == "none":
+        return None
+    conn = session.connection()
+    if count_mode == "estimated":
+        estimate = _estimate(conn, base)
+        if estimate is not None:
+            return estimate
+    elif count_mode == "cached":
+        cache = count_cache(_table_name(base))
+        key = _cache_key(conn, base)
+        count: int | None = cache.get(key)
+        if count is None:
+            count = session.execute(count_statement(base)).scalar_one()
+            cache.set(key, count)
+        return count
+    total: int = session.execute(count_statement(base)).scalar_one()
+    return total
+
+
+async def count_rows_async(session: AsyncSession, base: Select[Any], count_mode: CountMode) -> int | None:
+    if count_mode == "none":
+        return None
+    conn = await session.connection()
+    if count_mode == "estimated":
+        estimate = await conn.run_sync(_estimate, base)
+        if estimate is not None:
+            return estimate
+    elif count_mode == "cached":
+        cache = count_cache(_table_name(base))
+        key = await conn.run_sync(_cache_key, base)
+        count: int | None = cache.get(key)
+        if count is None:
+            count = (await session.execute(count_statement(base))).scalar_one()
+            cache.set(key, count)
+        return count
+    total: int = (await session.execute(count_statement(base))).scalar_one()
+    return total
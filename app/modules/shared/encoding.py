@@ -0,0 +1,68 @@
+"""
+Fast JSON for read endpoints.
+
+Returning ORM rows under a `response_model` makes FastAPI validate every
+row into the schema, dump it to a dict and only then encode it. Rows from
+our own tables are already the right types, so the hot GET routes instead
+copy the schema's fields off each row with a precompiled getter and hand
+the dicts straight to orjson (which encodes UUIDs and datetimes natively),
+returning a ready Response. The route's response_model still documents it.
+"""
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.modules.shared.pagination import Page
+
+# "Z" for UTC, like pydantic's own JSON
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse encoded by orjson; FastAPI's own one is deprecated."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+@lru_cache(maxsize=256)
+def row_encoder(schema: type[BaseModel], fields: tuple[str, ...] | None = None) -> Callable[[Any], dict[str, Any]]:
+    """
+    Row -> dict of `fields` (default: all of `schema`, in schema order). Only
+    for schemas that serialize fields as they are: no aliases, computed
+    fields or custom serializers, which this path would skip.
+    """
+    decorators = schema.__pydantic_decorators__
+    if decorators.field_serializers or decorators.model_serializers or schema.model_computed_fields:
+        raise TypeError(f"{schema.__name__} has custom serialization")
+    if any(f.serialization_alias or f.alias for f in schema.model_fields.values()):
+        raise TypeError(f"{schema.__name__} has aliased fields")
+    names = fields or tuple(schema.model_fields)
+    if len(names) == 1:
+        name = names[0]
+        return lambda row: {name: getattr(row, name)}
+    values = attrgetter(*names)
+    return lambda row: dict(zip(names, values(row), strict=True))
+
+
+def _response(content: Any, headers: Mapping[str, str] | None) -> Response:
+    return Response(content=orjson.dumps(content, option=ORJSON_OPTIONS),
+                    media_type="application/json", headers=headers)
+
+
+def item_response(schema: type[BaseModel], item: Any, fields: tuple[str, ...] | None = None, headers: Mapping[str, str] | None = None) -> Response:
+    """`item` as `schema`, trimmed to `fields` (?fields=) if given."""
+    return _response(row_encoder(schema, fields)(item), headers)
+
+
+def page_response(schema: type[BaseModel], page: Page, fields: tuple[str, ...] | None = None, headers: Mapping[str, str] | None = None) -> Response:
+    """A Page in the `{data, count, next_cursor}` envelope of the *Public schemas."""
+    encode = row_encoder(schema, fields)
+    return _response({"data": [encode(item) for item in page.items],
+                      "count": page.count, "next_cursor": page.next_cursor}, headers)
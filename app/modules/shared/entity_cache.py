@@ -0,0 +1,343 @@
+"""
+Read-through cache for single entities looked up by id (or by a unique
+field such as slug).
+
+Entries hold the row as JSON, validated back through the entity's read
+schema on every hit, so each request gets its own detached instance. Writes
+replace the entry with a short-lived tombstone after their commit, and loads
+only fill an empty entry, so a load that read the row before the write
+cannot put the old row back. (One that outlasts the tombstone still can,
+until the TTL.) Backends: an in-process LRU (per worker;
+other workers see a write only when their entry expires) or Redis (optional
+`redis` package), shared by all workers, whose errors count as misses.
+Concurrent misses for one entry are coalesced into a single load.
+"""
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from functools import cache
+from typing import (
+    Any,
+    Generic,
+    Protocol,
+    TypeVar,
+)
+
+import pydantic
+from pydantic import ValidationError
+
+from app.modules.shared.base_model import BaseModel
+from app.modules.shared.cache import TTLCache
+from app.modules.shared.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+# what an invalidated entry holds, and for how long at most
+TOMBSTONE = b"-"
+TOMBSTONE_SECONDS = 10.0
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> bytes | None:
+        ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    def add(self, key: str, value: bytes, ttl: float) -> None:
+        """Set `key` only if it holds nothing."""
+        ...
+
+    def bury(self, ttl: float, *keys: str) -> None:
+        """Replace the entries with tombstones for `ttl` seconds."""
+        ...
+
+    async def get_async(self, key: str) -> bytes | None:
+        ...
+
+    async def set_async(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    async def add_async(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    async def bury_async(self, ttl: float, *keys: str) -> None:
+        ...
+
+    def stats(self) -> dict[str, Any]:
+        ...
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int) -> None:
+        self._data: TTLCache[str, bytes] = TTLCache(maxsize=maxsize)
+
+    def get(self, key: str) -> bytes | None:
+        return self._data.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._data.set(key, value, ttl)
+
+    def add(self, key: str, value: bytes, ttl: float) -> None:
+        self._data.add(key, value, ttl)
+
+    def bury(self, ttl: float, *keys: str) -> None:
+        for key in keys:
+            self._data.set(key, TOMBSTONE, ttl)
+
+    # nothing to wait for in process
+    async def get_async(self, key: str) -> bytes | None:
+        return self.get(key)
+
+    async def set_async(self, key: str, value: bytes, ttl: float) -> None:
+        self.set(key, value, ttl)
+
+    async def add_async(self, key: str, value: bytes, ttl: float) -> None:
+        self.add(key, value, ttl)
+
+    async def bury_async(self, ttl: float, *keys: str) -> None:
+        self.bury(ttl, *keys)
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self._data), "maxsize": self._data.maxsize}
+
+
+class RedisBackend:
+    """
+    Any client speaking the redis-py API works, e.g. fakeredis' FakeRedis /
+    FakeAsyncRedis in tests. The async client is only needed by async routes.
+    """
+
+    def __init__(self, client: Any, async_client: Any = None, prefix: str = "cache:") -> None:
+        import redis
+        self.prefix = prefix
+        self._client = client
+        self._async_client = async_client
+        self._errors = (redis.RedisError,)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError as exc:
+            raise RuntimeError(
+                "The redis entity cache needs the `redis` package "
+                "(pip install 'sample-project[redis]')") from exc
+        return cls(redis.Redis.from_url(url), redis.asyncio.Redis.from_url(url))
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            value: bytes | None = self._client.get(self.prefix + key)
+            return value
+        except self._errors:
+            logger.warning("entity cache get failed", exc_info=True)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            self._client.set(self.prefix + key, value, px=int(ttl * 1000))
+        except self._errors:
+            logger.warning("entity cache set failed", exc_info=True)
+
+    def add(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            self._client.set(self.prefix + key, value, px=int(ttl * 1000), nx=True)
+        except self._errors:
+            logger.warning("entity cache set failed", exc_info=True)
+
+    def bury(self, ttl: float, *keys: str) -> None:
+        try:
+            with self._client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(self.prefix + key, TOMBSTONE, px=int(ttl * 1000))
+                pipe.execute()
+        except self._errors:
+            # the entry stays until its TTL runs out
+            logger.error("entity cache invalidation failed", exc_info=True)
+
+    async def get_async(self, key: str) -> bytes | None:
+        try:
+            value: bytes | None = await self._async_client.get(self.prefix + key)
+            return value
+        except self._errors:
+            logger.warning("entity cache get failed", exc_info=True)
+            return None
+
+    async def set_async(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self._async_client.set(self.prefix + key, value, px=int(ttl * 1000))
+        except self._errors:
+            logger.warning("entity cache set failed", exc_info=True)
+
+    async def add_async(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self._async_client.set(self.prefix + key, value, px=int(ttl * 1000), nx=True)
+        except self._errors:
+            logger.warning("entity cache set failed", exc_info=True)
+
+    async def bury_async(self, ttl: float, *keys: str) -> None:
+        try:
+            async with self._async_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(self.prefix + key, TOMBSTONE, px=int(ttl * 1000))
+                await pipe.execute()
+        except self._errors:
+            logger.error("entity cache invalidation failed", exc_info=True)
+
+    def stats(self) -> dict[str, Any]:
+        # shared and bounded by Redis' own maxmemory policy
+        return {"size": None, "maxsize": None}
+
+
+@cache
+def _redis_backend(url: str) -> RedisBackend:
+    # one connection pool per URL, shared by all entity caches
+    return RedisBackend.from_url(url)
+
+
+def make_backend(kind: str, redis_url: str | None = None, maxsize: int = 10000) -> CacheBackend:
+    if kind == "redis":
+        if not redis_url:
+            raise ValueError("REDIS_URL is required for the redis entity cache")
+        return _redis_backend(redis_url)
+    return MemoryBackend(maxsize)
+
+
+class EntityCache(Generic[M]):
+    """
+    `model` rows cached under `namespace`, decoded through `schema` (a
+    non-table model with the same fields, since table models skip
+    validation). A `ttl` of 0 turns the cache off.
+    """
+
+    def __init__(self, namespace: str, model: type[M], schema: type[pydantic.BaseModel], backend: CacheBackend, ttl: float) -> None:
+        self.namespace = namespace
+        self.model = model
+        self.schema = schema
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.flights = SingleFlight()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _key(self, id_: uuid.UUID) -> str:
+        return f"{self.namespace}:{id_.hex}"
+
+    def _alias(self, field: str, value: Any) -> str:
+        return f"{self.namespace}:{field}:{value}"
+
+    def _decode(self, raw: bytes | None) -> M | None:
+        if raw is None or raw == TOMBSTONE:
+            return None
+        try:
+            return self.model(**self.schema.model_validate_json(raw).model_dump())
+        except ValidationError:
+            # written by an older version of the model
+            return None
+
+    def _count(self, obj: M | None) -> M | None:
+        if obj is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return obj
+
+    def _store(self, obj: M | None, alias: str | None) -> bytes | None:
+        if obj is None:
+            return None
+        raw = obj.model_dump_json().encode()
+        # not over a tombstone: the row may predate the write that left it
+        self.backend.add(self._key(obj.id), raw, self.ttl)
+        if alias is not None:
+            self.backend.set(alias, obj.id.hex.encode(), self.ttl)
+        return raw
+
+    async def _store_async(self, obj: M | None, alias: str | None) -> bytes | None:
+        if obj is None:
+            return None
+        raw = obj.model_dump_json().encode()
+        await self.backend.add_async(self._key(obj.id), raw, self.ttl)
+        if alias is not None:
+            await self.backend.set_async(alias, obj.id.hex.encode(), self.ttl)
+        return raw
+
+    def _resolve(self, raw_id: bytes | None) -> str | None:
+        # the id entry an alias entry points at
+        return self._key(uuid.UUID(raw_id.decode())) if raw_id is not None else None
+
+    def _current(self, obj: M | None, field: str, value: Any) -> M | None:
+        # an alias left stale by a change of `field` leads to an entity
+        # that no longer has the value
+        return obj if obj is not None and getattr(obj, field) == value else None
+
+    def get_or_load(self, id_: uuid.UUID, load: Callable[[], M | None]) -> M | None:
+        if not self.enabled:
+            return load()
+        key = self._key(id_)
+        obj = self._count(self._decode(self.backend.get(key)))
+        if obj is None:
+            # concurrent misses share one load; each caller decodes its own copy
+            obj = self._decode(self.flights.do(key, lambda: self._store(load(), None)))
+        return obj
+
+    def get_or_load_by(self, field: str, value: Any, load: Callable[[], M | None]) -> M | None:
+        """
+        Look up by a unique `field`: the alias entry holds the id, the entity
+        comes from the id entry.
+        """
+        if not self.enabled:
+            return load()
+        alias = self._alias(field, value)
+        key = self._resolve(self.backend.get(alias))
+        obj = self._current(self._decode(self.backend.get(key)) if key else None, field, value)
+        if self._count(obj) is None:
+            obj = self._decode(self.flights.do(alias, lambda: self._store(load(), alias)))
+        return obj
+
+    def invalidate(self, *ids: uuid.UUID) -> None:
+        if self.enabled and ids:
+            self.backend.bury(min(TOMBSTONE_SECONDS, self.ttl), *[self._key(id_) for id_ in ids])
+
+    async def get_or_load_async(self, id_: uuid.UUID, load: Callable[[], Awaitable[M | None]]) -> M | None:
+        if not self.enabled:
+            return await load()
+        key = self._key(id_)
+        obj = self._count(self._decode(await self.backend.get_async(key)))
+        if obj is None:
+            async def fill() -> bytes | None:
+                return await self._store_async(await load(), None)
+            obj = self._decode(await self.flights.do_async(key, fill))
+        return obj
+
+    async def get_or_load_by_async(self, field: str, value: Any, load: Callable[[], Awaitable[M | None]]) -> M | None:
+        if not self.enabled:
+            return await load()
+        alias = self._alias(field, value)
+        key = self._resolve(await self.backend.get_async(alias))
+        obj = self._current(self._decode(await self.backend.get_async(key)) if key else None, field, value)
+        if self._count(obj) is None:
+            async def fill() -> bytes | None:
+                return await self._store_async(await load(), alias)
+            obj = self._decode(await self.flights.do_async(alias, fill))
+        return obj
+
+    async def invalidate_async(self, *ids: uuid.UUID) -> None:
+        if self.enabled and ids:
+            await self.backend.bury_async(min(TOMBSTONE_SECONDS, self.ttl), *[self._key(id_) for id_ in ids])
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            **self.backend.stats(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "coalesced": self.flights.shared,
+        }
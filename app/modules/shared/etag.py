@@ -0,0 +1,87 @@
+"""
+ETags for conditional requests.
+
+An entity's strong ETag is its id plus `updated_at` (microseconds), which
+every write bumps, so it changes exactly when the row does; a ?fields=
+representation adds a tag for the field set. Lists get a weak ETag over the
+ids/versions of the page. If-Match on writes is turned back into the
+`updated_at` values the row must still have, checked in the write itself.
+"""
+import hashlib
+import uuid
+import zlib
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi import Response
+
+from app.modules.shared.pagination import Page
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _version(updated_at: datetime) -> int:
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    delta = updated_at - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _fields_tag(fields: Sequence[str] | None) -> str:
+    return f".{zlib.crc32(','.join(fields).encode()):08x}" if fields else ""
+
+
+def entity_etag(obj: Any, fields: Sequence[str] | None = None) -> str:
+    return f'"{obj.id.hex}.{_version(obj.updated_at):x}{_fields_tag(fields)}"'
+
+
+def page_etag(page: Page, fields: Sequence[str] | None = None) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    for item in page.items:
+        digest.update(f"{item.id.hex}.{_version(item.updated_at):x};".encode())
+    digest.update(f"{page.count}|{page.next_cursor}".encode())
+    return f'W/"{digest.hexdigest()}{_fields_tag(fields)}"'
+
+
+def _tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match, compared weakly (the W/ prefix is ignored)."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(tag == "*" or tag.removeprefix("W/") == opaque for tag in _tags(if_none_match))
+
+
+def if_match_versions(if_match: str | None, id_: uuid.UUID) -> list[datetime] | None:
+    """
+    The `updated_at` values an If-Match header accepts for entity `id_`.
+    None when there is no precondition (no header, or `*`); an empty list
+    when no tag can match, i.e. the write must fail with 412. Weak tags
+    never match (strong comparison).
+    """
+    if not if_match:
+        return None
+    versions: list[datetime] = []
+    for tag in _tags(if_match):
+        if tag == "*":
+            return None
+        if tag.startswith("W/") or len(tag) < 2 or tag[0] != '"' or tag[-1] != '"':
+            continue
+        parts = tag[1:-1].split(".")
+        if len(parts) < 2 or parts[0] != id_.hex:
+            continue
+        try:
+            micros = int(parts[1], 16)
+        except ValueError:
+            continue
+        versions.append(datetime.fromtimestamp(micros // 1_000_000, timezone.utc).replace(
+            microsecond=micros % 1_000_000))
+    return versions
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,49 @@
+import csv
+import datetime
+import io
+import json
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy.engine import RowMapping
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+# Each fetched batch is encoded into one string, which keeps the number of
+# socket writes low without holding more than a batch in memory.
+def ndjson_batch(batch: Sequence[RowMapping]) -> str:
+    return "".join(json.dumps(dict(row), default=_json_default) + "\n" for row in batch)
+
+
+def csv_header(fields: list[str]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(fields)
+    return buffer.getvalue()
+
+
+def csv_batch(batch: Sequence[RowMapping], fields: list[str]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [_csv_value(row[f]) for f in fields] for row in batch)
+    return buffer.getvalue()
@@ -0,0 +1,44 @@
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy.orm import class_mapper, load_only
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy.sql import ColumnElement
+from sqlmodel import SQLModel
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> list[str]:
+    """
+    Turn a `?fields=a,b` query value into a list of `schema` field names,
+    keeping the schema order when nothing is requested.
+    """
+    allowed = list(schema.model_fields)
+    if not fields:
+        return allowed
+    requested = list(dict.fromkeys(
+        f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in allowed]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown) or fields}")
+    return requested
+
+
+def sparse_fields(fields: str | None, schema: type[BaseModel]) -> tuple[str, ...] | None:
+    """Like parse_fields, but None when the full representation was asked for."""
+    return tuple(parse_fields(fields, schema)) if fields else None
+
+
+def load_columns(model: type[SQLModel], fields: Sequence[str] | None, keys: Sequence[ColumnElement[Any]] = ()) -> list[ORMOption]:
+    """
+    load_only() for the requested fields plus `keys` (the keyset columns the
+    next cursor is built from). The primary key is always loaded, and so is
+    `updated_at`, which ETags are built from.
+    """
+    if not fields:
+        return []
+    columns = class_mapper(model).c
+    names = dict.fromkeys([*fields, *(str(k.key) for k in keys), "updated_at"])
+    return [load_only(*[getattr(model, n) for n in names if n in columns])]
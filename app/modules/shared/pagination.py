@@ -0,0 +1,158 @@
+import base64
+import datetime
+import json
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy import literal, tuple_
+from sqlalchemy.sql import ColumnElement, Select
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.modules.shared.counting import (
+    CountMode,
+    count_column,
+    count_rows,
+    count_rows_async,
+)
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page:
+    items: list[Any]
+    count: int | None
+    next_cursor: str | None
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _python_type(key: ColumnElement[Any]) -> type:
+    # unwrap TypeDecorators (e.g. sqlmodel's UTCDateTime) to the real type
+    sa_type = getattr(key.type, "impl_instance", key.type)
+    try:
+        return sa_type.python_type
+    except NotImplementedError:
+        return object
+
+
+def _from_json(value: Any, python_type: type) -> Any:
+    if value is None:
+        return None
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type is object:
+        return value
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[ColumnElement[Any]]) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError(cursor)
+        return [_from_json(v, _python_type(k)) for v, k in zip(values, keys, strict=True)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+def paginate(
+    statement: Select[Any],
+    keys: Sequence[ColumnElement[Any]],
+    *,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: str | None = None,
+    descending: bool = True,
+) -> Select[Any]:
+    """
+    Order by `keys` (the last one must be unique) and page either by keyset,
+    when a cursor is given, or by offset for older clients. One extra row is
+    fetched so `split_page` can tell whether another page exists.
+    """
+    statement = statement.order_by(
+        *[k.desc() if descending else k.asc() for k in keys])
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        bound = tuple_(*[literal(v, k.type) for v, k in zip(values, keys, strict=True)])
+        statement = statement.where(
+            tuple_(*keys) < bound if descending else tuple_(*keys) > bound)
+    elif skip:
+        statement = statement.offset(skip)
+    return statement.limit(limit + 1)
+
+
+def split_page(rows: Sequence[T], keys: Sequence[ColumnElement[Any]], limit: int) -> tuple[list[T], str | None]:
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor([getattr(last, str(k.key)) for k in keys])
+
+
+def fetch_page(
+    session: Session,
+    base: Select[Any],
+    keys: Sequence[ColumnElement[Any]],
+    *,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+    descending: bool = True,
+) -> Page:
+    statement = paginate(base, keys, skip=skip, limit=limit,
+                         cursor=cursor, descending=descending)
+    if count_mode == "exact":
+        rows = session.execute(statement.add_columns(count_column(base))).all()
+        items, next_cursor = split_page([row[0] for row in rows], keys, limit)
+        # an empty page carries no total; only then count separately
+        count = rows[0][-1] if rows else count_rows(session, base, count_mode)
+        return Page(items, count, next_cursor)
+    items, next_cursor = split_page(
+        session.execute(statement).scalars().all(), keys, limit)
+    return Page(items, count_rows(session, base, count_mode), next_cursor)
+
+
+async def fetch_page_async(
+    session: AsyncSession,
+    base: Select[Any],
+    keys: Sequence[ColumnElement[Any]],
+    *,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+    descending: bool = True,
+) -> Page:
+    statement = paginate(base, keys, skip=skip, limit=limit,
+                         cursor=cursor, descending=descending)
+    if count_mode == "exact":
+        rows = (await session.execute(statement.add_columns(count_column(base)))).all()
+        items, next_cursor = split_page([row[0] for row in rows], keys, limit)
+        count = rows[0][-1] if rows else await count_rows_async(session, base, count_mode)
+        return Page(items, count, next_cursor)
+    items, next_cursor = split_page(
+        (await session.execute(statement)).scalars().all(), keys, limit)
+    return Page(items, await count_rows_async(session, base, count_mode), next_cursor)
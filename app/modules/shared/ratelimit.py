@@ -0,0 +1,157 @@
+"""
+Sliding-window rate limiting with a pluggable store.
+
+A window is a log of hit timestamps per key: a hit is allowed while fewer
+than `limit` hits fall within the last `window` seconds. The in-memory store
+is per process; the Redis store (optional `redis` package) shares the log
+between workers and pods.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from ipaddress import IPv4Network, IPv6Network, ip_address
+from typing import Any, Protocol
+
+
+class RateLimitStore(Protocol):
+    def hit(self, key: str, limit: int, window: float) -> float:
+        """Record a hit; 0 if allowed, else seconds until one would be."""
+        ...
+
+    def reset(self, key: str) -> None:
+        ...
+
+
+class MemoryStore:
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._hits: OrderedDict[str, deque[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                hits = self._hits[key] = deque()
+            self._hits.move_to_end(key)
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) >= limit:
+                return hits[0] + window - now
+            hits.append(now)
+            # least recently hit keys go first; their windows are the oldest
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+            return 0.0
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._hits.pop(key, None)
+
+
+# trim, count, then record: one atomic round trip per hit
+_REDIS_HIT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return tostring(tonumber(oldest[2]) + window - now)
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+return '0'
+"""
+
+
+class RedisStore:
+    def __init__(self, url: str, prefix: str = "ratelimit:") -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "The redis rate limit store needs the `redis` package "
+                "(pip install 'sample-project[redis]')") from exc
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._hit = self._client.register_script(_REDIS_HIT)
+
+    def hit(self, key: str, limit: int, window: float) -> float:
+        retry_after = self._hit(keys=[self.prefix + key],
+                                args=[time.time(), window, limit, uuid.uuid4().hex])
+        return max(0.0, float(retry_after))
+
+    def reset(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+
+class RateLimiter:
+    """`limit` hits per `window` seconds for each key, with hit counters."""
+
+    def __init__(self, store: RateLimitStore, limit: int, window: float) -> None:
+        self.store = store
+        self.limit = limit
+        self.window = window
+        self.allowed = 0
+        self.rejected = 0
+
+    def hit(self, key: str) -> float:
+        retry_after = self.store.hit(key, self.limit, self.window)
+        if retry_after > 0:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    def reset(self, key: str) -> None:
+        self.store.reset(key)
+
+    def stats(self) -> dict[str, Any]:
+        return {"limit": self.limit, "window": self.window,
+                "allowed": self.allowed, "rejected": self.rejected}
+
+
+def _is_proxy(address: str, proxies: Sequence[IPv4Network | IPv6Network]) -> bool:
+    try:
+        ip = ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in proxies)
+
+
+def client_ip(peer: str | None, forwarded_for: Sequence[str], proxies: Sequence[IPv4Network | IPv6Network]) -> str | None:
+    """
+    The address to limit a request by. That is the peer, unless the peer is one of
+    the trusted `proxies`: then X-Forwarded-For is read from the right, past
+    any further proxies, to the first hop they did not add. Hops left of
+    that one come from the client, which can write anything there.
+    """
+    hops = [hop.strip() for header in forwarded_for for hop in header.split(",") if hop.strip()]
+    address = peer
+    while address is not None and hops and _is_proxy(address, proxies):
+        address = hops.pop()
+    return address
+
+
+def make_store(kind: str, redis_url: str | None = None) -> RateLimitStore:
+    if kind == "redis":
+        if not redis_url:
+            raise ValueError("REDIS_URL is required for the redis rate limit store")
+        return RedisStore(redis_url)
+    return MemoryStore()
+
+
+# name -> limiter, for the stats exposed under /metrics
+_registry: dict[str, RateLimiter] = {}
+
+
+def register_limiter(name: str, limiter: RateLimiter) -> RateLimiter:
+    _registry[name] = limiter
+    return limiter
+
+
+def limiter_stats() -> dict[str, dict[str, Any]]:
+    return {name: limiter.stats() for name, limiter in sorted(_registry.items())}
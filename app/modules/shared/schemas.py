@@ -1,3 +1,5 @@
+import uuid
+
 from sqlmodel import SQLModel
 
 # ------------------------
@@ -7,3 +9,78 @@ from sqlmodel import SQLModel
 
 class Message(SQLModel):
     message: str
+
+
+# ------------------------
+# Bulk Operation Schemas
+# ------------------------
+
+
+class BulkItemError(SQLModel):
+    index: int  # position of the item in the request body
+    id: uuid.UUID | None = None
+    slug: str | None = None
+    detail: str
+
+
+class BulkDelete(SQLModel):
+    ids: list[uuid.UUID]
+
+
+class BulkDeleteResult(SQLModel):
+    deleted: list[uuid.UUID]
+    errors: list[BulkItemError]
+
+
+# ------------------------
+# Metrics Schemas
+# ------------------------
+
+
+class CacheStats(SQLModel):
+    # None for caches kept outside the process (redis)
+    size: int | None = None
+    maxsize: int | None = None
+    hits: int
+    misses: int
+    hit_ratio: float
+    # misses that waited for a load already in flight (entity caches)
+    coalesced: int | None = None
+
+
+class RateLimitStats(SQLModel):
+    limit: int
+    window: float
+    allowed: int
+    rejected: int
+
+
+class PoolStats(SQLModel):
+    size: int
+    max_overflow: int
+    # connections checked out now / at most so far
+    in_use: int
+    in_use_max: int
+    idle: int
+    overflow: int
+    # new connections opened, checkouts served, connections found broken,
+    # checkouts that gave up after POSTGRES_POOL_TIMEOUT_SECONDS
+    connects: int
+    checkouts: int
+    invalidations: int
+    timeouts: int
+    checkout_wait_ms_avg: float
+    checkout_wait_ms_max: float
+
+
+# ------------------------
+# Health Schemas
+# ------------------------
+
+
+class Readiness(SQLModel):
+    ready: bool
+    # how long the warm-up took, once done
+    warmup_seconds: float | None = None
+    # the last warm-up failure, while it is being retried
+    error: str | None = None
@@ -0,0 +1,92 @@
+"""
+Request coalescing: concurrent calls for the same key wait for the one call
+already in flight and share its result (or exception) instead of repeating
+the work. `do` serves threads (sync routes on the threadpool), `do_async`
+coroutines on one event loop; the two never wait on each other.
+"""
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import (
+    Any,
+    TypeVar,
+    cast,
+)
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        # calls that ran / callers that got a result without running one
+        self.calls = 0
+        self.shared = 0
+        self._calls: dict[Hashable, _Call] = {}
+        self._futures: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return cast(T, call.result)
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return cast(T, call.result)
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        flight = (loop, key)
+        while flight in self._futures:
+            future = self._futures[flight]
+            self.shared += 1
+            try:
+                # shielded: a waiter going away must not cancel the call
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # the caller running it was cancelled; take over
+                self.shared -= 1
+        future = self._futures[flight] = loop.create_future()
+        self.calls += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # marks it retrieved: no "exception never retrieved" without waiters
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._futures[flight]
+        return result
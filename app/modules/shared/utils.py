@@ -1,16 +1,20 @@
 import logging
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import emails
 import jwt
-from jinja2 import Template
 from jwt.exceptions import InvalidTokenError
 
 from app.core import security
 from app.core.config import settings
+from app.core.mail import send_message, smtp_pool
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,12 +26,64 @@ class EmailData:
     subject: str
 
 
+EMAIL_TEMPLATES_DIR = Path(__file__).parent / "email-templates" / "build"
+
+# Stands in for the reset token in queued mail, which sits in the
+# email_outbox table until it is sent; fill_reset_token puts in a token
+# (valid from then on) at send time.
+RESET_TOKEN_PLACEHOLDER = "__reset_token__"
+
+
+# Built on first use (jinja2 is only imported then). Compiled templates stay
+# in the environment's cache; the files are not stat'ed again (auto_reload
+# off), so template edits need a restart.
+@cache
+def email_templates() -> "Environment":
+    from jinja2 import (
+        Environment,
+        FileSystemBytecodeCache,
+        FileSystemLoader,
+        select_autoescape,
+    )
+
+    bytecode_cache = None
+    if settings.EMAIL_TEMPLATES_BYTECODE_CACHE_DIR:
+        Path(settings.EMAIL_TEMPLATES_BYTECODE_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(settings.EMAIL_TEMPLATES_BYTECODE_CACHE_DIR)
+    return Environment(
+        loader=FileSystemLoader(EMAIL_TEMPLATES_DIR),
+        autoescape=select_autoescape(["html"]),
+        auto_reload=False,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def precompile_email_templates() -> int:
+    """Compile every template now rather than on the first email; the count."""
+    environment = email_templates()
+    names = environment.list_templates()
+    for name in names:
+        environment.get_template(name)
+    return len(names)
+
+
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (
-        Path(__file__).parent / "email-templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
-    return html_content
+    return email_templates().get_template(template_name).render(context)
+
+
+def render_email_templates(
+    *,
+    template_name: str,
+    contexts: Iterable[Mapping[str, Any]],
+    common: Mapping[str, Any] | None = None,
+) -> list[str]:
+    """
+    One template for many recipients: each of `contexts` on top of the
+    values in `common` that all of them share.
+    """
+    template = email_templates().get_template(template_name)
+    common = common or {}
+    return [template.render({**common, **context}) for context in contexts]
 
 
 def send_email(
@@ -36,23 +92,14 @@ def send_email(
     subject: str = "",
     html_content: str = "",
 ) -> None:
+    """
+    Send now, in the calling thread. Routes queue mail with
+    EmailService.enqueue_email instead.
+    """
     assert settings.emails_enabled, "no provided configuration for email variables"
-    message = emails.Message(
-        subject=subject,
-        html=html_content,
-        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
-    )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
-    if settings.SMTP_TLS:
-        smtp_options["tls"] = True
-    elif settings.SMTP_SSL:
-        smtp_options["ssl"] = True
-    if settings.SMTP_USER:
-        smtp_options["user"] = settings.SMTP_USER
-    if settings.SMTP_PASSWORD:
-        smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
-    logger.info(f"send email result: {response}")
+    with smtp_pool.connection() as smtp:
+        send_message(smtp, email_to=email_to, subject=subject, html_content=html_content)
+    logger.info("sent email to %s", email_to)
 
 
 def generate_test_email(email_to: str) -> EmailData:
@@ -65,10 +112,9 @@ def generate_test_email(email_to: str) -> EmailData:
     return EmailData(html_content=html_content, subject=subject)
 
 
-def generate_reset_password_email(email_to: str, email: str, token: str) -> EmailData:
+def generate_reset_password_email(email_to: str, email: str) -> EmailData:
     project_name = settings.PROJECT_NAME
     subject = f"{project_name} - Password recovery for user {email}"
-    link = f"{settings.FRONTEND_HOST}/reset-password?token={token}"
     html_content = render_email_template(
         template_name="reset_password.html",
         context={
@@ -76,15 +122,14 @@ def generate_reset_password_email(email_to: str, email: str, token: str) -> Emai
             "username": email,
             "email": email_to,
             "valid_hours": settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS,
-            "link": link,
+            "link": f"{settings.FRONTEND_HOST}/reset-password?token={RESET_TOKEN_PLACEHOLDER}",
         },
     )
     return EmailData(html_content=html_content, subject=subject)
 
 
-def generate_new_account_email(
-    email_to: str, username: str, password: str
-) -> EmailData:
+def generate_new_account_email(email_to: str, username: str) -> EmailData:
+    # a set-password link rather than the password
     project_name = settings.PROJECT_NAME
     subject = f"{project_name} - New account for user {username}"
     html_content = render_email_template(
@@ -92,14 +137,21 @@ def generate_new_account_email(
         context={
             "project_name": settings.PROJECT_NAME,
             "username": username,
-            "password": password,
             "email": email_to,
-            "link": settings.FRONTEND_HOST,
+            "valid_hours": settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS,
+            "link": f"{settings.FRONTEND_HOST}/reset-password?token={RESET_TOKEN_PLACEHOLDER}",
         },
     )
     return EmailData(html_content=html_content, subject=subject)
 
 
+def fill_reset_token(email_to: str, html_content: str) -> str:
+    """The mail as sent: a token for `email_to` in place of the placeholder."""
+    if RESET_TOKEN_PLACEHOLDER not in html_content:
+        return html_content
+    return html_content.replace(RESET_TOKEN_PLACEHOLDER, generate_password_reset_token(email=email_to))
+
+
 def generate_password_reset_token(email: str) -> str:
     delta = timedelta(hours=settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS)
     now = datetime.now(timezone.utc)
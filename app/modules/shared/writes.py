@@ -0,0 +1,105 @@
+"""
+Single-item writes in one statement each.
+
+Create, update and delete are a single INSERT / UPDATE / DELETE ... RETURNING
+followed by the commit: no existence or uniqueness SELECT beforehand and no
+refresh afterwards. Uniqueness is left to the unique indexes; a violation is
+raised as DuplicateError for the routes to turn into a 400/409.
+
+Updates and deletes take optional `versions`: the `updated_at` values the
+row must still have (from an If-Match header), so a stale write matches no
+row instead of overwriting a newer one.
+"""
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, TypeVar
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import Delete, Executable, Update
+from sqlmodel import Session, col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.modules.shared.base_model import BaseModel, insert_defaults, update_defaults
+
+M = TypeVar("M", bound=BaseModel)
+W = TypeVar("W", Update, Delete)
+
+UNIQUE_VIOLATION = "23505"
+
+
+class DuplicateError(Exception):
+    def __init__(self, constraint: str | None = None) -> None:
+        super().__init__(f"Duplicate value for {constraint or 'a unique field'}")
+        self.constraint = constraint
+
+
+def _duplicate(exc: IntegrityError) -> DuplicateError | None:
+    if getattr(exc.orig, "sqlstate", None) != UNIQUE_VIOLATION:
+        return None
+    diag = getattr(exc.orig, "diag", None)
+    return DuplicateError(getattr(diag, "constraint_name", None))
+
+
+def insert_statement(model: type[M], values: dict[str, Any]) -> Executable:
+    return insert(model).values(**{**values, **insert_defaults()}).returning(model)
+
+
+def _where_current(statement: W, model: type[M], id_: uuid.UUID, versions: Sequence[datetime] | None) -> W:
+    statement = statement.where(col(model.id) == id_)
+    if versions is not None:
+        statement = statement.where(col(model.updated_at).in_(versions))
+    return statement
+
+
+def update_statement(model: type[M], id_: uuid.UUID, values: dict[str, Any], versions: Sequence[datetime] | None = None) -> Executable:
+    # populate_existing: an instance already in the session (e.g. the current
+    # user) is overwritten with the returned row instead of keeping stale state
+    return _where_current(update(model), model, id_, versions).values(
+        **{**values, **update_defaults()}).returning(model).execution_options(
+        populate_existing=True)
+
+
+def delete_statement(model: type[M], id_: uuid.UUID, versions: Sequence[datetime] | None = None) -> Executable:
+    return _where_current(delete(model), model, id_, versions).returning(
+        col(model.id)).execution_options(synchronize_session=False)
+
+
+def write_one(session: Session, statement: Executable, *also: Executable) -> Any:
+    """
+    Run a RETURNING write and commit; the returned row or None if no row
+    matched. Statements in `also` run after it, in the same transaction.
+    """
+    try:
+        obj = session.scalars(statement).one_or_none()
+        for other in also:
+            session.execute(other)
+        if isinstance(obj, BaseModel):
+            # detach first so the commit does not expire what we return
+            session.expunge(obj)
+        session.commit()
+    except IntegrityError as exc:
+        session.rollback()
+        duplicate = _duplicate(exc)
+        if duplicate is not None:
+            raise duplicate from exc
+        raise
+    return obj
+
+
+async def write_one_async(session: AsyncSession, statement: Executable, *also: Executable) -> Any:
+    try:
+        obj = (await session.scalars(statement)).one_or_none()
+        for other in also:
+            await session.execute(other)
+        if isinstance(obj, BaseModel):
+            session.expunge(obj)
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        duplicate = _duplicate(exc)
+        if duplicate is not None:
+            raise duplicate from exc
+        raise
+    return obj
@@ -0,0 +1,199 @@
+"""
+Warm-up of a freshly started worker, before it reports ready.
+
+A new worker would otherwise pay on its first requests for opening Postgres
+connections, compiling every statement SQLAlchemy has not seen yet,
+spawning the password hashing workers and loading bcrypt. The lifespan runs
+warm_up() in the background: it opens WARMUP_CONNECTIONS pooled
+connections per engine in use, runs each router's common queries once so
+their compiled form is in the engine's cache, starts the hashing workers
+and signs and verifies a token. /health/ready answers 503 until it is done;
+an unreachable database is retried with backoff.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+import jwt
+from sqlalchemy import Engine, QueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core import security
+from app.core.config import settings
+from app.core.database import get_async_engine, get_engine
+from app.modules.services import (
+    AsyncAuthService,
+    AsyncCategoryService,
+    AsyncPostService,
+    AsyncTagService,
+    AsyncUserService,
+    AuthService,
+    CategoryService,
+    PostService,
+    TagService,
+    UserService,
+)
+from app.modules.shared.schemas import Readiness
+
+logger = logging.getLogger(__name__)
+
+# looked up by id/slug/email: matches nothing, runs the same SQL
+NO_ID = uuid.UUID(int=0)
+NO_KEY = "warm-up"
+
+
+class WarmupState:
+    def __init__(self) -> None:
+        self.ready = False
+        self.seconds: float | None = None
+        self.error: str | None = None
+
+    def readiness(self) -> Readiness:
+        return Readiness(ready=self.ready, warmup_seconds=self.seconds, error=self.error)
+
+
+state = WarmupState()
+
+
+def _pool_size(pool: Any) -> int:
+    # connections beyond the pool's size are closed when returned
+    return min(settings.WARMUP_CONNECTIONS, pool.size()) if isinstance(pool, QueuePool) else 0
+
+
+def open_connections(engine: Engine) -> int:
+    connections = [engine.connect() for _ in range(_pool_size(engine.pool))]
+    for connection in connections:
+        connection.close()
+    return len(connections)
+
+
+async def open_connections_async(engine: AsyncEngine) -> int:
+    connections = await asyncio.gather(*[engine.connect() for _ in range(_pool_size(engine.pool))])
+    for connection in connections:
+        await connection.close()
+    return len(connections)
+
+
+def _queries() -> list[Callable[[Session], Any]]:
+    # the sync auth lookups serve the metrics routes whatever ASYNC_ROUTERS says
+    queries: list[Callable[[Session], Any]] = [
+        lambda session: AuthService.get_auth_user(session, str(NO_ID)),
+        lambda session: AuthService.get_user_by_email(session=session, email=NO_KEY),
+    ]
+    routers = settings.ASYNC_ROUTERS
+    if "users" not in routers:
+        queries += [lambda session: UserService.get_all_users(session, limit=1),
+                    lambda session: UserService.get_user_by_id(session, NO_ID)]
+    if "posts" not in routers:
+        queries += [lambda session: PostService.get_all_posts(session, limit=1),
+                    lambda session: PostService.get_post_by_id(session, NO_ID),
+                    lambda session: PostService.get_post_by_slug(session, NO_KEY),
+                    lambda session: PostService.search_posts(session, NO_KEY, limit=1)]
+    if "categories" not in routers:
+        queries += [lambda session: CategoryService.get_all_categories(session, limit=1),
+                    lambda session: CategoryService.get_category_by_id(session, NO_ID)]
+    if "tags" not in routers:
+        queries += [lambda session: TagService.get_tag_counts(session, limit=1)]
+    return queries
+
+
+def _queries_async() -> list[Callable[[AsyncSession], Any]]:
+    routers = settings.ASYNC_ROUTERS
+    queries: list[Callable[[AsyncSession], Any]] = []
+    if routers:
+        # get_current_user_async, behind every async router
+        queries += [lambda session: AsyncAuthService.get_auth_user(session, str(NO_ID)),
+                    lambda session: AsyncAuthService.get_user_by_email(session=session, email=NO_KEY)]
+    if "users" in routers:
+        queries += [lambda session: AsyncUserService.get_all_users(session, limit=1),
+                    lambda session: AsyncUserService.get_user_by_id(session, NO_ID)]
+    if "posts" in routers:
+        queries += [lambda session: AsyncPostService.get_all_posts(session, limit=1),
+                    lambda session: AsyncPostService.get_post_by_id(session, NO_ID),
+                    lambda session: AsyncPostService.get_post_by_slug(session, NO_KEY),
+                    lambda session: AsyncPostService.search_posts(session, NO_KEY, limit=1)]
+    if "categories" in routers:
+        queries += [lambda session: AsyncCategoryService.get_all_categories(session, limit=1),
+                    lambda session: AsyncCategoryService.get_category_by_id(session, NO_ID)]
+    if "tags" in routers:
+        queries += [lambda session: AsyncTagService.get_tag_counts(session, limit=1)]
+    return queries
+
+
+def run_queries() -> int:
+    failed = 0
+    with Session(get_engine()) as session:
+        for query in _queries():
+            try:
+                query(session)
+            except Exception:
+                # a broken query is the route's problem, not a reason to stay unready
+                logger.warning("Warm-up query failed", exc_info=True)
+                session.rollback()
+                failed += 1
+    return failed
+
+
+async def run_queries_async() -> int:
+    failed = 0
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        for query in _queries_async():
+            try:
+                await query(session)
+            except Exception:
+                logger.warning("Warm-up query failed", exc_info=True)
+                await session.rollback()
+                failed += 1
+    return failed
+
+
+def sign_token() -> None:
+    token = security.create_access_token(NO_KEY, timedelta(minutes=1))
+    jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
+
+
+async def _connect() -> int:
+    opened = await run_in_threadpool(open_connections, get_engine())
+    if settings.ASYNC_ROUTERS:
+        opened += await open_connections_async(get_async_engine())
+    return opened
+
+
+async def warm_up() -> None:
+    if not settings.WARMUP_ENABLED:
+        state.ready = True
+        return
+    started = time.perf_counter()
+    delay = 0.5
+    while True:
+        try:
+            opened = await _connect()
+            break
+        except Exception as exc:
+            state.error = f"{type(exc).__name__}: {exc}"
+            logger.warning("Warm-up: database unreachable, retrying in %.1fs: %s", delay, exc)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 10.0)
+    try:
+        failed = await run_in_threadpool(run_queries)
+        if settings.ASYNC_ROUTERS:
+            failed += await run_queries_async()
+        await run_in_threadpool(security.start_hash_workers)
+        sign_token()
+    except Exception as exc:
+        # e.g. the hashing workers cannot start: logins would fail too
+        state.error = f"{type(exc).__name__}: {exc}"
+        logger.exception("Warm-up failed; not ready")
+        return
+    state.seconds = round(time.perf_counter() - started, 3)
+    state.error = None
+    state.ready = True
+    logger.info("Warm-up done in %.2fs: %d connections opened, %d queries failed",
+                state.seconds, opened, failed)
@@ -0,0 +1,78 @@
+"""
+Throughput of the sync and the async routers at high concurrency.
+
+    python -m tests.benchmarks.bench_async [--path P] [--concurrency N] [--seconds S]
+
+Serves the app under uvicorn twice, once with every router on the sync path
+and once with all of them in ASYNC_ROUTERS. Each time it signs in as
+`--username` (FIRST_SUPERUSER by default), then keeps `--concurrency`
+requests in flight against `--path` for `--seconds`, after a second of
+warm-up. Prints requests/s, latency percentiles and the failed requests for
+each. The load comes from this one process, which caps the
+rates it can show: compare the two runs, not the absolute numbers. Needs the
+database.
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+from app.core.config import settings
+from tests.benchmarks.loadgen import access_token, percentiles, serve
+
+ALL_ROUTERS = "auth,users,posts,categories,tags"
+
+
+async def load(base_url: str, token: str, path: str, concurrency: int, seconds: float) -> None:
+    limits = httpx.Limits(max_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        latencies: list[float] = []
+        errors: Counter[str] = Counter()
+        measuring = False
+
+        async def worker(deadline: float) -> None:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code == 200
+                    if not ok:
+                        errors[str(response.status_code)] += 1
+                except httpx.HTTPError as exc:
+                    ok = False
+                    errors[type(exc).__name__] += 1
+                if measuring and ok:
+                    latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker(time.perf_counter() + 1) for _ in range(concurrency)))
+        measuring = True
+        errors.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(started + seconds) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    print(f"  {len(latencies) / elapsed:8,.0f} req/s  {percentiles(latencies)}"
+          + (f"  failed: {dict(errors)}" if errors else ""))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--path", default="/api/v1/posts/?limit=20&count_mode=none", help="GET route to load")
+    parser.add_argument("--concurrency", type=int, default=200, help="requests in flight")
+    parser.add_argument("--seconds", type=float, default=10.0, help="measured run per mode")
+    parser.add_argument("--username", default=settings.FIRST_SUPERUSER, help="an existing user")
+    parser.add_argument("--password", default=settings.FIRST_SUPERUSER_PASSWORD, help="their password")
+    args = parser.parse_args()
+
+    for label, routers in (("sync", ""), ("async", ALL_ROUTERS)):
+        print(f"{label}: GET {args.path}, {args.concurrency} in flight")
+        with serve({"ASYNC_ROUTERS": routers}) as base_url:
+            token = access_token(base_url, args.username, args.password)
+            asyncio.run(load(base_url, token, args.path, args.concurrency, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Email template rendering throughput.
+
+    python -m tests.benchmarks.bench_email_templates [--number N]
+
+Compares compiling the template for every mail (what render_email_template
+did before the cached Environment) with render_email_template and with the
+bulk render_email_templates, and times precompile_email_templates.
+"""
+import argparse
+import time
+from collections.abc import Callable
+
+from app.modules.shared import utils
+
+TEMPLATE = "new_account.html"
+CONTEXT = {"project_name": "Sample", "username": "user@example.com", "email": "user@example.com",
+           "valid_hours": 48, "link": "http://localhost:5173/reset-password?token=abc"}
+
+
+def per_second(run: Callable[[], object], renders: int, repeat: int) -> float:
+    run()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return renders * repeat / (time.perf_counter() - started)
+
+
+def compile_and_render() -> str:
+    from jinja2 import Template
+
+    html: str = Template((utils.EMAIL_TEMPLATES_DIR / TEMPLATE).read_text()).render(CONTEXT)
+    return html
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=5000, help="renders per measurement")
+    number = parser.parse_args().number
+
+    started = time.perf_counter()
+    compiled = utils.precompile_email_templates()
+    print(f"precompile_email_templates: {compiled} templates in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    contexts = [dict(CONTEXT, email=f"user{n}@example.com") for n in range(number)]
+    results = {
+        "compile per render": per_second(compile_and_render, 1, max(1, number // 20)),
+        "render_email_template": per_second(
+            lambda: utils.render_email_template(template_name=TEMPLATE, context=CONTEXT), 1, number),
+        "render_email_templates": per_second(
+            lambda: utils.render_email_templates(template_name=TEMPLATE, contexts=contexts), number, 3),
+    }
+    for label, rate in results.items():
+        print(f"{label:24s} {rate:10,.0f} renders/s  ({1e6 / rate:7.1f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+List page encoding: the pydantic response_model path against page_response.
+
+    python -m tests.benchmarks.bench_encoding [--rows N] [--number N]
+
+The pydantic path is what FastAPI does with ORM rows under a
+response_model: validate the envelope from attributes, dump it in JSON mode,
+json.dumps the result. Rows are built in memory; no database is needed.
+"""
+import argparse
+import functools
+import json
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+from app.modules.models.CategoryModel import Category
+from app.modules.models.PostModel import Post
+from app.modules.models.UserModel import User
+from app.modules.schemas import CategorySchemas, PostSchemas, UserSchemas
+from app.modules.shared.encoding import page_response
+from app.modules.shared.pagination import Page
+
+
+def _stamp(n: int) -> datetime:
+    return datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=n, microseconds=n)
+
+
+def posts(count: int) -> list[Post]:
+    category_id = uuid.uuid4()
+    return [Post(title=f"Post {n}", slug=f"post-{n}", content="Lorem ipsum dolor sit amet. " * 20,
+                 image=None, thumbnail_url=f"https://cdn.example.com/{n}.jpg", is_published=n % 2 == 0,
+                 is_featured=n % 7 == 0, category_id=category_id, published_at=_stamp(n),
+                 tags=["python", "fastapi", f"tag-{n % 5}"], created_at=_stamp(n), updated_at=_stamp(n))
+            for n in range(count)]
+
+
+def categories(count: int) -> list[Category]:
+    return [Category(name=f"Category {n}", slug=f"category-{n}", description="About this category",
+                     created_at=_stamp(n), updated_at=_stamp(n))
+            for n in range(count)]
+
+
+def users(count: int) -> list[User]:
+    return [User(email=f"user{n}@example.com", hashed_password="x", full_name=f"User {n}",
+                 created_at=_stamp(n), updated_at=_stamp(n))
+            for n in range(count)]
+
+
+# (envelope, row schema, rows)
+PAGES: dict[str, tuple[type[BaseModel], type[BaseModel], Any]] = {
+    "PostRead": (PostSchemas.PostsPublic, PostSchemas.PostRead, posts),
+    "CategoryRead": (CategorySchemas.CategoriesPublic, CategorySchemas.CategoryRead, categories),
+    "UserPublic": (UserSchemas.UsersPublic, UserSchemas.UserPublic, users),
+}
+
+
+def pydantic_body(envelope: type[BaseModel], page: Page) -> bytes:
+    adapter = TypeAdapter(envelope)
+    value = adapter.validate_python({"data": page.items, "count": page.count, "next_cursor": page.next_cursor},
+                                    from_attributes=True)
+    return json.dumps(adapter.dump_python(value, mode="json"), ensure_ascii=False,
+                      allow_nan=False, separators=(",", ":")).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100, help="rows per page")
+    parser.add_argument("--number", type=int, default=300, help="pages per measurement")
+    args = parser.parse_args()
+
+    for name, (envelope, schema, make_rows) in PAGES.items():
+        page = Page(make_rows(args.rows), args.rows, "next")
+        before = timeit.timeit(functools.partial(pydantic_body, envelope, page), number=args.number) / args.number
+        after = timeit.timeit(functools.partial(page_response, schema, page), number=args.number) / args.number
+        print(f"{name:13s} {args.rows} rows: pydantic {before * 1e3:7.3f} ms, "
+              f"page_response {after * 1e3:7.3f} ms ({before / after:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
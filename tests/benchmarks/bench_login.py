@@ -0,0 +1,110 @@
+"""
+Login latency under a burst of sign-ins, and what the burst does to the rest.
+
+    python -m tests.benchmarks.bench_login [--logins N] [--concurrency N]
+
+Serves the app with uvicorn in this process and signs in `--username`
+(FIRST_SUPERUSER by default) `--logins` times, `--concurrency` at a time. Meanwhile one client keeps
+reading a page of posts, a sync route on the threadpool, so a login path
+that holds threads shows up as a slow probe. Prints p50/p95/p99 for both,
+and the status codes the logins got (503: the hashing queue was full)
+along with any failed requests.
+Set ASYNC_ROUTERS=auth to measure the async auth router instead. Needs the
+database; the login rate limits are lifted for the run.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from tests.benchmarks.loadgen import free_port, percentiles
+
+
+async def run(base_url: str, username: str, password: str, logins: int, concurrency: int) -> None:
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        gate = asyncio.Semaphore(concurrency)
+        done = asyncio.Event()
+        login_times: list[float] = []
+        probe_times: list[float] = []
+        statuses: Counter[int | str] = Counter()
+
+        async def login() -> None:
+            async with gate:
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/api/v1/auth/access-token",
+                                                 data={"username": username, "password": password})
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError as exc:
+                    statuses[type(exc).__name__] += 1
+                login_times.append(time.perf_counter() - started)
+
+        async def probe() -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                try:
+                    await client.get("/api/v1/posts/", params={"limit": 1, "count_mode": "none"})
+                except httpx.HTTPError:
+                    statuses["probe failed"] += 1
+                probe_times.append(time.perf_counter() - started)
+                await asyncio.sleep(0.01)
+
+        # the unloaded probe first, as the baseline
+        idle = asyncio.create_task(probe())
+        await asyncio.sleep(1)
+        done.set()
+        await idle
+        baseline, probe_times = probe_times, []
+
+        done.clear()
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+
+    print(f"{logins} logins, {concurrency} at a time, in {elapsed:.1f} s: {dict(statuses)}")
+    print(f"login           {percentiles(login_times)}")
+    print(f"probe (idle)    {percentiles(baseline)}")
+    print(f"probe (burst)   {percentiles(probe_times)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200, help="sign-ins in the burst")
+    parser.add_argument("--concurrency", type=int, default=80, help="sign-ins in flight at once")
+    parser.add_argument("--username", help="an existing user (default: FIRST_SUPERUSER)")
+    parser.add_argument("--password", help="their password (default: FIRST_SUPERUSER_PASSWORD)")
+    args = parser.parse_args()
+
+    # before the app reads its settings
+    os.environ["LOGIN_RATE_LIMIT_PER_IP"] = os.environ["LOGIN_RATE_LIMIT_PER_USERNAME"] = str(10 ** 9)
+    import uvicorn
+
+    from app.core.config import settings
+    from app.main import app
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        asyncio.run(run(f"http://127.0.0.1:{port}", args.username or settings.FIRST_SUPERUSER,
+                        args.password or settings.FIRST_SUPERUSER_PASSWORD, args.logins, args.concurrency))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Latency of the full-text post search against a naive ILIKE scan.
+
+    python -m tests.benchmarks.bench_search [--seed N] [--repeat K] [--clean]
+
+`--seed` first inserts N synthetic posts (slugs starting "bench-search-"),
+every one mentioning "report" and one in 100,000 mentioning "zephyr";
+`--clean` deletes them again once it is done. For a rare and a very common
+term it then prints the median over `--repeat` runs of a 20-row page from
+PostService.search_statement, with and without highlighting, and from
+`title ILIKE '%term%' OR content ILIKE '%term%'` in list order. Needs the
+database; the request asked for the numbers at 1M posts (--seed 1000000).
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.sql import Executable
+from sqlmodel import Session, col, or_, select
+
+from app.core.database import get_engine
+from app.modules.models.CategoryModel import Category  # noqa: F401
+from app.modules.models.PostModel import Post
+from app.modules.models.UserModel import User  # noqa: F401
+from app.modules.services.PostService import PAGE_KEYS, SEARCH_CONFIG, search_statement
+
+SLUG_PREFIX = "bench-search-"
+TERMS = {"rare": "zephyr", "common": "report"}
+LIMIT = 20
+
+SEED = text("""
+    INSERT INTO posts (id, created_at, updated_at, title, slug, content, is_published, is_featured, tags)
+    SELECT gen_random_uuid(), now() - make_interval(secs => i), now(),
+           'Weekly report ' || i, :prefix || i,
+           repeat(md5(i::text) || ' ', 8) || 'report'
+               || CASE WHEN i % 100000 = 0 THEN ' zephyr' ELSE '' END,
+           true, false, '["bench"]'::jsonb
+    FROM generate_series(1, :n) AS i
+""")
+
+
+def ilike_statement(term: str) -> Executable:
+    pattern = f"%{term}%"
+    return (select(Post).where(or_(col(Post.title).ilike(pattern), col(Post.content).ilike(pattern)))
+            .order_by(*PAGE_KEYS).limit(LIMIT))
+
+
+def median_ms(session: Session, statement: Executable, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        session.execute(statement).all()
+        timings.append(time.perf_counter() - started)
+        session.expunge_all()
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=0, help="synthetic posts to insert first")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query; the median is shown")
+    parser.add_argument("--clean", action="store_true", help="delete the synthetic posts afterwards")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    with Session(engine) as session:
+        if args.seed:
+            started = time.perf_counter()
+            session.execute(SEED, {"prefix": SLUG_PREFIX, "n": args.seed})
+            session.commit()
+            print(f"seeded {args.seed:,} posts in {time.perf_counter() - started:.0f} s")
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("VACUUM ANALYZE posts"))
+        total = session.execute(text("SELECT count(*) FROM posts")).scalar_one()
+        print(f"{total:,} posts, page of {LIMIT}, median of {args.repeat}:")
+        try:
+            for label, term in TERMS.items():
+                matches = session.execute(
+                    text("SELECT count(*) FROM posts WHERE search_vector @@ websearch_to_tsquery(CAST(:config AS regconfig), :q)"),
+                    {"config": SEARCH_CONFIG, "q": term}).scalar_one()
+                print(f"  {label} term {term!r} ({matches:,} matches)")
+                print(f"    full-text             {median_ms(session, search_statement(term, limit=LIMIT), args.repeat):9.1f} ms")
+                print(f"    full-text, highlight  {median_ms(session, search_statement(term, highlight=True, limit=LIMIT), args.repeat):9.1f} ms")
+                print(f"    ILIKE                 {median_ms(session, ilike_statement(term), args.repeat):9.1f} ms")
+        finally:
+            if args.clean:
+                session.rollback()
+                session.execute(text("DELETE FROM posts WHERE slug LIKE :prefix || '%'"), {"prefix": SLUG_PREFIX})
+                session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Insert throughput and primary key size with UUIDv4 against UUIDv7 keys.
+
+    python -m tests.benchmarks.bench_uuid [--rows N] [--batch N]
+
+For each version, COPYs `--rows` ids into a fresh unlogged table with a
+uuid primary key, `--batch` rows per COPY and commit, like a steady stream
+of inserts. The ids come from uuid.uuid4 and base_model.uuid7. Each batch is
+generated just before it is sent and only the COPY is timed, so memory stays
+flat and the two generators' own cost stays out of the numbers. Prints rows/s
+and the size of the primary key index, then drops the table. Needs the
+database.
+"""
+import argparse
+import time
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import Connection, text
+
+from app.core.database import get_engine
+from app.modules.shared.base_model import uuid7
+
+TABLE = "bench_uuid_keys"
+
+
+def load(connection: Connection, new_id: Callable[[], uuid.UUID], rows: int, batch: int) -> float:
+    driver_connection = connection.connection.driver_connection
+    assert driver_connection is not None
+    elapsed = 0.0
+    for offset in range(0, rows, batch):
+        lines = "".join(f"{new_id()}\n" for _ in range(min(batch, rows - offset)))
+        started = time.perf_counter()
+        with driver_connection.cursor() as cursor:
+            with cursor.copy(f"COPY {TABLE} (id) FROM STDIN") as copy:
+                copy.write(lines)
+        connection.commit()
+        elapsed += time.perf_counter() - started
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000, help="ids to insert per version")
+    parser.add_argument("--batch", type=int, default=1000, help="rows per COPY")
+    args = parser.parse_args()
+
+    with get_engine().connect() as connection:
+        for label, new_id in (("v4", uuid.uuid4), ("v7", uuid7)):
+            connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+            connection.execute(text(f"CREATE UNLOGGED TABLE {TABLE} (id uuid PRIMARY KEY)"))
+            connection.commit()
+            try:
+                elapsed = load(connection, new_id, args.rows, args.batch)
+                size = connection.execute(
+                    text("SELECT pg_size_pretty(pg_relation_size(:index))"), {"index": f"{TABLE}_pkey"}).scalar_one()
+                print(f"{label}: {args.rows:,} rows in {elapsed:.1f} s, {args.rows / elapsed:,.0f} rows/s, pkey {size}")
+            finally:
+                connection.rollback()
+                connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+                connection.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Statements, commits and latency per single-item write, before and after RETURNING.
+
+    python -m tests.benchmarks.bench_writes [--number N]
+
+Creates, updates and deletes `--number` categories twice: once the way the
+routes used to (a SELECT for the slug or the row, the write, then a refresh
+SELECT after the commit) and once through CategoryService, where each write
+is one INSERT / UPDATE / DELETE ... RETURNING. Counts what reaches the
+database with cursor-execute and commit events, and prints statements and
+commits per operation along with the mean time per operation. Every
+category it creates is deleted again. Needs the database.
+"""
+import argparse
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlmodel import Session, select
+
+from app.core.database import get_engine
+from app.modules.models.CategoryModel import Category
+from app.modules.models.UserModel import User  # noqa: F401
+from app.modules.schemas.CategorySchemas import CategoryCreate, CategoryUpdate
+from app.modules.services import CategoryService
+
+
+class RoundTrips:
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.statements = 0
+        self.commits = 0
+
+    def _statement(self, *args: Any) -> None:
+        self.statements += 1
+
+    def _commit(self, *args: Any) -> None:
+        self.commits += 1
+
+    def __enter__(self) -> "RoundTrips":
+        event.listen(self.engine, "before_cursor_execute", self._statement)
+        event.listen(self.engine, "commit", self._commit)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._statement)
+        event.remove(self.engine, "commit", self._commit)
+
+
+def legacy_create(session: Session, category_in: CategoryCreate) -> Category:
+    # the route checked the slug was free first
+    session.exec(select(Category).where(Category.slug == category_in.slug)).first()
+    category = Category.model_validate(category_in)
+    session.add(category)
+    session.commit()
+    session.refresh(category)
+    return category
+
+
+def legacy_update(session: Session, category_id: uuid.UUID, category_in: CategoryUpdate) -> Category | None:
+    category = session.get(Category, category_id)
+    if category is None:
+        return None
+    category.sqlmodel_update(category_in.model_dump(exclude_unset=True))
+    session.add(category)
+    session.commit()
+    session.refresh(category)
+    return category
+
+
+def legacy_delete(session: Session, category_id: uuid.UUID) -> bool:
+    category = session.get(Category, category_id)
+    if category is None:
+        return False
+    session.delete(category)
+    session.commit()
+    return True
+
+
+def measure(engine: Engine, label: str, number: int, write: Callable[[Session, int], None]) -> None:
+    with Session(engine) as session, RoundTrips(engine) as trips:
+        started = time.perf_counter()
+        for i in range(number):
+            write(session, i)
+            # a fresh identity map each time, as each request gets its own session
+            session.expunge_all()
+        elapsed = time.perf_counter() - started
+    print(f"  {label:<8} {trips.statements / number:4.1f} statements  {trips.commits / number:4.1f} commits"
+          f"  {elapsed / number * 1000:6.2f} ms/op")
+
+
+def run(engine: Engine, number: int, create: Callable[[Session, CategoryCreate], Category],
+        update: Callable[[Session, uuid.UUID, CategoryUpdate], object],
+        remove: Callable[[Session, uuid.UUID], object]) -> None:
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    ids: list[uuid.UUID] = []
+
+    def do_create(session: Session, i: int) -> None:
+        ids.append(create(session, CategoryCreate(name=f"{prefix}-{i}", slug=f"{prefix}-{i}")).id)
+
+    def do_update(session: Session, i: int) -> None:
+        update(session, ids[i], CategoryUpdate(description=f"updated {i}"))
+
+    def do_delete(session: Session, i: int) -> None:
+        remove(session, ids[i])
+
+    measure(engine, "create", number, do_create)
+    measure(engine, "update", number, do_update)
+    measure(engine, "delete", number, do_delete)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=500, help="categories to write per path")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    print(f"before (select, write, refresh), {args.number} categories:")
+    run(engine, args.number, legacy_create, legacy_update, legacy_delete)
+    print(f"after (one statement with RETURNING), {args.number} categories:")
+    run(engine, args.number, CategoryService.create_category, CategoryService.update_category,
+        CategoryService.delete_category)
+
+
+if __name__ == "__main__":
+    main()
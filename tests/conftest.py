@@ -0,0 +1,30 @@
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+
+from app.core.database import get_engine
+
+# registers the tables other models reference by foreign key
+from app.modules.models.CategoryModel import Category  # noqa: F401
+from app.modules.models.UserModel import User  # noqa: F401
+
+
+@pytest.fixture(scope="session")
+def db_engine() -> Engine:
+    """The configured database; tests that need one skip without it."""
+    engine = get_engine()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except OperationalError as exc:
+        pytest.skip(f"database not available: {exc}")
+    return engine
+
+
+@pytest.fixture()
+def db(db_engine: Engine) -> Iterator[Session]:
+    with Session(db_engine) as session:
+        yield session
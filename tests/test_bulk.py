@@ -0,0 +1,36 @@
+import uuid
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import delete
+from sqlmodel import Session, col
+
+from app.modules.models.CategoryModel import Category
+from app.modules.shared.bulk import bulk_insert, bulk_update
+
+TOO_LONG = "x" * 300  # name is varchar(255)
+
+
+@pytest.fixture()
+def prefix(db: Session) -> Iterator[str]:
+    prefix = f"bulk-{uuid.uuid4().hex[:8]}"
+    yield prefix
+    db.execute(delete(Category).where(col(Category.slug).startswith(prefix)))
+    db.commit()
+
+
+def test_insert_reports_value_errors_per_item(db: Session, prefix: str) -> None:
+    rows = [{"name": "ok", "slug": f"{prefix}-{n}"} for n in range(5)]
+    rows[2]["name"] = TOO_LONG
+    created, errors = bulk_insert(db, Category, rows, chunk_size=5)
+    assert sorted(c.slug for c in created) == [f"{prefix}-{n}" for n in (0, 1, 3, 4)]
+    assert [(e.index, e.slug) for e in errors] == [(2, f"{prefix}-2")]
+    assert "too long" in errors[0].detail
+
+
+def test_update_reports_value_errors_per_item(db: Session, prefix: str) -> None:
+    created, _ = bulk_insert(db, Category, [{"name": "ok", "slug": f"{prefix}-{n}"} for n in range(3)])
+    rows = [{"id": c.id, "name": TOO_LONG if n == 1 else "renamed"} for n, c in enumerate(created)]
+    updated, errors = bulk_update(db, Category, rows)
+    assert {c.name for c in updated} == {"renamed"} and len(updated) == 2
+    assert [e.index for e in errors] == [1]
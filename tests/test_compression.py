@@ -0,0 +1,153 @@
+import asyncio
+import json
+import zlib
+from collections.abc import AsyncIterator
+
+import pytest
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.types import ASGIApp, Message
+
+from app.core.compression import CODECS, CompressionMiddleware, negotiate
+
+ENCODINGS = ["zstd", "br", "gzip"]
+LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+MINIMUM_SIZE = 1024
+# compressible and over MINIMUM_SIZE
+PAYLOAD = {"data": [{"id": i, "title": f"post {i}"} for i in range(100)]}
+
+
+def needs(encoding: str) -> None:
+    # br and zstd come with the optional `compression` extra
+    module = CODECS[encoding][0]
+    if module is not None:
+        pytest.importorskip(module)
+
+
+def decompress(encoding: str, body: bytes) -> bytes:
+    if encoding == "gzip":
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+    if encoding == "br":
+        import brotli
+        return bytes(brotli.decompress(body))
+    import zstandard
+    return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+
+def fetch(response: ASGIApp, accept_encoding: str | None) -> tuple[dict[str, str], list[bytes]]:
+    """Run `response` behind the middleware; its headers and body chunks as sent."""
+    app = CompressionMiddleware(response, ENCODINGS, LEVELS, MINIMUM_SIZE)
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding is not None else []
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": headers}
+    sent: list[Message] = []
+
+    async def receive() -> Message:
+        # no request body, and the client never disconnects
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start, *body = sent
+    assert start["type"] == "http.response.start"
+    return ({k.decode(): v.decode() for k, v in start["headers"]},
+            [message["body"] for message in body if message.get("body")])
+
+
+@pytest.mark.parametrize(("accept_encoding", "expected"), [
+    ("gzip, deflate, br, zstd", "zstd"),
+    ("gzip, br", "br"),
+    ("gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("zstd;q=0, br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=oops", None),
+    ("identity", None),
+    ("deflate", None),
+    ("", None),
+    ("*", "zstd"),
+    ("zstd;q=0, *", "br"),
+    ("*;q=0", None),
+])
+def test_negotiate(accept_encoding: str, expected: str | None) -> None:
+    assert negotiate(accept_encoding, ENCODINGS) == expected
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_compresses_with_the_negotiated_encoding(encoding: str) -> None:
+    needs(encoding)
+    headers, chunks = fetch(JSONResponse(PAYLOAD), encoding)
+    body = b"".join(chunks)
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["content-length"] == str(len(body))
+    assert json.loads(decompress(encoding, body)) == PAYLOAD
+
+
+@pytest.mark.parametrize("accept_encoding", [None, "identity", "gzip;q=0, br;q=0, zstd;q=0"])
+def test_identity_goes_out_as_it_is(accept_encoding: str | None) -> None:
+    response = JSONResponse(PAYLOAD)
+    headers, chunks = fetch(response, accept_encoding)
+    assert "content-encoding" not in headers
+    # the body depended on the header all the same
+    assert headers["vary"] == "Accept-Encoding"
+    assert b"".join(chunks) == response.body
+
+
+def test_small_bodies_are_not_compressed() -> None:
+    response = JSONResponse({"id": 1})
+    headers, chunks = fetch(response, "gzip")
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert chunks == [response.body]
+
+
+def test_vary_keeps_what_the_route_set() -> None:
+    headers, _ = fetch(JSONResponse(PAYLOAD, headers={"Vary": "Authorization"}), "gzip")
+    assert headers["vary"] == "Authorization, Accept-Encoding"
+
+
+@pytest.mark.parametrize("response", [
+    Response(b"\x89PNG" + bytes(4096), media_type="image/png"),
+    Response(b"x" * 4096, media_type="text/plain", headers={"Content-Encoding": "gzip"}),
+], ids=["not compressible", "already encoded"])
+def test_passed_through_untouched(response: Response) -> None:
+    headers, chunks = fetch(response, "gzip")
+    assert headers.get("content-encoding") == response.headers.get("content-encoding")
+    assert "vary" not in headers
+    assert chunks == [response.body]
+
+
+async def lines(count: int) -> AsyncIterator[bytes]:
+    for i in range(count):
+        yield json.dumps({"line": i}).encode() + b"\n"
+
+
+def test_streamed_chunks_are_compressed_and_flushed_one_by_one() -> None:
+    headers, chunks = fetch(StreamingResponse(lines(5), media_type="application/x-ndjson"), "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert "content-length" not in headers
+    # every chunk decodes on arrival: the client need not wait for the end
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    received = [decoder.decompress(chunk) for chunk in chunks]
+    assert received[:5] == [json.dumps({"line": i}).encode() + b"\n" for i in range(5)]
+    assert b"".join(received) + decoder.flush() == b"".join(received[:5])
+    assert decoder.eof
+
+
+@pytest.mark.parametrize("encoding", ["zstd", "br"])
+def test_streamed_chunks_decode_with_every_encoding(encoding: str) -> None:
+    needs(encoding)
+    headers, chunks = fetch(StreamingResponse(lines(5), media_type="application/x-ndjson"), encoding)
+    assert headers["content-encoding"] == encoding
+    assert decompress(encoding, b"".join(chunks)).splitlines() == [
+        json.dumps({"line": i}).encode() for i in range(5)]
+
+
+def test_event_streams_are_not_compressed() -> None:
+    headers, chunks = fetch(StreamingResponse(lines(3), media_type="text/event-stream"), "gzip")
+    assert "content-encoding" not in headers
+    assert b"".join(chunks).count(b"\n") == 3
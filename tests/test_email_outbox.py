@@ -0,0 +1,182 @@
+import email as email_parser
+import re
+import socket
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from email import policy
+from typing import Any
+
+import pytest
+from sqlalchemy.exc import DataError
+from sqlmodel import Session, select
+from tenacity import wait_none
+
+from app.core.config import settings
+from app.core.mail import send_message, smtp_pool
+from app.modules.models.EmailOutboxModel import EmailOutbox
+from app.modules.models.UserModel import User
+from app.modules.schemas.UserSchemas import UserCreate
+from app.modules.services import UserService
+from app.modules.services.EmailService import dispatch_batch, enqueue_email
+from app.modules.shared.utils import (
+    RESET_TOKEN_PLACEHOLDER,
+    EmailData,
+    generate_reset_password_email,
+    verify_password_reset_token,
+)
+from app.modules.shared.writes import DuplicateError
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+
+class Handler:
+    """Accepts everything, or answers RCPT with `reply` when set."""
+
+    def __init__(self) -> None:
+        self.reply: str | None = None
+        self.received: list[str] = []
+        self.bodies: list[str] = []
+
+    async def handle_RCPT(self, server: Any, session: Any, envelope: Any, address: str, rcpt_options: list[str]) -> str:
+        if self.reply:
+            return self.reply
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:
+        self.received.extend(envelope.rcpt_tos)
+        message = email_parser.message_from_bytes(envelope.content, policy=policy.default)
+        self.bodies.extend(part.get_content() for part in message.walk()
+                           if part.get_content_type() == "text/html")
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@pytest.fixture()
+def smtp_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[Handler]:
+    handler = Handler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    monkeypatch.setattr(settings, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(settings, "SMTP_PORT", controller.port)
+    monkeypatch.setattr(settings, "SMTP_TLS", False)
+    monkeypatch.setattr(settings, "SMTP_SSL", False)
+    monkeypatch.setattr(settings, "SMTP_USER", None)
+    monkeypatch.setattr(settings, "SMTP_PASSWORD", None)
+    yield handler
+    smtp_pool.close()
+    controller.stop()
+
+
+def queue(db: Session, email_to: str) -> EmailOutbox:
+    return enqueue_email(db, email_to=email_to, subject="Test", html_content="<p>secret</p>")
+
+
+def drain() -> None:
+    # includes whatever else is due in the table
+    while dispatch_batch():
+        pass
+
+
+def reload(db: Session, email: EmailOutbox) -> EmailOutbox:
+    db.expire_all()
+    row = db.get(EmailOutbox, email.id)
+    assert row is not None
+    return row
+
+
+def test_sent(db: Session, smtp_server: Handler) -> None:
+    email = queue(db, "sent@example.com")
+    drain()
+    row = reload(db, email)
+    assert row.status == "sent"
+    assert row.attempts == 1
+    assert row.html_content == ""
+    assert "sent@example.com" in smtp_server.received
+
+
+def test_permanent_error_fails(db: Session, smtp_server: Handler) -> None:
+    smtp_server.reply = "550 5.1.1 No such user"
+    email = queue(db, "unknown@example.com")
+    drain()
+    row = reload(db, email)
+    assert row.status == "failed"
+    assert row.attempts == 1
+    assert row.html_content == ""
+    assert row.last_error is not None and "550" in row.last_error
+
+
+def test_transient_error_is_retried(db: Session, smtp_server: Handler) -> None:
+    smtp_server.reply = "451 4.7.1 Greylisted, try again later"
+    email = queue(db, "greylisted@example.com")
+    drain()
+    row = reload(db, email)
+    assert row.status == "pending"
+    assert row.attempts == 1
+    assert row.next_attempt_at > datetime.now(timezone.utc)
+    assert row.html_content == "<p>secret</p>"
+
+
+def test_server_down_is_retried(db: Session, smtp_server: Handler, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SMTP_PORT", free_port())
+    # send_message's own reconnect attempts, without their backoff
+    monkeypatch.setattr(send_message.retry, "wait", wait_none())  # type: ignore[attr-defined]
+    first, second = queue(db, "down-1@example.com"), queue(db, "down-2@example.com")
+    drain()
+    for email in (first, second):
+        row = reload(db, email)
+        assert row.status == "pending"
+        assert row.next_attempt_at > datetime.now(timezone.utc)
+    assert smtp_server.received == []
+
+
+def test_reset_token_is_put_in_at_send_time(db: Session, smtp_server: Handler) -> None:
+    data = generate_reset_password_email(email_to="reset@example.com", email="reset@example.com")
+    email = enqueue_email(db, email_to="reset@example.com", subject=data.subject, html_content=data.html_content)
+    # what waits in the table is no credential
+    assert f"token={RESET_TOKEN_PLACEHOLDER}" in reload(db, email).html_content
+    drain()
+    [body] = [b for b in smtp_server.bodies if "Password Recovery" in b]
+    match = re.search(r"token=([\w.-]+)", body)
+    assert match is not None and match.group(1) != RESET_TOKEN_PLACEHOLDER
+    assert verify_password_reset_token(match.group(1)) == "reset@example.com"
+
+
+def welcome_rows(db: Session, address: str) -> list[EmailOutbox]:
+    db.expire_all()
+    return list(db.exec(select(EmailOutbox).where(EmailOutbox.email_to == address)))
+
+
+def test_new_user_and_welcome_mail_commit_together(db: Session) -> None:
+    address = f"welcome-{uuid.uuid4().hex[:8]}@example.com"
+    user_in = UserCreate(email=address, password="password123")
+    welcome = EmailData(html_content="<p>welcome</p>", subject="Welcome")
+    user = UserService.create_user(db, user_in, welcome)
+    try:
+        assert len(welcome_rows(db, address)) == 1
+        # a failed user insert queues nothing
+        with pytest.raises(DuplicateError):
+            UserService.create_user(db, user_in, welcome)
+        assert len(welcome_rows(db, address)) == 1
+    finally:
+        UserService.delete_user(db, user.id)
+        for row in welcome_rows(db, address):
+            db.delete(row)
+        db.commit()
+
+
+def test_failed_welcome_mail_rolls_back_the_user(db: Session) -> None:
+    address = f"welcome-{uuid.uuid4().hex[:8]}@example.com"
+    # longer than the subject column
+    welcome = EmailData(html_content="<p>welcome</p>", subject="x" * 1000)
+    with pytest.raises(DataError):
+        UserService.create_user(db, UserCreate(email=address, password="password123"), welcome)
+    db.rollback()
+    assert db.exec(select(User).where(User.email == address)).first() is None
+    assert welcome_rows(db, address) == []
@@ -0,0 +1,47 @@
+from app.modules.shared.utils import (
+    email_templates,
+    generate_new_account_email,
+    precompile_email_templates,
+    render_email_template,
+    render_email_templates,
+)
+
+
+def test_precompile_covers_every_template() -> None:
+    assert precompile_email_templates() == len(email_templates().list_templates()) > 0
+
+
+def test_context_layers_over_common() -> None:
+    common = {"project_name": "Sample", "link": "https://example.com/shared", "valid_hours": 48}
+    first, second = render_email_templates(
+        template_name="new_account.html",
+        contexts=[{"username": "ann", "email": "ann@example.com"},
+                  {"username": "bob", "email": "bob@example.com", "link": "https://example.com/bob"}],
+        common=common,
+    )
+    assert "Sample" in first and "Sample" in second
+    assert "ann@example.com" in first and "bob@example.com" not in first
+    assert "https://example.com/shared" in first
+    # a recipient's own value wins over the shared one
+    assert "https://example.com/bob" in second and "https://example.com/shared" not in second
+
+
+def test_common_is_not_kept_between_renders() -> None:
+    render_email_templates(template_name="test_email.html", contexts=[{}],
+                           common={"project_name": "Leaked", "email": "x@example.com"})
+    html = render_email_template(template_name="test_email.html",
+                                 context={"project_name": "Sample", "email": "y@example.com"})
+    assert "Leaked" not in html
+
+
+def test_values_are_escaped() -> None:
+    html = render_email_template(template_name="test_email.html",
+                                 context={"project_name": "<script>alert(1)</script>", "email": "a&b@example.com"})
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html and "a&amp;b@example.com" in html
+
+
+def test_new_account_mail_has_no_password() -> None:
+    email = generate_new_account_email(email_to="new@example.com", username="new@example.com")
+    assert "Password:" not in email.html_content
+    assert "/reset-password?token=" in email.html_content
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, computed_field
+
+from app.modules.shared.encoding import (
+    ORJSONResponse,
+    item_response,
+    page_response,
+    row_encoder,
+)
+from app.modules.shared.pagination import Page
+from tests.benchmarks.bench_encoding import PAGES, pydantic_body
+
+
+@pytest.mark.parametrize("name", list(PAGES))
+def test_page_matches_pydantic_path(name: str) -> None:
+    envelope, schema, make_rows = PAGES[name]
+    page = Page(make_rows(3), 3, "next")
+    assert page_response(schema, page).body == pydantic_body(envelope, page)
+
+
+def test_sparse_fields() -> None:
+    envelope, schema, make_rows = PAGES["PostRead"]
+    post = make_rows(1)[0]
+    body = json.loads(bytes(item_response(schema, post, ("id", "title")).body))
+    assert body == {"id": str(post.id), "title": post.title}
+
+
+def test_default_response_class_matches_json_response() -> None:
+    content = {"access_token": "abc", "token_type": "bearer", "scopes": ["é", 1, None]}
+    assert json.loads(bytes(ORJSONResponse(content).body)) == json.loads(bytes(JSONResponse(content).body))
+
+
+class Aliased(BaseModel):
+    name: str = Field(alias="displayName")
+
+
+class Computed(BaseModel):
+    name: str
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def upper(self) -> str:
+        return self.name.upper()
+
+
+@pytest.mark.parametrize("schema", [Aliased, Computed])
+def test_refuses_schemas_it_would_misencode(schema: type[BaseModel]) -> None:
+    with pytest.raises(TypeError):
+        row_encoder(schema)
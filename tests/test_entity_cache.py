@@ -0,0 +1,225 @@
+import asyncio
+import math
+import uuid
+from typing import Any
+
+import pytest
+
+from app.modules.models.CategoryModel import Category
+from app.modules.schemas.CategorySchemas import CategoryRead
+from app.modules.shared.entity_cache import TOMBSTONE_SECONDS, EntityCache, RedisBackend
+
+redis = pytest.importorskip("redis")
+
+TTL = 60.0
+
+
+class Clock:
+    now = 0.0
+
+
+class StubRedis:
+    """The slice of the redis-py client RedisBackend uses, on a clock the test moves."""
+
+    def __init__(self, clock: Clock) -> None:
+        self.clock = clock
+        self.data: dict[str, tuple[bytes, float]] = {}
+        self.down = False
+
+    def get(self, key: str) -> bytes | None:
+        if self.down:
+            raise redis.ConnectionError("stub is down")
+        entry = self.data.get(key)
+        if entry is None or entry[1] <= self.clock.now:
+            self.data.pop(key, None)
+            return None
+        return entry[0]
+
+    def set(self, key: str, value: bytes, px: int | None = None, nx: bool = False) -> bool | None:
+        if self.down:
+            raise redis.ConnectionError("stub is down")
+        if nx and self.get(key) is not None:
+            return None
+        self.data[key] = (value, self.clock.now + px / 1000 if px is not None else math.inf)
+        return True
+
+    def pipeline(self, transaction: bool = True) -> "StubPipeline":
+        return StubPipeline(self)
+
+
+class StubPipeline:
+    def __init__(self, client: StubRedis) -> None:
+        self.client = client
+        self.queued: list[tuple[Any, ...]] = []
+
+    def __enter__(self) -> "StubPipeline":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+    async def __aenter__(self) -> "StubPipeline":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        pass
+
+    def set(self, *args: Any, **kwargs: Any) -> "StubPipeline":
+        self.queued.append((args, kwargs))
+        return self
+
+    def execute(self) -> list[Any]:
+        return [self.client.set(*args, **kwargs) for args, kwargs in self.queued]
+
+
+class AsyncStubRedis:
+    def __init__(self, client: StubRedis) -> None:
+        self.client = client
+
+    async def get(self, key: str) -> bytes | None:
+        return self.client.get(key)
+
+    async def set(self, key: str, value: bytes, px: int | None = None, nx: bool = False) -> bool | None:
+        return self.client.set(key, value, px, nx)
+
+    def pipeline(self, transaction: bool = True) -> "AsyncStubPipeline":
+        return AsyncStubPipeline(self.client)
+
+
+class AsyncStubPipeline(StubPipeline):
+    async def execute(self) -> list[Any]:  # type: ignore[override]
+        return super().execute()
+
+
+class Loads:
+    """Stands in for the database: returns `row`, counting the calls."""
+
+    def __init__(self, row: Category | None) -> None:
+        self.row = row
+        self.count = 0
+
+    def __call__(self) -> Category | None:
+        self.count += 1
+        return self.row
+
+    async def load_async(self) -> Category | None:
+        return self()
+
+
+@pytest.fixture()
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture()
+def client(clock: Clock) -> StubRedis:
+    return StubRedis(clock)
+
+
+@pytest.fixture()
+def cache(client: StubRedis) -> EntityCache[Category]:
+    return EntityCache("categories", Category, CategoryRead, RedisBackend(client, AsyncStubRedis(client)), TTL)
+
+
+def category(slug: str = "news", category_id: uuid.UUID | None = None) -> Category:
+    return Category(id=category_id or uuid.uuid4(), name=slug.title(), slug=slug)
+
+
+def test_get_set_and_invalidate(cache: EntityCache[Category], client: StubRedis, clock: Clock) -> None:
+    row = category()
+    loads = Loads(row)
+    first = cache.get_or_load(row.id, loads)
+    second = cache.get_or_load(row.id, loads)
+    assert loads.count == 1 and (cache.hits, cache.misses) == (1, 1)
+    assert f"cache:categories:{row.id.hex}" in client.data
+    assert first is not None and second is not None and first is not second
+    assert second.slug == "news"
+
+    cache.invalidate(row.id)
+    loads.row = category("updated", row.id)
+    assert cache.get_or_load(row.id, loads).slug == "updated"  # type: ignore[union-attr]
+    # not cached again while the tombstone lasts
+    cache.get_or_load(row.id, loads)
+    assert loads.count == 3
+    clock.now += TOMBSTONE_SECONDS
+    cache.get_or_load(row.id, loads)
+    assert cache.get_or_load(row.id, loads).slug == "updated"  # type: ignore[union-attr]
+    assert loads.count == 4
+
+
+def test_entries_expire_after_the_ttl(cache: EntityCache[Category], clock: Clock) -> None:
+    row = category()
+    loads = Loads(row)
+    cache.get_or_load(row.id, loads)
+    clock.now += TTL - 1
+    cache.get_or_load(row.id, loads)
+    assert loads.count == 1
+    clock.now += 1
+    cache.get_or_load(row.id, loads)
+    assert loads.count == 2
+
+
+def test_stale_alias_is_not_followed(cache: EntityCache[Category], clock: Clock) -> None:
+    row = category("old-slug")
+    assert cache.get_or_load_by("slug", "old-slug", Loads(row)) is not None
+    hit = Loads(None)
+    assert cache.get_or_load_by("slug", "old-slug", hit).id == row.id  # type: ignore[union-attr]
+    assert hit.count == 0
+
+    # renamed: the alias still points at the id, whose entry now has the new slug
+    cache.invalidate(row.id)
+    clock.now += TOMBSTONE_SECONDS
+    cache.get_or_load(row.id, Loads(category("new-slug", row.id)))
+    gone = Loads(None)
+    assert cache.get_or_load_by("slug", "old-slug", gone) is None
+    assert gone.count == 1
+
+
+def test_load_racing_a_write_does_not_cache_the_old_row(cache: EntityCache[Category]) -> None:
+    row = category("before")
+    loads = Loads(row)
+
+    def read_then_write() -> Category | None:
+        old = loads()
+        # the write commits and invalidates while the old row is on its way back
+        loads.row = category("after", row.id)
+        cache.invalidate(row.id)
+        return old
+
+    assert cache.get_or_load(row.id, read_then_write).slug == "before"  # type: ignore[union-attr]
+    assert cache.get_or_load(row.id, loads).slug == "after"  # type: ignore[union-attr]
+
+
+def test_async_load_racing_a_write_does_not_cache_the_old_row(cache: EntityCache[Category], clock: Clock) -> None:
+    row = category("before")
+    loads = Loads(row)
+
+    async def read_then_write() -> Category | None:
+        old = loads()
+        loads.row = category("after", row.id)
+        await cache.invalidate_async(row.id)
+        return old
+
+    async def run() -> tuple[Category | None, ...]:
+        raced = await cache.get_or_load_async(row.id, read_then_write)
+        fresh = await cache.get_or_load_async(row.id, loads.load_async)
+        clock.now += TOMBSTONE_SECONDS
+        await cache.get_or_load_async(row.id, loads.load_async)
+        cached = await cache.get_or_load_async(row.id, loads.load_async)
+        return raced, fresh, cached
+
+    raced, fresh, cached = asyncio.run(run())
+    assert raced is not None and raced.slug == "before"
+    assert fresh is not None and fresh.slug == "after"
+    assert cached is not None and cached.slug == "after"
+    assert loads.count == 3
+
+
+def test_redis_errors_count_as_misses(cache: EntityCache[Category], client: StubRedis) -> None:
+    row = category()
+    client.down = True
+    loads = Loads(row)
+    assert cache.get_or_load(row.id, loads) is not None
+    assert cache.get_or_load(row.id, loads) is not None
+    cache.invalidate(row.id)
+    assert loads.count == 2
@@ -0,0 +1,27 @@
+import uuid
+
+from sqlalchemy import delete, func, select, text
+from sqlmodel import Session, col
+
+from app.modules.models.CategoryModel import Category
+from app.modules.shared.etag import entity_etag, if_match_versions
+from app.modules.shared.writes import insert_statement, write_one
+
+
+def test_session_time_zone_is_utc(db: Session) -> None:
+    # whatever the server or database default is
+    assert db.scalar(text("SHOW TimeZone")) == "UTC"
+
+
+def test_row_matches_its_own_etag(db: Session) -> None:
+    slug = f"etag-{uuid.uuid4().hex[:12]}"
+    category = write_one(db, insert_statement(Category, {"name": slug, "slug": slug}))
+    try:
+        versions = if_match_versions(entity_etag(category), category.id)
+        assert versions is not None
+        matching = select(func.count()).select_from(Category).where(
+            col(Category.id) == category.id, col(Category.updated_at).in_(versions))
+        assert db.scalar(matching) == 1
+    finally:
+        db.execute(delete(Category).where(col(Category.id) == category.id))
+        db.commit()
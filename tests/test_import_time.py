@@ -0,0 +1,37 @@
+"""
+Startup budget: importing app.main, which every worker and CLI job pays
+before doing anything, must stay within IMPORT_TIME_BUDGET_MS (measured
+with `python -X importtime`, best of a few runs) and must not load the
+subsystems that are only imported on first use.
+"""
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "2000"))
+RUNS = 3
+LAZY_MODULES = ("sentry_sdk", "emails", "jinja2", "passlib", "psycopg")
+
+ROOT = Path(__file__).resolve().parents[1]
+_APP_MAIN = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| app\.main$", re.MULTILINE)
+
+
+def import_app_main() -> tuple[float, list[str]]:
+    """Cumulative import time of app.main in ms, and the lazy modules it loaded."""
+    code = f"import sys, app.main; print(*[m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    match = _APP_MAIN.search(result.stderr)
+    assert match, result.stderr[-2000:]
+    return int(match.group(1)) / 1000, result.stdout.split()
+
+
+def test_import_time_within_budget() -> None:
+    best = min(import_app_main()[0] for _ in range(RUNS))
+    assert best <= BUDGET_MS, f"importing app.main took {best:.0f} ms, budget {BUDGET_MS:.0f} ms"
+
+
+def test_optional_subsystems_not_imported() -> None:
+    assert import_app_main()[1] == []
@@ -0,0 +1,43 @@
+import uuid
+from collections.abc import Iterator
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app.modules.models.UserModel import User
+from app.modules.routes.AuthRoutes import reset_password
+from app.modules.schemas.UserSchemas import NewPassword, UserCreate
+from app.modules.services import UserService
+from app.modules.services.AuthService import authenticate
+from app.modules.shared.utils import generate_password_reset_token
+from app.modules.shared.writes import update_statement, write_one
+
+
+@pytest.fixture()
+def user(db: Session) -> Iterator[User]:
+    user = UserService.create_user(db, UserCreate(email=f"reset-{uuid.uuid4().hex[:8]}@example.com",
+                                                  password="password123"))
+    yield user
+    UserService.delete_user(db, user.id)
+
+
+def test_reset_sets_the_new_password(db: Session, user: User) -> None:
+    token = generate_password_reset_token(email=user.email)
+    reset_password(db, NewPassword(token=token, new_password="new-password"))
+    assert authenticate(session=db, email=user.email, password="new-password") is not None
+    assert authenticate(session=db, email=user.email, password="password123") is None
+
+
+def test_invalid_token_is_refused(db: Session) -> None:
+    with pytest.raises(HTTPException) as raised:
+        reset_password(db, NewPassword(token="not-a-token", new_password="new-password"))
+    assert raised.value.status_code == 400
+
+
+def test_inactive_user_is_refused(db: Session, user: User) -> None:
+    write_one(db, update_statement(User, user.id, {"is_active": False}))
+    with pytest.raises(HTTPException) as raised:
+        reset_password(db, NewPassword(token=generate_password_reset_token(email=user.email),
+                                       new_password="new-password"))
+    assert raised.value.status_code == 400
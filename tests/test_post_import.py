@@ -0,0 +1,66 @@
+import json
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, update
+from sqlmodel import Session, col
+
+from app.modules.models.PostImportModel import PostImport
+from app.modules.models.PostModel import Post
+from app.modules.services import PostImportService
+
+
+@pytest.fixture()
+def source(tmp_path: Path, db: Session) -> Iterator[Path]:
+    prefix = f"import-test-{uuid.uuid4().hex[:8]}"
+    path = tmp_path / "posts.ndjson"
+    path.write_text("".join(json.dumps({"title": f"Post {n}", "slug": f"{prefix}-{n}"}) + "\n"
+                            for n in range(5)))
+    yield path
+    db.execute(delete(Post).where(col(Post.slug).startswith(prefix)))
+    db.commit()
+
+
+def test_second_claim_is_refused(db: Session, source: Path) -> None:
+    post_import = PostImportService.create_import(db, str(source), "ndjson", chunk_size=2)
+    first = PostImportService.claim_import(db, post_import.id)
+    assert first is not None and first.status == "running"
+    assert PostImportService.claim_import(db, post_import.id) is None
+    with pytest.raises(PostImportService.ImportRunningError):
+        PostImportService.run_import(post_import.id)
+
+
+def test_expired_lease_can_be_resumed(db: Session, source: Path) -> None:
+    post_import = PostImportService.create_import(db, str(source), "ndjson", chunk_size=2)
+    crashed = PostImportService.claim_import(db, post_import.id)
+    assert crashed is not None
+    db.execute(update(PostImport).where(col(PostImport.id) == post_import.id).values(
+        lease_until=datetime.now(timezone.utc) - timedelta(seconds=1)))
+    db.commit()
+    claimed = PostImportService.claim_import(db, post_import.id)
+    assert claimed is not None and claimed.run_id != crashed.run_id
+
+    done = PostImportService.run_import(post_import.id, claimed.run_id)
+    assert done is not None and done.status == "completed"
+    assert (done.chunks_done, done.rows_read, done.rows_inserted) == (3, 5, 5)
+    assert done.run_id is None
+    # the crashed run cannot commit a chunk any more
+    assert PostImportService.run_import(post_import.id, crashed.run_id) is not None
+    db.expire_all()
+    row = db.get(PostImport, post_import.id)
+    assert row is not None and row.rows_read == 5
+
+
+def test_source_is_removed_only_when_owned(db: Session, source: Path) -> None:
+    kept = PostImportService.create_import(db, str(source), "ndjson")
+    assert PostImportService.run_import(kept.id) is not None
+    assert source.exists()
+
+    upload = source.with_name("upload.ndjson")
+    upload.write_text("")
+    owned = PostImportService.create_import(db, str(upload), "ndjson", owns_source=True)
+    assert PostImportService.run_import(owned.id) is not None
+    assert not upload.exists()
@@ -0,0 +1,60 @@
+"""
+Every supported filter/sort combination of GET /posts/ must be served by the
+index built for it (see PostModel): EXPLAIN the first page of each, both
+directions. Sequential scans are turned off for the transaction so the
+answer does not depend on how many posts the test database holds.
+"""
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.modules.schemas.PostSchemas import PostFilters, PostSort
+from app.modules.services.PostService import SORT_KEYS, list_statement
+from app.modules.shared.pagination import paginate
+
+NOW = datetime.now(timezone.utc)
+LAST_MONTH = {"published_from": NOW - timedelta(days=30), "published_to": NOW}
+
+CASES: list[tuple[str, dict[str, Any], PostSort, str]] = [
+    ("all", {}, "created_at", "ix_posts_created_at_id"),
+    ("category", {"category_id": uuid.UUID(int=1)}, "created_at", "ix_posts_category_id_created_at_id"),
+    ("published", {"is_published": True}, "created_at", "ix_posts_published_created_at_id"),
+    ("featured", {"is_featured": True}, "created_at", "ix_posts_featured_created_at_id"),
+    ("all", {}, "published_at", "ix_posts_published_at_id"),
+    ("published range", LAST_MONTH, "published_at", "ix_posts_published_at_id"),
+    ("published", {"is_published": True}, "published_at", "ix_posts_published_published_at_id"),
+    ("published, range", {"is_published": True, **LAST_MONTH}, "published_at",
+     "ix_posts_published_published_at_id"),
+    ("all", {}, "title", "ix_posts_title_id"),
+]
+
+
+def plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+@pytest.mark.parametrize("descending", [True, False], ids=["desc", "asc"])
+@pytest.mark.parametrize(("filters", "sort", "index"), [case[1:] for case in CASES],
+                         ids=[f"{case[0]}-by-{case[2]}" for case in CASES])
+def test_listing_uses_index(db: Session, filters: dict[str, Any], sort: PostSort, index: str, descending: bool) -> None:
+    statement = paginate(list_statement(PostFilters(**filters), sort), SORT_KEYS[sort],
+                         limit=20, descending=descending)
+    connection = db.connection()
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    plan: list[dict[str, Any]] = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar_one()
+    nodes = list(plan_nodes(plan[0]["Plan"]))
+    db.rollback()
+
+    used = {node.get("Index Name") for node in nodes}
+    assert index in used, f"{index} not used: {plan}"
+    # the index gives the page order: no sort over the matching rows
+    assert not [node for node in nodes if node["Node Type"] == "Sort"], plan
@@ -0,0 +1,117 @@
+import types
+from ipaddress import ip_network
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.core.config import settings
+from app.dependency import throttle_login
+from app.modules.services.AuthService import clear_login_attempts, login_ip_limiter
+from app.modules.shared import ratelimit
+from app.modules.shared.ratelimit import MemoryStore, RateLimiter, client_ip
+
+TRAEFIK = [ip_network("172.18.0.0/16")]
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> types.SimpleNamespace:
+    now = types.SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(ratelimit, "time", types.SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_sliding_window(clock: types.SimpleNamespace) -> None:
+    limiter = RateLimiter(MemoryStore(), limit=3, window=60)
+    for _ in range(3):
+        assert limiter.hit("k") == 0
+        clock.value += 10
+    # hits at 1000, 1010, 1020: full until the first leaves the window at 1060
+    assert limiter.hit("k") == pytest.approx(30)
+    clock.value = 1059
+    assert limiter.hit("k") == pytest.approx(1)
+    clock.value = 1060
+    assert limiter.hit("k") == 0
+    # one slot frees up per expired hit, not the whole window at once
+    assert limiter.hit("k") == pytest.approx(10)
+    assert limiter.stats() == {"limit": 3, "window": 60, "allowed": 4, "rejected": 3}
+
+
+def test_rejected_hits_are_not_recorded(clock: types.SimpleNamespace) -> None:
+    limiter = RateLimiter(MemoryStore(), limit=1, window=60)
+    assert limiter.hit("k") == 0
+    for _ in range(5):
+        clock.value += 10
+        limiter.hit("k")
+    clock.value = 1060
+    assert limiter.hit("k") == 0
+
+
+@pytest.mark.usefixtures("clock")
+def test_reset_clears_the_window() -> None:
+    limiter = RateLimiter(MemoryStore(), limit=1, window=60)
+    limiter.hit("k")
+    assert limiter.hit("k") > 0
+    limiter.reset("k")
+    assert limiter.hit("k") == 0
+
+
+@pytest.mark.usefixtures("clock")
+def test_memory_store_evicts_least_recently_hit_keys() -> None:
+    store = MemoryStore(max_keys=2)
+    store.hit("a", 1, 60)
+    store.hit("b", 1, 60)
+    # "a" is hit again (and refused), so "b" is now the least recent
+    assert store.hit("a", 1, 60) > 0
+    store.hit("c", 1, 60)
+    assert list(store._hits) == ["a", "c"]
+    # an evicted key starts over with an empty window
+    assert store.hit("b", 1, 60) == 0
+    assert store.hit("a", 1, 60) == 0
+
+
+@pytest.mark.parametrize(("peer", "forwarded_for", "expected"), [
+    # not behind the proxy: the header is the client's own claim
+    ("203.0.113.7", ["198.51.100.1"], "203.0.113.7"),
+    ("172.18.0.2", [], "172.18.0.2"),
+    ("172.18.0.2", ["198.51.100.1"], "198.51.100.1"),
+    # spoofed hops left of the one the proxy added are ignored
+    ("172.18.0.2", ["1.2.3.4, 198.51.100.1"], "198.51.100.1"),
+    ("172.18.0.2", ["1.2.3.4", "198.51.100.1"], "198.51.100.1"),
+    # a chain of trusted proxies is walked past
+    ("172.18.0.2", ["198.51.100.1, 172.18.0.9"], "198.51.100.1"),
+    ("172.18.0.2", ["172.18.0.9"], "172.18.0.9"),
+    ("172.18.0.2", ["not-an-ip, 198.51.100.1"], "198.51.100.1"),
+    ("172.18.0.2", [" , "], "172.18.0.2"),
+    (None, ["198.51.100.1"], None),
+])
+def test_client_ip(peer: str | None, forwarded_for: list[str], expected: str | None) -> None:
+    assert client_ip(peer, forwarded_for, TRAEFIK) == expected
+
+
+def test_client_ip_without_trusted_proxies() -> None:
+    assert client_ip("172.18.0.2", ["198.51.100.1"], []) == "172.18.0.2"
+
+
+def test_login_behind_the_proxy_is_limited_per_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", ["172.18.0.0/16"])
+    monkeypatch.setattr(login_ip_limiter, "limit", 2)
+
+    def login(forwarded_for: str, username: str) -> None:
+        request = Request({"type": "http", "client": ("172.18.0.2", 40000),
+                           "headers": [(b"x-forwarded-for", forwarded_for.encode())]})
+        throttle_login(request, OAuth2PasswordRequestForm(username=username, password="x"))
+
+    try:
+        login("198.51.100.1", "a@example.com")
+        login("198.51.100.1", "b@example.com")
+        with pytest.raises(HTTPException) as exc_info:
+            login("198.51.100.1", "c@example.com")
+        assert exc_info.value.status_code == 429
+        # another client behind the same proxy has its own window
+        login("198.51.100.2", "d@example.com")
+    finally:
+        for ip in ("198.51.100.1", "198.51.100.2"):
+            login_ip_limiter.reset(f"login:ip:{ip}")
+        for username in ("a@example.com", "b@example.com", "d@example.com"):
+            clear_login_attempts(username)
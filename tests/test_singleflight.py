@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from sqlalchemy import Engine, delete, event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.modules.models.PostModel import Post
+from app.modules.services import AsyncPostService, PostService
+from app.modules.services.PostService import post_cache
+from app.modules.shared.writes import insert_statement, write_one
+
+HERD = 20
+
+
+class PostLoads:
+    """Counts the SELECTs on posts an engine runs, each held for `delay`."""
+
+    def __init__(self, engine: Engine, delay: float = 0.0) -> None:
+        self.engine = engine
+        self.delay = delay
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if statement.lstrip().startswith("SELECT") and "FROM posts" in statement:
+            with self._lock:
+                self.count += 1
+            # keeps the load in flight while the rest of the herd arrives
+            time.sleep(self.delay)
+
+    def __enter__(self) -> "PostLoads":
+        event.listen(self.engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        event.remove(self.engine, "before_cursor_execute", self)
+
+
+def herd_engine() -> AsyncEngine:
+    # a connection for every caller: without the coalescing the count, not
+    # the pool, is what fails
+    return create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI), pool_size=HERD + 1)
+
+
+@pytest.fixture()
+def post(db: Session) -> Iterator[Post]:
+    if not post_cache.enabled:
+        pytest.skip("the post cache is off (POST_CACHE_TTL_SECONDS=0)")
+    slug = f"herd-{uuid.uuid4().hex[:12]}"
+    post: Post = write_one(db, insert_statement(Post, {"title": slug, "slug": slug}))
+    post_cache.invalidate(post.id)
+    yield post
+    db.execute(delete(Post).where(col(Post.id) == post.id))
+    db.commit()
+    post_cache.invalidate(post.id)
+
+
+def test_thread_herd_runs_one_query(db_engine: Engine, post: Post) -> None:
+    start = threading.Barrier(HERD)
+    found: list[Post | None] = []
+
+    def read() -> None:
+        with Session(db_engine) as session:
+            start.wait()
+            found.append(PostService.get_post_by_id(session, post.id))
+
+    with PostLoads(db_engine, delay=0.3) as loads:
+        threads = [threading.Thread(target=read) for _ in range(HERD)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert loads.count == 1
+    assert len(found) == HERD and all(p is not None and p.id == post.id for p in found)
+    # separate copies: one caller's changes do not leak into another's
+    assert len({id(p) for p in found}) == HERD
+
+
+def test_async_herd_runs_one_query(post: Post) -> None:
+    async def herd() -> tuple[int, list[Post | None]]:
+        engine = herd_engine()
+        try:
+            with PostLoads(engine.sync_engine) as loads:
+                sessions = [AsyncSession(engine) for _ in range(HERD)]
+                found = await asyncio.gather(*(AsyncPostService.get_post_by_id(s, post.id) for s in sessions))
+                for session in sessions:
+                    await session.close()
+            return loads.count, found
+        finally:
+            await engine.dispose()
+
+    count, found = asyncio.run(herd())
+    assert count == 1
+    assert all(p is not None and p.id == post.id for p in found)
+
+
+def test_async_herd_outlives_a_cancelled_leader(post: Post) -> None:
+    async def herd() -> tuple[int, list[Post | None]]:
+        engine = herd_engine()
+        try:
+            with PostLoads(engine.sync_engine) as loads:
+                calls = post_cache.flights.calls
+                leader_session = AsyncSession(engine)
+                leader = asyncio.create_task(AsyncPostService.get_post_by_id(leader_session, post.id))
+
+                async def leader_in_flight() -> None:
+                    while post_cache.flights.calls == calls:
+                        await asyncio.sleep(0.001)
+                await asyncio.wait_for(leader_in_flight(), 5)
+                sessions = [AsyncSession(engine) for _ in range(HERD)]
+                waiters = [asyncio.create_task(AsyncPostService.get_post_by_id(s, post.id)) for s in sessions]
+                # every waiter is parked on the leader's load
+                await asyncio.sleep(0)
+                leader.cancel()
+                before = loads.count
+                found = await asyncio.gather(*waiters)
+                with pytest.raises(asyncio.CancelledError):
+                    await leader
+                for session in [leader_session, *sessions]:
+                    await session.close()
+                # one waiter took the load over; the rest shared it
+                return loads.count - before, found
+        finally:
+            await engine.dispose()
+
+    takeovers, found = asyncio.run(herd())
+    assert takeovers == 1
+    assert all(p is not None and p.id == post.id for p in found)
@@ -0,0 +1,14 @@
+import warnings
+
+from sqlalchemy.exc import SAWarning
+from sqlmodel import Session
+
+from app.modules.services.TagService import tag_counts_statement
+
+
+def test_tag_counts_without_cartesian_warning(db: Session) -> None:
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", SAWarning)
+        rows = db.execute(tag_counts_statement(10)).all()
+    counts: list[int] = [row._mapping["count"] for row in rows]
+    assert counts == sorted(counts, reverse=True)